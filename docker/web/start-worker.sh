@@ -0,0 +1,17 @@
+#!/bin/bash
+
+set -o errexit
+set -o pipefail
+set -o nounset
+
+export DJANGO_SETTINGS_MODULE=ferry.core.settings.prod
+
+cd /app
+
+# The web container runs the migrations, so wait for them before taking jobs.
+until python /app/manage.py migrate --check > /dev/null 2>&1; do
+  >&2 echo 'Waiting for migrations to be applied...'
+  sleep 2
+done
+
+python /app/manage.py run_ferry_worker --scheduler
@@ -10,5 +10,6 @@ cd /app
 
 python /app/manage.py collectstatic --noinput
 python /app/manage.py migrate
+python /app/manage.py build_api_schema
 
 /app/.venv/bin/granian --interface asginl ferry.core.asgi:application --workers 2 --no-ws --host 0.0.0.0 --port 8000
@@ -1,15 +1,37 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from django.contrib.auth.models import Group
+from django.http import HttpRequest
 from django.utils.translation import gettext_lazy as _
 
-from ferry.accounts.models import APIToken, Person, User
+from ferry.accounts.models import APIToken, GuildMember, Person, User
 
 
 class PersonAdmin(admin.ModelAdmin):
-    readonly_fields = ("id", "created_at", "updated_at")
-    fields = ("id", "display_name", "discord_id", "autopub", "created_at", "updated_at")
-    list_display = ("display_name", "discord_id", "autopub")
+    readonly_fields = ("id", "discord_verification", "discord_verified_at", "created_at", "updated_at")
+    fields = (
+        "id",
+        "display_name",
+        "discord_id",
+        "discord_verification",
+        "discord_verified_at",
+        "autopub",
+        "created_at",
+        "updated_at",
+    )
+    list_display = ("display_name", "discord_id", "discord_verification", "autopub")
+    list_filter = ("discord_verification",)
+
+
+class GuildMemberAdmin(admin.ModelAdmin):
+    list_display = ("display_name", "username", "discord_id", "joined_at", "synced_at")
+    search_fields = ("display_name", "username", "discord_id")
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def has_change_permission(self, request: HttpRequest, obj: GuildMember | None = None) -> bool:
+        return False
 
 
 class InlineAPITokenAdmin(admin.TabularInline):
@@ -48,3 +70,4 @@ class FerryUserAdmin(UserAdmin):
 admin.site.register(User, FerryUserAdmin)
 admin.site.unregister(Group)
 admin.site.register(Person, PersonAdmin)
+admin.site.register(GuildMember, GuildMemberAdmin)
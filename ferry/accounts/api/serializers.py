@@ -1,8 +1,8 @@
-from django.conf import settings
 from rest_framework import serializers
 
-from ferry.accounts.models import Person, User
-from ferry.core.discord import NoSuchGuildMemberError, get_discord_client
+from ferry.accounts.models import DiscordVerificationStatus, Person, User, get_cached_discord_verification_status
+from ferry.core.api.fieldsets import SparseFieldsetSerializerMixin
+from ferry.core.api.lookup import LookupSerializer, lookup_keys_field
 
 
 class DiscordLinkTokenSerializer(serializers.Serializer):
@@ -21,9 +21,10 @@ class PersonLinkWithDiscordIdSerializer(serializers.ModelSerializer[Person]):
         fields = PersonLinkSerializer.Meta.fields + ("discord_id",)
 
 
-class PersonSerializer(serializers.ModelSerializer[Person]):
+class PersonSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer[Person]):
     discord_id = serializers.IntegerField(allow_null=True, required=False)
     autopub = serializers.BooleanField(required=False)
+    discord_verification = serializers.ChoiceField(choices=DiscordVerificationStatus.choices, read_only=True)
     current_score = serializers.DecimalField(max_digits=6, decimal_places=2, read_only=True)
     ferry_sequence = serializers.SerializerMethodField(read_only=True)
 
@@ -33,6 +34,7 @@ class PersonSerializer(serializers.ModelSerializer[Person]):
             "id",
             "display_name",
             "discord_id",
+            "discord_verification",
             "current_score",
             "autopub",
             "ferry_sequence",
@@ -41,12 +43,11 @@ class PersonSerializer(serializers.ModelSerializer[Person]):
         )
 
     def validate_discord_id(self, value: int | None) -> int | None:
-        if value:
-            discord_client = get_discord_client()
-            try:
-                discord_client.get_guild_member_by_id(settings.DISCORD_GUILD, value)
-            except NoSuchGuildMemberError:
-                raise serializers.ValidationError("Unknown discord ID. Is the user part of the guild?") from None
+        # Membership is verified in the background, unless we already know the answer.
+        if value and (self.instance is None or self.instance.discord_id != value):
+            status = get_cached_discord_verification_status(value)
+            if status == DiscordVerificationStatus.NOT_IN_GUILD:
+                raise serializers.ValidationError("Unknown discord ID. Is the user part of the guild?")
         return value
 
     def get_ferry_sequence(self, person: Person) -> str:
@@ -56,6 +57,11 @@ class PersonSerializer(serializers.ModelSerializer[Person]):
             return ""
 
 
+class PersonLookupSerializer(LookupSerializer):
+    ids = lookup_keys_field(serializers.UUIDField())
+    discord_ids = lookup_keys_field(serializers.IntegerField())
+
+
 class UserSerializer(serializers.ModelSerializer[User]):
     person = PersonLinkSerializer()
 
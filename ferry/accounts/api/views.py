@@ -10,9 +10,12 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 
 from ferry.accounts.models import Person, PersonQuerySet, User
+from ferry.core.api.fieldsets import FIELD_SELECTION_PARAMETERS, SparseFieldsetMixin
+from ferry.core.api.lookup import get_lookup_results, lookup_response_schema
 
 from .serializers import (
     DiscordLinkTokenSerializer,
+    PersonLookupSerializer,
     PersonSerializer,
     UserSerializer,
 )
@@ -55,14 +58,14 @@ class PeopleObjectPermission(permissions.BasePermission):
 
 
 @extend_schema_view(
-    list=extend_schema(tags=["People"]),
-    retrieve=extend_schema(tags=["People"]),
+    list=extend_schema(tags=["People"], parameters=FIELD_SELECTION_PARAMETERS),
+    retrieve=extend_schema(tags=["People"], parameters=FIELD_SELECTION_PARAMETERS),
     update=extend_schema(tags=["People"]),
     partial_update=extend_schema(tags=["People"]),
     create=extend_schema(tags=["People"]),
     destroy=extend_schema(tags=["People"]),
 )
-class PersonViewset(viewsets.ModelViewSet):
+class PersonViewset(SparseFieldsetMixin, viewsets.ModelViewSet):
     serializer_class = PersonSerializer
     filter_backends = [filters.OrderingFilter, DjangoFilterBackend]
     permission_classes = [permissions.IsAuthenticated, PeopleObjectPermission]
@@ -71,7 +74,18 @@ class PersonViewset(viewsets.ModelViewSet):
 
     def get_queryset(self) -> PersonQuerySet:
         assert self.request.user.is_authenticated
-        return Person.objects.for_user(self.request.user).with_current_score()
+        queryset = Person.objects.for_user(self.request.user)
+
+        # The score is only worth working out if it is returned or ordered by.
+        ordering = self.request.query_params.get(filters.OrderingFilter.ordering_param, "")
+        field_selection = self.get_field_selection()
+        if (
+            field_selection is None
+            or field_selection.includes("current_score", "ferry_sequence")
+            or "current_score" in ordering
+        ):
+            queryset = queryset.with_current_score()
+        return queryset
 
     def perform_update(self, serializer: serializers.BaseSerializer) -> None:
         assert serializer.instance
@@ -84,6 +98,24 @@ class PersonViewset(viewsets.ModelViewSet):
             raise exceptions.PermissionDenied("You don't have permission to update a Discord ID directly.")
         return super().perform_update(serializer)
 
+    @extend_schema(
+        tags=["People"],
+        parameters=FIELD_SELECTION_PARAMETERS,
+        request=PersonLookupSerializer,
+        responses={200: lookup_response_schema("Person")},
+        description="Look up many people at once, by either their IDs or their Discord IDs.",
+    )
+    @action(detail=False, methods=["POST"], permission_classes=[permissions.IsAuthenticated])
+    def lookup(self, request: Request) -> Response:
+        serializer = PersonLookupSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        name, keys = serializer.lookup
+
+        field_name = {"ids": "id", "discord_ids": "discord_id"}[name]
+        people = self.get_queryset().filter(**{f"{field_name}__in": keys})
+        found = {getattr(person, field_name): person for person in people}
+        return Response(get_lookup_results(keys, found, lambda people: self.get_serializer(people, many=True).data))
+
     @extend_schema(
         tags=["People"],
         responses={200: DiscordLinkTokenSerializer},
@@ -6,4 +6,9 @@ class AccountsConfig(AppConfig):
     name = "ferry.accounts"
 
     def ready(self) -> None:
+        from ferry.accounts.models import APIToken, Person, User
         from ferry.core import permissions  # noqa: F401
+        from ferry.core.invalidation import invalidate_on_change
+
+        invalidate_on_change("people", Person)
+        invalidate_on_change("api_tokens", APIToken, User)
@@ -0,0 +1,174 @@
+"""
+Verification that people's Discord IDs belong to members of the guild.
+
+Checking a member with Discord is too slow to do whilst handling a request, so people are
+saved with a pending verification status, unless the local guild member index knows the answer.
+A job is queued to verify them, and ``manage.py verify_discord_members`` also verifies anyone
+left pending.
+
+The index is rebuilt from the full member list of the guild by ``manage.py sync_guild_members``,
+which also flags people who have left the guild. After that, the index is taken to list every
+member, so people whose Discord ID is not in it are not in the guild.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any, NamedTuple
+
+from django.conf import settings
+from django.db import models, transaction
+from django.utils import timezone
+
+from ferry.accounts.models import DiscordVerificationStatus, GuildMember, GuildMemberSyncState, Person
+from ferry.activity.changes import record_changes
+from ferry.activity.models import ChangeAction, ChangeObjectType
+from ferry.core.discord import (
+    DiscordRateLimitedError,
+    NoSuchGuildMemberError,
+    get_async_discord_client,
+    get_discord_client,
+)
+from ferry.core.invalidation import bump_cache_versions
+
+
+def verify_discord_membership(person: Person) -> DiscordVerificationStatus:
+    """Verify with Discord that the person is a member of the guild, updating their status."""
+    assert person.discord_id
+
+    discord_client = get_discord_client()
+    try:
+        member = discord_client.get_guild_member_by_id(settings.DISCORD_GUILD, person.discord_id)
+    except NoSuchGuildMemberError:
+        member = None
+    return _record_discord_membership(person, member, verified_at=timezone.now())
+
+
+def verify_discord_memberships(people: Sequence[Person]) -> None:
+    """Verify with Discord that many people are members of the guild, checking them concurrently."""
+
+    async def get_members() -> dict[int, dict[str, Any] | None]:
+        async with get_async_discord_client() as discord_client:
+            return await discord_client.get_guild_members_by_ids(
+                settings.DISCORD_GUILD,
+                [person.discord_id for person in people if person.discord_id],
+            )
+
+    members = asyncio.run(get_members())
+    verified_at = timezone.now()
+    for person in people:
+        if person.discord_id:
+            _record_discord_membership(person, members[person.discord_id], verified_at=verified_at)
+
+
+def _record_discord_membership(
+    person: Person, member: dict[str, Any] | None, *, verified_at: datetime
+) -> DiscordVerificationStatus:
+    assert person.discord_id
+
+    if member is None:
+        status = DiscordVerificationStatus.NOT_IN_GUILD
+        GuildMember.objects.filter(discord_id=person.discord_id).delete()
+    else:
+        status = DiscordVerificationStatus.VERIFIED
+        _save_guild_members([GuildMember.from_discord(member, synced_at=verified_at)])
+
+    # Only update the status if the Discord ID has not been changed since it was read.
+    with transaction.atomic(savepoint=False):
+        updated = Person.objects.filter(id=person.id, discord_id=person.discord_id).update(
+            discord_verification=status,
+            discord_verified_at=verified_at,
+        )
+        if updated and status != person.discord_verification:
+            record_changes(ChangeObjectType.PERSON, ChangeAction.UPDATED, [person.id])
+            bump_cache_versions("people")
+    person.discord_verification = status
+    return status
+
+
+def verify_pending_discord_memberships(*, limit: int = 100) -> int:
+    """
+    Verify people whose Discord membership is pending.
+
+    People are left pending if Discord is unavailable, so that they are tried again later.
+
+    :returns: the number of people verified.
+    """
+    import requests
+
+    people = Person.objects.filter(discord_verification=DiscordVerificationStatus.PENDING, discord_id__isnull=False)
+
+    verified = 0
+    for person in people.order_by("updated_at")[:limit]:
+        try:
+            verify_discord_membership(person)
+        except DiscordRateLimitedError:
+            break
+        except requests.RequestException:
+            continue
+        verified += 1
+    return verified
+
+
+class GuildMemberSyncResult(NamedTuple):
+    members: int
+    # The people whose status was changed by the sync.
+    verified: int
+    left: int
+
+
+def _save_guild_members(members: list[GuildMember]) -> None:
+    GuildMember.objects.bulk_create(
+        members,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=["discord_id"],
+        update_fields=["username", "display_name", "joined_at", "synced_at"],
+    )
+
+
+def sync_guild_members() -> GuildMemberSyncResult:
+    """
+    Rebuild the guild member index from Discord and reconcile everyone's verification status.
+
+    The index is only changed once the whole member list has been fetched.
+    """
+    discord_client = get_discord_client()
+    synced_at = timezone.now()
+    members = [
+        GuildMember.from_discord(member, synced_at=synced_at)
+        for member in discord_client.iter_guild_members(settings.DISCORD_GUILD)
+    ]
+
+    with transaction.atomic():
+        _save_guild_members(members)
+        GuildMember.objects.filter(synced_at__lt=synced_at).delete()
+        GuildMemberSyncState.objects.update_or_create(id=1, defaults={"synced_at": synced_at})
+
+        in_guild = models.Exists(GuildMember.objects.filter(discord_id=models.OuterRef("discord_id")))
+        people = Person.objects.filter(discord_id__isnull=False)
+        newly_verified_ids = list(
+            people.filter(in_guild)
+            .exclude(discord_verification=DiscordVerificationStatus.VERIFIED)
+            .values_list("id", flat=True)
+        )
+        people.filter(in_guild).update(
+            discord_verification=DiscordVerificationStatus.VERIFIED,
+            discord_verified_at=synced_at,
+        )
+        left_ids = list(
+            people.filter(~in_guild)
+            .exclude(discord_verification=DiscordVerificationStatus.NOT_IN_GUILD)
+            .values_list("id", flat=True)
+        )
+        left = Person.objects.filter(id__in=left_ids).update(
+            discord_verification=DiscordVerificationStatus.NOT_IN_GUILD,
+            discord_verified_at=synced_at,
+        )
+        if changed_ids := [*newly_verified_ids, *left_ids]:
+            record_changes(ChangeObjectType.PERSON, ChangeAction.UPDATED, changed_ids)
+            bump_cache_versions("people")
+
+    return GuildMemberSyncResult(members=len(members), verified=len(newly_verified_ids), left=left)
@@ -0,0 +1,18 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from ferry.accounts.discord import sync_guild_members
+
+
+class Command(BaseCommand):
+    help = "Rebuild the index of Discord guild members and flag people who have left the guild."
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        result = sync_guild_members()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Synced {result.members} guild members. "
+                f"{result.verified} people verified, {result.left} people have left the guild."
+            )
+        )
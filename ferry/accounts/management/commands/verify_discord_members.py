@@ -0,0 +1,29 @@
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from ferry.accounts.discord import verify_pending_discord_memberships
+
+
+class Command(BaseCommand):
+    help = "Verify that pending Discord IDs belong to members of the guild."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=None,
+            help="Keep checking for pending people, waiting this many seconds between checks.",
+        )
+        parser.add_argument("--limit", type=int, default=100, help="The maximum number of people to verify at once.")
+
+    def handle(self, *args: Any, interval: float | None, limit: int, **options: Any) -> None:
+        while True:
+            verified = verify_pending_discord_memberships(limit=limit)
+            if verified:
+                self.stdout.write(f"Verified {verified} Discord members.")
+
+            if interval is None:
+                break
+            time.sleep(interval)
@@ -17,6 +17,7 @@ class UserLinkedToPersonMiddleware:
         ("accounts", "unlinked_account"),
         (None, "api-v2-docs"),
         (None, "api-v2-schema"),
+        (None, "health-ready"),
     }
 
     def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
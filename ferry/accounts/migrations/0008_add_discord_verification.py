@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:04
+
+from django.apps.registry import Apps
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+
+
+def mark_existing_discord_ids_pending(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    Person = apps.get_model("accounts", "Person")
+    Person.objects.filter(discord_id__isnull=False).update(discord_verification="P")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0007_add_autopub_toggle"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="person",
+            name="discord_verification",
+            field=models.CharField(
+                blank=True,
+                choices=[("P", "Pending"), ("V", "Verified"), ("N", "Not in guild")],
+                editable=False,
+                help_text="Whether the Discord ID belongs to a member of the guild.",
+                max_length=1,
+            ),
+        ),
+        migrations.AddField(
+            model_name="person",
+            name="discord_verified_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(
+            mark_existing_discord_ids_pending,
+            migrations.RunPython.noop,
+        ),
+    ]
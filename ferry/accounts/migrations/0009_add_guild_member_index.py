@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0008_add_discord_verification"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GuildMember",
+            fields=[
+                ("discord_id", models.BigIntegerField(primary_key=True, serialize=False, verbose_name="Discord ID")),
+                ("username", models.CharField(max_length=64)),
+                ("display_name", models.CharField(max_length=64)),
+                ("joined_at", models.DateTimeField(blank=True, null=True)),
+                ("synced_at", models.DateTimeField()),
+            ],
+            options={
+                "ordering": ["username"],
+            },
+        ),
+    ]
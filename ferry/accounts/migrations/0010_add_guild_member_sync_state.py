@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0009_add_guild_member_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GuildMemberSyncState",
+            fields=[
+                ("id", models.PositiveSmallIntegerField(default=1, editable=False, primary_key=True, serialize=False)),
+                ("synced_at", models.DateTimeField()),
+            ],
+        ),
+    ]
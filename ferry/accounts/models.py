@@ -4,6 +4,8 @@ import math
 import secrets
 import uuid
 from collections.abc import Collection
+from datetime import datetime
+from typing import Any
 
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
@@ -11,10 +13,13 @@ from django.core.exceptions import ValidationError
 from django.db import models
 from django.db.models import F, Func, Value
 from django.db.models.functions import Coalesce
+from django.utils.dateparse import parse_datetime
 
 from ferry.accounts.repository import ferrify
 from ferry.core.discord import NoSuchGuildMemberError, get_discord_client
+from ferry.core.models import AtomicSaveModel
 from ferry.court.models import SCORE_FIELD, Ratification
+from ferry.jobs.queue import enqueue
 
 
 class User(AbstractUser):
@@ -85,11 +90,89 @@ class PersonQuerySet(models.QuerySet["Person"]):
 PersonManager = models.Manager.from_queryset(PersonQuerySet)
 
 
-class Person(models.Model):
+class DiscordVerificationStatus(models.TextChoices):
+    PENDING = "P", "Pending"
+    VERIFIED = "V", "Verified"
+    NOT_IN_GUILD = "N", "Not in guild"
+
+
+class GuildMember(models.Model):
+    """
+    A member of the Discord guild.
+
+    This is a local index of the guild, kept up to date by ``manage.py sync_guild_members``.
+    """
+
+    discord_id = models.BigIntegerField(verbose_name="Discord ID", primary_key=True)
+    username = models.CharField(max_length=64)
+    display_name = models.CharField(max_length=64)
+    joined_at = models.DateTimeField(blank=True, null=True)
+    synced_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["username"]
+
+    def __str__(self) -> str:
+        return self.display_name
+
+    @classmethod
+    def from_discord(cls, member: dict[str, Any], *, synced_at: datetime) -> GuildMember:
+        user = member["user"]
+        return cls(
+            discord_id=int(user["id"]),
+            username=user["username"],
+            display_name=member.get("nick") or user.get("global_name") or user["username"],
+            joined_at=parse_datetime(member["joined_at"]) if member.get("joined_at") else None,
+            synced_at=synced_at,
+        )
+
+
+class GuildMemberSyncState(models.Model):
+    """When the guild member index was last rebuilt from the whole guild, after which it lists every member."""
+
+    id = models.PositiveSmallIntegerField(primary_key=True, default=1, editable=False)
+    synced_at = models.DateTimeField()
+
+    def __str__(self) -> str:
+        return f"Synced at {self.synced_at}"
+
+
+def get_cached_discord_verification_status(discord_id: int) -> DiscordVerificationStatus:
+    """
+    Get the verification status of a Discord ID from the guild member index and recently cached members.
+
+    This never calls Discord. Once the guild has been synced, a Discord ID that is not in the index
+    is not in the guild, and anyone who has joined since is verified by the next sync. Before then,
+    the status is pending unless the member is known locally.
+    """
+    if GuildMember.objects.filter(discord_id=discord_id).exists():
+        return DiscordVerificationStatus.VERIFIED
+
+    discord_client = get_discord_client()
+    try:
+        member = discord_client.get_cached_guild_member_by_id(settings.DISCORD_GUILD, discord_id)
+    except NoSuchGuildMemberError:
+        return DiscordVerificationStatus.NOT_IN_GUILD
+    if member is not None:
+        return DiscordVerificationStatus.VERIFIED
+    if GuildMemberSyncState.objects.exists():
+        return DiscordVerificationStatus.NOT_IN_GUILD
+    return DiscordVerificationStatus.PENDING
+
+
+class Person(AtomicSaveModel):
     id = models.UUIDField(verbose_name="ID", primary_key=True, default=uuid.uuid4, editable=False)
     display_name = models.CharField(max_length=255, unique=True)
     discord_id = models.BigIntegerField(verbose_name="Discord ID", blank=True, null=True, unique=True)
     autopub = models.BooleanField(default=False, verbose_name="AutoPub enabled")
+    discord_verification = models.CharField(
+        max_length=1,
+        choices=DiscordVerificationStatus,
+        blank=True,
+        editable=False,
+        help_text="Whether the Discord ID belongs to a member of the guild.",
+    )
+    discord_verified_at = models.DateTimeField(blank=True, null=True, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True, editable=False)
     updated_at = models.DateTimeField(auto_now=True, editable=False)
@@ -103,15 +186,43 @@ class Person(models.Model):
     def __str__(self) -> str:
         return self.display_name
 
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        update_fields = kwargs.get("update_fields")
+        discord_id_has_changed = self._discord_id_has_changed() and (
+            update_fields is None or "discord_id" in update_fields
+        )
+        if discord_id_has_changed:
+            if self.discord_id:
+                self.discord_verification = get_cached_discord_verification_status(self.discord_id)
+            else:
+                self.discord_verification = ""
+            self.discord_verified_at = None
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "discord_verification", "discord_verified_at"}
+
+        super().save(*args, **kwargs)
+        self._loaded_discord_id = self.discord_id
+
+        # Membership of the guild is verified in the background.
+        if discord_id_has_changed and self.discord_verification == DiscordVerificationStatus.PENDING:
+            enqueue("accounts.verify_discord_memberships", person_id=self.id)
+
+    @classmethod
+    def from_db(cls, *args: Any, **kwargs: Any) -> Person:
+        instance = super().from_db(*args, **kwargs)
+        instance._loaded_discord_id = instance.__dict__.get("discord_id")
+        return instance
+
     def clean_fields(self, exclude: Collection[str] | None = None) -> None:
         super().clean_fields(exclude)
 
-        if self.discord_id:
-            discord_client = get_discord_client()
-            try:
-                discord_client.get_guild_member_by_id(settings.DISCORD_GUILD, self.discord_id)
-            except NoSuchGuildMemberError:
-                raise ValidationError("Unknown discord ID. Is the user part of the guild?") from None
+        if self.discord_id and self._discord_id_has_changed():
+            status = get_cached_discord_verification_status(self.discord_id)
+            if status == DiscordVerificationStatus.NOT_IN_GUILD:
+                raise ValidationError("Unknown discord ID. Is the user part of the guild?")
+
+    def _discord_id_has_changed(self) -> bool:
+        return self._state.adding or self.discord_id != getattr(self, "_loaded_discord_id", None)
 
     @property
     def ferry_sequence(self) -> str:
@@ -1,13 +1,27 @@
-from authlib.integrations.django_client import OAuth
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
 from django.conf import settings
 
-oauth_config = OAuth()
+if TYPE_CHECKING:
+    from authlib.integrations.django_client import OAuth
+
+
+@lru_cache
+def get_oauth_config() -> OAuth:
+    """Get the OAuth registry, which is only loaded when someone logs in as authlib is slow to import."""
+    from authlib.integrations.django_client import OAuth
+
+    oauth_config = OAuth()
 
-# SOWN SSO
-oauth_config.register(
-    "sown",
-    client_id=settings.SSO_OIDC_CLIENT_ID,
-    client_secret=settings.SSO_OIDC_CLIENT_SECRET,
-    server_metadata_url=settings.SSO_OIDC_CONFIGURATION_URL,
-    client_kwargs={"scope": settings.SSO_OIDC_SCOPES},
-)
+    # SOWN SSO
+    oauth_config.register(
+        "sown",
+        client_id=settings.SSO_OIDC_CLIENT_ID,
+        client_secret=settings.SSO_OIDC_CLIENT_SECRET,
+        server_metadata_url=settings.SSO_OIDC_CONFIGURATION_URL,
+        client_kwargs={"scope": settings.SSO_OIDC_SCOPES},
+    )
+    return oauth_config
@@ -0,0 +1,28 @@
+from typing import Any
+
+from ferry.accounts.discord import sync_guild_members, verify_discord_memberships, verify_pending_discord_memberships
+from ferry.accounts.models import DiscordVerificationStatus, Person
+from ferry.jobs.queue import task
+from ferry.jobs.schedule import periodic
+
+
+@task(name="accounts.verify_discord_memberships", batched=True, atomic=False)
+def verify_queued_discord_memberships(payloads: list[dict[str, Any]]) -> None:
+    people = Person.objects.filter(
+        id__in=[payload["person_id"] for payload in payloads],
+        discord_id__isnull=False,
+        discord_verification=DiscordVerificationStatus.PENDING,
+    )
+    verify_discord_memberships(list(people))
+
+
+@periodic("*/10 * * * *")
+@task(name="accounts.verify_pending_discord_memberships", atomic=False)
+def verify_pending_discord_memberships_task() -> None:
+    verify_pending_discord_memberships()
+
+
+@periodic("15 * * * *")
+@task(name="accounts.sync_guild_members", atomic=False)
+def sync_guild_members_task() -> None:
+    sync_guild_members()
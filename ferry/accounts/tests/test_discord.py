@@ -0,0 +1,212 @@
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import factory
+import httpx
+import pytest
+import requests
+from django.utils import timezone
+
+from ferry.accounts.discord import sync_guild_members, verify_discord_membership, verify_pending_discord_memberships
+from ferry.accounts.factories import PersonFactory
+from ferry.accounts.models import DiscordVerificationStatus, GuildMember, GuildMemberSyncState, Person
+from ferry.core.discord import DiscordRateLimitedError, NoSuchGuildMemberError
+from ferry.jobs.models import Job, JobStatus
+from ferry.jobs.queue import work
+
+
+def make_member(discord_id: int, nick: str | None = None) -> dict[str, Any]:
+    return {
+        "user": {"id": str(discord_id), "username": f"user{discord_id}", "global_name": None},
+        "nick": nick,
+        "joined_at": "2024-09-01T12:00:00.000000+00:00",
+    }
+
+
+@pytest.mark.django_db
+class TestPersonDiscordVerification:
+    @patch("ferry.accounts.models.get_discord_client")
+    def test_new_discord_id_is_pending(self, mock_get_discord_client: Mock) -> None:
+        mock_get_discord_client.return_value.get_cached_guild_member_by_id.return_value = None
+
+        person = PersonFactory(discord_id=1234)
+
+        assert person.discord_verification == DiscordVerificationStatus.PENDING
+        mock_get_discord_client.return_value.get_guild_member_by_id.assert_not_called()
+        job = Job.objects.get(task="accounts.verify_discord_memberships")
+        assert job.payload == {"person_id": str(person.id)}
+
+    @patch("ferry.accounts.models.get_discord_client")
+    def test_new_discord_id_not_in_synced_index(self, mock_get_discord_client: Mock) -> None:
+        mock_get_discord_client.return_value.get_cached_guild_member_by_id.return_value = None
+        GuildMemberSyncState.objects.create(synced_at=timezone.now())
+
+        person = PersonFactory(discord_id=1234)
+
+        assert person.discord_verification == DiscordVerificationStatus.NOT_IN_GUILD
+        assert not Job.objects.exists()
+
+    @patch("ferry.accounts.models.get_discord_client")
+    def test_new_discord_id_is_verified_from_cache(self, mock_get_discord_client: Mock) -> None:
+        mock_get_discord_client.return_value.get_cached_guild_member_by_id.return_value = {}
+
+        person = PersonFactory(discord_id=1234)
+
+        assert person.discord_verification == DiscordVerificationStatus.VERIFIED
+        assert not Job.objects.exists()
+
+    @patch("ferry.accounts.models.get_discord_client")
+    def test_unchanged_discord_id_keeps_status(self, mock_get_discord_client: Mock) -> None:
+        mock_get_discord_client.return_value.get_cached_guild_member_by_id.return_value = {}
+        person = Person.objects.get(id=PersonFactory(discord_id=1234).id)
+        mock_get_discord_client.reset_mock()
+
+        person.display_name = "bees"
+        person.save()
+
+        assert person.discord_verification == DiscordVerificationStatus.VERIFIED
+        mock_get_discord_client.assert_not_called()
+
+    def test_removed_discord_id_has_no_status(self) -> None:
+        person = PersonFactory(discord_id=1234)
+
+        person.discord_id = None
+        person.save()
+
+        assert person.discord_verification == ""
+
+
+@pytest.mark.django_db
+@patch("ferry.accounts.discord.get_discord_client")
+class TestVerifyDiscordMembership:
+    @pytest.mark.parametrize(
+        ("side_effect", "expected_status"),
+        [
+            pytest.param(None, DiscordVerificationStatus.VERIFIED, id="member"),
+            pytest.param(NoSuchGuildMemberError, DiscordVerificationStatus.NOT_IN_GUILD, id="not-member"),
+        ],
+    )
+    def test_verify(
+        self,
+        mock_get_discord_client: Mock,
+        side_effect: type[Exception] | None,
+        expected_status: DiscordVerificationStatus,
+    ) -> None:
+        mock_get_discord_client.return_value.get_guild_member_by_id.side_effect = side_effect
+        mock_get_discord_client.return_value.get_guild_member_by_id.return_value = make_member(1234)
+        person = PersonFactory(discord_id=1234)
+
+        assert verify_discord_membership(person) == expected_status
+
+        person.refresh_from_db()
+        assert person.discord_verification == expected_status
+        assert person.discord_verified_at is not None
+        assert GuildMember.objects.filter(discord_id=1234).exists() is (side_effect is None)
+
+    def test_verify_pending(self, mock_get_discord_client: Mock) -> None:
+        mock_get_discord_client.return_value.get_guild_member_by_id.side_effect = lambda _, discord_id: make_member(
+            discord_id
+        )
+        pending = PersonFactory.create_batch(size=3, discord_id=factory.Sequence(lambda n: 1000 + n))
+        PersonFactory()
+
+        assert verify_pending_discord_memberships() == 3
+
+        assert mock_get_discord_client.return_value.get_guild_member_by_id.call_count == 3
+        for person in pending:
+            person.refresh_from_db()
+            assert person.discord_verification == DiscordVerificationStatus.VERIFIED
+
+    def test_verify_pending_discord_unavailable(self, mock_get_discord_client: Mock) -> None:
+        mock_get_discord_client.return_value.get_guild_member_by_id.side_effect = requests.ConnectionError
+        person = PersonFactory(discord_id=1234)
+
+        assert verify_pending_discord_memberships() == 0
+
+        person.refresh_from_db()
+        assert person.discord_verification == DiscordVerificationStatus.PENDING
+
+    def test_verify_pending_rate_limited(self, mock_get_discord_client: Mock) -> None:
+        mock_get_discord_client.return_value.get_guild_member_by_id.side_effect = DiscordRateLimitedError(10)
+        PersonFactory.create_batch(size=3, discord_id=factory.Sequence(lambda n: 1000 + n))
+
+        assert verify_pending_discord_memberships() == 0
+        assert mock_get_discord_client.return_value.get_guild_member_by_id.call_count == 1
+
+
+@pytest.mark.django_db
+@patch("ferry.accounts.discord.get_discord_client")
+class TestSyncGuildMembers:
+    def test_sync(self, mock_get_discord_client: Mock) -> None:
+        # Arrange
+        GuildMember.objects.create(discord_id=3, username="gone", display_name="Gone", synced_at=timezone.now())
+        staying = PersonFactory(discord_id=1)
+        leaving = PersonFactory(discord_id=3)
+        no_discord = PersonFactory()
+        already_verified = PersonFactory(discord_id=2)
+        Person.objects.filter(id=already_verified.id).update(discord_verification=DiscordVerificationStatus.VERIFIED)
+        mock_get_discord_client.return_value.iter_guild_members.return_value = [
+            make_member(1, nick="Bees"),
+            make_member(2),
+        ]
+
+        # Act
+        result = sync_guild_members()
+
+        # Assert
+        assert result == (2, 1, 1)
+        assert {(member.discord_id, member.display_name) for member in GuildMember.objects.all()} == {
+            (1, "Bees"),
+            (2, "user2"),
+        }
+
+        staying.refresh_from_db()
+        assert staying.discord_verification == DiscordVerificationStatus.VERIFIED
+        leaving.refresh_from_db()
+        assert leaving.discord_verification == DiscordVerificationStatus.NOT_IN_GUILD
+        no_discord.refresh_from_db()
+        assert no_discord.discord_verification == ""
+        assert GuildMemberSyncState.objects.get().synced_at == GuildMember.objects.get(discord_id=1).synced_at
+
+    def test_sync_discord_unavailable(self, mock_get_discord_client: Mock) -> None:
+        GuildMember.objects.create(discord_id=3, username="bees", display_name="Bees", synced_at=timezone.now())
+        mock_get_discord_client.return_value.iter_guild_members.side_effect = requests.ConnectionError
+
+        with pytest.raises(requests.ConnectionError):
+            sync_guild_members()
+
+        assert GuildMember.objects.filter(discord_id=3).exists()
+
+
+@pytest.mark.django_db
+@patch("ferry.accounts.discord.get_async_discord_client")
+class TestVerifyQueuedDiscordMemberships:
+    def test_verify(self, mock_get_async_discord_client: MagicMock) -> None:
+        # Arrange
+        discord_client = mock_get_async_discord_client.return_value.__aenter__.return_value
+        discord_client.get_guild_members_by_ids = AsyncMock(return_value={1: make_member(1), 2: None})
+        member = PersonFactory(discord_id=1)
+        not_member = PersonFactory(discord_id=2)
+
+        # Act
+        work(worker_id="test")
+
+        # Assert
+        args, _ = discord_client.get_guild_members_by_ids.call_args
+        assert sorted(args[1]) == [1, 2]
+        member.refresh_from_db()
+        assert member.discord_verification == DiscordVerificationStatus.VERIFIED
+        not_member.refresh_from_db()
+        assert not_member.discord_verification == DiscordVerificationStatus.NOT_IN_GUILD
+        assert set(Job.objects.values_list("status", flat=True)) == {JobStatus.SUCCEEDED}
+
+    def test_discord_unavailable(self, mock_get_async_discord_client: MagicMock) -> None:
+        discord_client = mock_get_async_discord_client.return_value.__aenter__.return_value
+        discord_client.get_guild_members_by_ids = AsyncMock(side_effect=httpx.ConnectError("bees"))
+        person = PersonFactory(discord_id=1)
+
+        work(worker_id="test")
+
+        person.refresh_from_db()
+        assert person.discord_verification == DiscordVerificationStatus.PENDING
+        assert Job.objects.get().status == JobStatus.QUEUED
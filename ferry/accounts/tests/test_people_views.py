@@ -1,11 +1,14 @@
 import base64
 from http import HTTPStatus
+from typing import Any
 from unittest.mock import Mock, patch
 from uuid import UUID
 
 import pytest
 from django.core.signing import TimestampSigner
+from django.db import connection
 from django.test import Client
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse_lazy
 
 from ferry.accounts.factories import PersonFactory
@@ -90,6 +93,97 @@ class TestPeopleListEndpoint(APITest):
         assert data["count"] == 1
         assert data["results"][0]["id"] == str(person_with_discord.id)
 
+    def test_get_fields(self, client: Client, admin_user: User) -> None:
+        # Arrange
+        headers = self.get_headers(admin_user)
+        person = PersonFactory(discord_id=12345)
+
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            resp = client.get(self.url, {"fields": "id,discord_id"}, headers=headers)
+
+        # Assert
+        assert resp.status_code == HTTPStatus.OK
+        assert resp.json()["results"] == [{"id": str(person.id), "discord_id": 12345}]
+        assert not any("current_score" in query["sql"] for query in queries.captured_queries)
+
+    def test_get_fields_ordered_by_score(self, client: Client, admin_user: User) -> None:
+        # Arrange
+        headers = self.get_headers(admin_user)
+        suspect = PersonFactory()
+        AccusationFactory(suspect=suspect)
+
+        # Act
+        resp = client.get(self.url, {"fields": "id", "ordering": "-current_score"}, headers=headers)
+
+        # Assert
+        assert resp.status_code == HTTPStatus.OK
+        assert resp.json()["results"][0] == {"id": str(suspect.id)}
+
+
+@pytest.mark.django_db
+class TestPeopleLookupEndpoint(APITest):
+    url = reverse_lazy("api-2.0.0:people-lookup")
+
+    def test_post_unauthenticated(self, client: Client) -> None:
+        resp = client.post(self.url, {"ids": []}, content_type="application/json")
+        assert resp.status_code == HTTPStatus.UNAUTHORIZED
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            pytest.param({}, id="empty"),
+            pytest.param({"ids": [str(UUID(int=0))], "discord_ids": [1]}, id="both"),
+            pytest.param({"ids": []}, id="no-ids"),
+            pytest.param({"discord_ids": list(range(501))}, id="too-many"),
+        ],
+    )
+    def test_post_bad_payload(self, client: Client, user_with_person: User, payload: dict) -> None:
+        resp = client.post(
+            self.url, payload, content_type="application/json", headers=self.get_headers(user_with_person)
+        )
+        assert resp.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_post_ids(self, client: Client, user_with_person: User, django_assert_max_num_queries: Any) -> None:
+        # Arrange
+        headers = self.get_headers(user_with_person)
+        people = PersonFactory.create_batch(size=3)
+        missing_id = str(UUID(int=0))
+
+        # Act
+        with django_assert_max_num_queries(3):
+            resp = client.post(
+                self.url,
+                {"ids": [str(person.id) for person in people] + [missing_id]},
+                content_type="application/json",
+                headers=headers,
+            )
+
+        # Assert
+        assert resp.status_code == HTTPStatus.OK
+        data = resp.json()
+        assert list(data) == [str(person.id) for person in people] + [missing_id]
+        assert data[str(people[0].id)]["display_name"] == people[0].display_name
+        assert data[str(people[0].id)]["current_score"] == "0.00"
+        assert data[missing_id] is None
+
+    def test_post_discord_ids(self, client: Client, user_with_person: User) -> None:
+        # Arrange
+        headers = self.get_headers(user_with_person)
+        person = PersonFactory(discord_id=12345)
+
+        # Act
+        resp = client.post(
+            f"{self.url}?fields=id,discord_id",
+            {"discord_ids": [12345, 12345, 67890]},
+            content_type="application/json",
+            headers=headers,
+        )
+
+        # Assert
+        assert resp.status_code == HTTPStatus.OK
+        assert resp.json() == {"12345": {"id": str(person.id), "discord_id": 12345}, "67890": None}
+
 
 @pytest.mark.django_db
 class TestPeopleCreateEndpoint(APITest):
@@ -125,7 +219,7 @@ class TestPeopleCreateEndpoint(APITest):
             ),
         ],
     )
-    @patch("ferry.accounts.api.serializers.get_discord_client")
+    @patch("ferry.accounts.models.get_discord_client")
     def test_post_bad_payload(
         self,
         mock_get_discord_client: Mock,
@@ -174,7 +268,7 @@ class TestPeopleCreateEndpoint(APITest):
             ),
         ],
     )
-    @patch("ferry.accounts.api.serializers.get_discord_client")
+    @patch("ferry.accounts.models.get_discord_client")
     def test_post(
         self,
         mock_get_discord_client: Mock,
@@ -187,7 +281,7 @@ class TestPeopleCreateEndpoint(APITest):
         expected_autopub: bool,
     ) -> None:
         # Arrange
-        mock_get_guild_member_by_id = mock_get_discord_client.return_value.get_guild_member_by_id
+        mock_get_guild_member_by_id = mock_get_discord_client.return_value.get_cached_guild_member_by_id
         mock_get_guild_member_by_id.return_value = {}
 
         # Act
@@ -205,6 +299,7 @@ class TestPeopleCreateEndpoint(APITest):
             "id",
             "display_name",
             "discord_id",
+            "discord_verification",
             "ferry_sequence",
             "autopub",
             "created_at",
@@ -220,7 +315,7 @@ class TestPeopleCreateEndpoint(APITest):
         assert person.display_name == expected_display_name
         assert person.discord_id == expected_discord_id
 
-    @patch("ferry.accounts.api.serializers.get_discord_client")
+    @patch("ferry.accounts.models.get_discord_client")
     def test_post_no_such_discord_user(
         self,
         mock_get_discord_client: Mock,
@@ -228,7 +323,7 @@ class TestPeopleCreateEndpoint(APITest):
         admin_user: User,
     ) -> None:
         # Arrange
-        mock_get_guild_member_by_id = mock_get_discord_client.return_value.get_guild_member_by_id
+        mock_get_guild_member_by_id = mock_get_discord_client.return_value.get_cached_guild_member_by_id
         mock_get_guild_member_by_id.side_effect = NoSuchGuildMemberError
 
         # Act
@@ -271,6 +366,7 @@ class TestPeopleDetailEndpoint(APITest):
             "id",
             "display_name",
             "discord_id",
+            "discord_verification",
             "current_score",
             "autopub",
             "ferry_sequence",
@@ -298,6 +394,7 @@ class TestPeopleDetailEndpoint(APITest):
             "id",
             "display_name",
             "discord_id",
+            "discord_verification",
             "current_score",
             "autopub",
             "ferry_sequence",
@@ -361,7 +458,7 @@ class TestPeopleUpdateEndpoint(APITest):
             ),
         ],
     )
-    @patch("ferry.accounts.api.serializers.get_discord_client")
+    @patch("ferry.accounts.models.get_discord_client")
     def test_put_bad_payload(
         self,
         mock_get_discord_client: Mock,
@@ -412,6 +509,7 @@ class TestPeopleUpdateEndpoint(APITest):
             "id",
             "display_name",
             "discord_id",
+            "discord_verification",
             "current_score",
             "ferry_sequence",
             "autopub",
@@ -435,7 +533,7 @@ class TestPeopleUpdateEndpoint(APITest):
             pytest.param({"display_name": "wasps", "discord_id": 9876543210}, "wasps", 9876543210, id="update-both"),
         ],
     )
-    @patch("ferry.accounts.api.serializers.get_discord_client")
+    @patch("ferry.accounts.models.get_discord_client")
     def test_put_admin(
         self,
         mock_get_discord_client: Mock,
@@ -445,13 +543,13 @@ class TestPeopleUpdateEndpoint(APITest):
         expected_display_name: str | None,
         expected_discord_id: int | None,
     ) -> None:
-        mock_get_guild_member_by_id = mock_get_discord_client.return_value.get_guild_member_by_id
+        mock_get_guild_member_by_id = mock_get_discord_client.return_value.get_cached_guild_member_by_id
         mock_get_guild_member_by_id.return_value = {}
         person = PersonFactory(display_name="bees", discord_id=1234567890)
 
         self._test_put(client, admin_user, person, payload, expected_display_name, expected_discord_id)
 
-    @patch("ferry.accounts.api.serializers.get_discord_client")
+    @patch("ferry.accounts.models.get_discord_client")
     def test_put(
         self,
         mock_get_discord_client: Mock,
@@ -464,7 +562,7 @@ class TestPeopleUpdateEndpoint(APITest):
         user_with_person.person.discord_id = 9876543210
         user_with_person.person.save(update_fields=["discord_id"])
 
-        mock_get_guild_member_by_id = mock_get_discord_client.return_value.get_guild_member_by_id
+        mock_get_guild_member_by_id = mock_get_discord_client.return_value.get_cached_guild_member_by_id
         mock_get_guild_member_by_id.return_value = {}
 
         self._test_put(
@@ -477,7 +575,7 @@ class TestPeopleUpdateEndpoint(APITest):
             expected_autopub=True,
         )
 
-    @patch("ferry.accounts.api.serializers.get_discord_client")
+    @patch("ferry.accounts.models.get_discord_client")
     def test_put_no_such_discord_user(
         self,
         mock_get_discord_client: Mock,
@@ -485,7 +583,7 @@ class TestPeopleUpdateEndpoint(APITest):
         admin_user: User,
     ) -> None:
         # Arrange
-        mock_get_guild_member_by_id = mock_get_discord_client.return_value.get_guild_member_by_id
+        mock_get_guild_member_by_id = mock_get_discord_client.return_value.get_cached_guild_member_by_id
         mock_get_guild_member_by_id.side_effect = NoSuchGuildMemberError
         person = PersonFactory(display_name="bees", discord_id=1234567890)
 
@@ -523,7 +621,7 @@ class TestPeopleUpdateEndpoint(APITest):
             "detail": "You do not have permission to perform this action.",
         }
 
-    @patch("ferry.accounts.api.serializers.get_discord_client")
+    @patch("ferry.accounts.models.get_discord_client")
     def test_put_cannot_edit_discord_id(
         self,
         mock_get_discord_client: Mock,
@@ -22,7 +22,7 @@ from ferry.core.mixins import BreadcrumbsMixin
 from ferry.court.models import Accusation
 
 from .models import APIToken, PersonQuerySet, User
-from .oauth import oauth_config
+from .oauth import get_oauth_config
 
 
 class LoginView(auth_views.LoginView):
@@ -42,12 +42,12 @@ class LoginView(auth_views.LoginView):
         request.session["sso_next"] = self.get_redirect_url()
 
         redirect_uri = request.build_absolute_uri(reverse("accounts:sso_oidc_redirect"))
-        return oauth_config.sown.authorize_redirect(request, redirect_uri)
+        return get_oauth_config().sown.authorize_redirect(request, redirect_uri)
 
 
 class SSOOIDCRedirectView(View):
     def get(self, request: HttpRequest) -> http.HttpResponseRedirect | http.HttpResponseServerError:
-        token = oauth_config.sown.authorize_access_token(request)
+        token = get_oauth_config().sown.authorize_access_token(request)
         userinfo = token.get("userinfo", {})
 
         try:
@@ -0,0 +1,26 @@
+from django.contrib import admin
+
+from ferry.activity.models import Activity, WebhookDelivery, WebhookSubscription
+
+
+class ActivityAdmin(admin.ModelAdmin):
+    list_display = ("id", "type", "created_at")
+    list_filter = ("type",)
+    readonly_fields = ("id", "type", "data", "created_at")
+
+
+class WebhookSubscriptionAdmin(admin.ModelAdmin):
+    list_display = ("url", "user", "is_active", "created_at")
+    list_filter = ("is_active",)
+    readonly_fields = ("id", "secret", "created_at", "updated_at")
+
+
+class WebhookDeliveryAdmin(admin.ModelAdmin):
+    list_display = ("activity", "subscription", "status", "attempts", "delivered_at")
+    list_filter = ("status",)
+    readonly_fields = ("id", "activity", "subscription", "attempts", "last_error", "delivered_at", "created_at")
+
+
+admin.site.register(Activity, ActivityAdmin)
+admin.site.register(WebhookSubscription, WebhookSubscriptionAdmin)
+admin.site.register(WebhookDelivery, WebhookDeliveryAdmin)
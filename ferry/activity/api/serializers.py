@@ -0,0 +1,47 @@
+from rest_framework import serializers
+
+from ferry.activity.models import ActivityType, Change, WebhookSubscription
+
+
+class WebhookSubscriptionSerializer(serializers.ModelSerializer[WebhookSubscription]):
+    activity_types = serializers.MultipleChoiceField(choices=ActivityType.choices, allow_empty=False)
+
+    class Meta:
+        model = WebhookSubscription
+        fields = ("id", "url", "activity_types", "secret", "is_active", "created_at", "updated_at")
+        read_only_fields = ("secret",)
+
+    def to_internal_value(self, data: dict) -> dict:
+        validated_data = super().to_internal_value(data)
+        if "activity_types" in validated_data:
+            validated_data["activity_types"] = sorted(validated_data["activity_types"])
+        return validated_data
+
+    def to_representation(self, instance: WebhookSubscription) -> dict:
+        data = super().to_representation(instance)
+        data["activity_types"] = sorted(data["activity_types"])
+        return data
+
+
+class ChangeSerializer(serializers.ModelSerializer[Change]):
+    type = serializers.CharField(source="object_type")
+    id = serializers.UUIDField(source="object_id")
+
+    class Meta:
+        model = Change
+        fields = ("seq", "type", "id", "parent_id", "action", "changed_at")
+
+
+class ChangeFeedQuerySerializer(serializers.Serializer):
+    since = serializers.IntegerField(
+        min_value=0,
+        required=False,
+        help_text="The sequence number of the last change seen. Leave out to get the current sequence number.",
+    )
+    limit = serializers.IntegerField(min_value=1, max_value=1000, default=500)
+
+
+class ChangeFeedSerializer(serializers.Serializer):
+    next_since = serializers.IntegerField(help_text="The sequence number to ask for changes since next time.")
+    has_more = serializers.BooleanField()
+    results = ChangeSerializer(many=True)
@@ -0,0 +1,195 @@
+import asyncio
+import json
+from collections.abc import AsyncIterator, Collection
+from http import HTTPStatus
+
+from asgiref.sync import sync_to_async
+from django.db import models
+from django.http import HttpRequest, JsonResponse, StreamingHttpResponse
+from django.http.response import HttpResponseBase
+from drf_spectacular.utils import OpenApiResponse, extend_schema, extend_schema_view
+from rest_framework import exceptions, permissions, serializers, viewsets
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from ferry.accounts.models import User
+from ferry.activity.api.serializers import (
+    ChangeFeedQuerySerializer,
+    ChangeFeedSerializer,
+    WebhookSubscriptionSerializer,
+)
+from ferry.activity.changes import get_changes_since, get_latest_change_seq, get_pruned_change_seq
+from ferry.activity.models import Activity, ActivityType, WebhookSubscription
+from ferry.activity.stream import get_activity_broadcaster, get_stream_activity
+from ferry.core.api.auth import TokenAuthentication
+
+STREAM_KEEPALIVE_INTERVAL = 15
+STREAM_RETRY_MS = 3000
+
+
+class CanManageWebhooks(permissions.BasePermission):
+    def has_permission(self, request: Request, view: object) -> bool:
+        return request.user.has_perm("activity.manage_webhooks")
+
+
+class CanViewChanges(permissions.BasePermission):
+    def has_permission(self, request: Request, view: object) -> bool:
+        return request.user.has_perm("activity.view_changes")
+
+
+class ChangeViewset(viewsets.GenericViewSet):
+    serializer_class = ChangeFeedSerializer
+    permission_classes = [permissions.IsAuthenticated, CanViewChanges]
+
+    @extend_schema(
+        tags=["Changes"],
+        parameters=[ChangeFeedQuerySerializer],
+        description=(
+            "List changes to people, accusations, ratifications, consequences, pub events and RSVPs, "
+            "so that a copy of them can be kept up to date without listing everything again.\n\n"
+            "To start syncing, leave out `since` to get the current sequence number, then list everything. "
+            "After that, pass `next_since` from each response as `since`. Each object only appears once, "
+            "with its latest change. If the changes since then have been compacted, the response is "
+            "410 Gone and everything must be listed again.\n\n"
+            "Sequence numbers are given out in the order that changes commit, so a change is never listed "
+            "before one with a lower sequence number."
+        ),
+        responses={
+            200: ChangeFeedSerializer,
+            410: OpenApiResponse(description="The changes since the sequence number have been compacted."),
+        },
+    )
+    def list(self, request: Request) -> Response:
+        query = ChangeFeedQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        since = query.validated_data.get("since")
+        limit = query.validated_data["limit"]
+
+        if since is None:
+            return Response({"next_since": get_latest_change_seq(), "has_more": False, "results": []})
+
+        if since < get_pruned_change_seq():
+            return Response(
+                {"detail": "Changes since then have been compacted, so everything must be listed again."},
+                status=HTTPStatus.GONE,
+            )
+
+        changes = get_changes_since(since, limit=limit + 1)
+        serializer = self.get_serializer(
+            instance={
+                "next_since": changes[:limit][-1].seq if changes else since,
+                "has_more": len(changes) > limit,
+                "results": changes[:limit],
+            }
+        )
+        return Response(serializer.data)
+
+
+@extend_schema_view(
+    list=extend_schema(tags=["Webhooks"]),
+    retrieve=extend_schema(tags=["Webhooks"]),
+    update=extend_schema(tags=["Webhooks"]),
+    partial_update=extend_schema(tags=["Webhooks"]),
+    create=extend_schema(
+        tags=["Webhooks"],
+        description=(
+            "Subscribe a URL to activity. Activity is POSTed to the URL in batches, signed with the secret: "
+            "the X-Ferry-Signature header is `t=<timestamp>,v1=<signature>`, where the signature is the "
+            "hex HMAC-SHA256 of `<timestamp>.<body>`."
+        ),
+    ),
+    destroy=extend_schema(tags=["Webhooks"]),
+)
+class WebhookSubscriptionViewset(viewsets.ModelViewSet):
+    serializer_class = WebhookSubscriptionSerializer
+    permission_classes = [permissions.IsAuthenticated, CanManageWebhooks]
+
+    def get_queryset(self) -> models.QuerySet[WebhookSubscription]:
+        assert self.request.user.is_authenticated
+        return WebhookSubscription.objects.filter(user=self.request.user)
+
+    def perform_create(self, serializer: serializers.BaseSerializer) -> None:
+        serializer.save(user=self.request.user)
+
+
+async def _authenticate_stream(request: HttpRequest) -> User | None:
+    try:
+        token_auth = await sync_to_async(TokenAuthentication().authenticate)(request)  # type: ignore[arg-type]
+    except exceptions.AuthenticationFailed:
+        return None
+    if token_auth is not None:
+        return token_auth[0]
+
+    user = await request.auser()
+    return user if user.is_authenticated else None
+
+
+def _format_event(activity: Activity) -> str:
+    return f"id: {activity.id}\nevent: {activity.type}\ndata: {json.dumps(activity.data)}\n\n"
+
+
+async def _stream_activity(*, last_event_id: int | None, activity_types: Collection[str]) -> AsyncIterator[str]:
+    # The broadcaster belongs to the event loop serving the response, which may not be the one running the view.
+    async with get_activity_broadcaster().subscribe() as queue:
+        yield f"retry: {STREAM_RETRY_MS}\n\n"
+
+        # Activity that was missed may also have been broadcast since subscribing.
+        sent_ids: set[int] = set()
+        if last_event_id is not None:
+            missed = (await sync_to_async(get_stream_activity)(last_event_id)).activities
+            sent_ids = {activity.id for activity in missed}
+            for activity in missed:
+                if activity.type in activity_types:
+                    yield _format_event(activity)
+
+        while True:
+            try:
+                next_activity = await asyncio.wait_for(queue.get(), timeout=STREAM_KEEPALIVE_INTERVAL)
+            except TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+
+            if next_activity is None:
+                # This stream fell too far behind, so the client should reconnect and catch up.
+                return
+            if next_activity.id not in sent_ids and next_activity.type in activity_types:
+                yield _format_event(next_activity)
+
+
+async def stream_activity(request: HttpRequest) -> HttpResponseBase:
+    """
+    Stream new accusations, ratifications and changes in attendance at the next pub event as Server-Sent Events.
+
+    Each event has the activity ID, so a client that reconnects with the Last-Event-ID header is
+    sent the activity that it missed. The types of activity can be limited with ``?types=``.
+    """
+    if request.method != "GET":
+        return JsonResponse({"detail": f'Method "{request.method}" not allowed.'}, status=HTTPStatus.METHOD_NOT_ALLOWED)
+
+    if await _authenticate_stream(request) is None:
+        return JsonResponse(
+            {"detail": "Authentication credentials were not provided."},
+            status=HTTPStatus.UNAUTHORIZED,
+            headers={"WWW-Authenticate": TokenAuthentication.keyword},
+        )
+
+    activity_types = set(ActivityType.values)
+    if types_param := request.GET.get("types"):
+        activity_types = set(types_param.split(","))
+        if invalid_types := activity_types - set(ActivityType.values):
+            return JsonResponse(
+                {"types": [f"Unknown activity types: {', '.join(sorted(invalid_types))}"]},
+                status=HTTPStatus.BAD_REQUEST,
+            )
+
+    last_event_id = request.headers.get("Last-Event-ID", "")
+    response = StreamingHttpResponse(
+        _stream_activity(
+            last_event_id=int(last_event_id) if last_event_id.isdigit() else None,
+            activity_types=activity_types,
+        ),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class ActivityConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "ferry.activity"
+
+    def ready(self) -> None:
+        from ferry.activity.changes import connect_change_log
+
+        connect_change_log()
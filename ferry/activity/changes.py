@@ -0,0 +1,167 @@
+"""
+A log of changes to the objects that API clients keep a copy of.
+
+A change is recorded in the same transaction as every create, update or delete of a tracked
+model, so clients can sync by asking for the changes after the last sequence number they saw
+rather than listing everything again. Changes made with bulk queries, which do not send
+signals, are recorded with ``record_changes``.
+
+Only the latest change to each object is needed to sync, so earlier ones are compacted away,
+and deletions are pruned once they are old enough that clients should have seen them.
+
+Changes are only given a sequence number as the transaction that made them commits, in a
+transaction of their own that holds a lock on the change log until it has committed. Sequence
+numbers therefore become visible in the order they are given out, however long the transaction
+that made the changes took, and clients never skip over a change that commits late. Changes
+that were missed, such as by a process that stopped just after committing, are sequenced by
+a periodic job.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Collection, Iterable
+from datetime import timedelta
+from functools import partial
+from typing import Any, NamedTuple
+from uuid import UUID
+
+from django.apps import apps
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from ferry.activity.models import Change, ChangeAction, ChangeLogState, ChangeObjectType
+
+DELETION_RETENTION = timedelta(days=30)
+SEQUENCE_BATCH_SIZE = 500
+
+
+class TrackedModel(NamedTuple):
+    object_type: ChangeObjectType
+    parent_field: str | None = None
+
+
+TRACKED_MODELS = {
+    "accounts.Person": TrackedModel(ChangeObjectType.PERSON),
+    "court.Accusation": TrackedModel(ChangeObjectType.ACCUSATION),
+    "court.Ratification": TrackedModel(ChangeObjectType.RATIFICATION, "accusation_id"),
+    "court.Consequence": TrackedModel(ChangeObjectType.CONSEQUENCE),
+    "pub.PubEvent": TrackedModel(ChangeObjectType.PUB_EVENT),
+    "pub.PubEventRSVP": TrackedModel(ChangeObjectType.PUB_EVENT_RSVP, "pub_event_id"),
+}
+
+
+def record_changes(
+    object_type: ChangeObjectType,
+    action: ChangeAction,
+    object_ids: Iterable[UUID],
+    *,
+    parent_id: UUID | None = None,
+) -> None:
+    changes = Change.objects.bulk_create(
+        Change(object_type=object_type, object_id=object_id, parent_id=parent_id, action=action)
+        for object_id in object_ids
+    )
+    if changes:
+        transaction.on_commit(partial(sequence_changes, [change.id for change in changes]), robust=True)
+
+
+def _record_change(instance: models.Model, action: ChangeAction) -> None:
+    tracked_model = TRACKED_MODELS[instance._meta.label]
+    parent_id = getattr(instance, tracked_model.parent_field) if tracked_model.parent_field else None
+    record_changes(tracked_model.object_type, action, [instance.pk], parent_id=parent_id)
+
+
+def _record_save(sender: type[models.Model], instance: models.Model, *, created: bool, **kwargs: Any) -> None:
+    if not kwargs.get("raw"):
+        _record_change(instance, ChangeAction.CREATED if created else ChangeAction.UPDATED)
+
+
+def _record_delete(sender: type[models.Model], instance: models.Model, **kwargs: Any) -> None:
+    _record_change(instance, ChangeAction.DELETED)
+
+
+def connect_change_log() -> None:
+    for label in TRACKED_MODELS:
+        model = apps.get_model(label)
+        post_save.connect(_record_save, sender=model, dispatch_uid=f"change_log_save_{label}")
+        post_delete.connect(_record_delete, sender=model, dispatch_uid=f"change_log_delete_{label}")
+
+
+def sequence_changes(change_ids: Collection[int] | None = None) -> int:
+    """
+    Give committed changes the next sequence numbers, which lets clients see them.
+
+    :param change_ids: the changes to sequence, or None for every committed change without a sequence number.
+    :returns: the number of changes sequenced.
+    """
+    unsequenced = Change.objects.filter(seq__isnull=True)
+    if change_ids is not None:
+        unsequenced = unsequenced.filter(id__in=change_ids)
+
+    with transaction.atomic():
+        ChangeLogState.objects.get_or_create(id=1)
+        # Numbers given out later can't commit before these, as they wait for the lock.
+        state = ChangeLogState.objects.select_for_update().get(id=1)
+        ids = list(unsequenced.order_by("id").values_list("id", flat=True))
+        for start in range(0, len(ids), SEQUENCE_BATCH_SIZE):
+            batch = ids[start : start + SEQUENCE_BATCH_SIZE]
+            Change.objects.filter(id__in=batch).update(
+                seq=models.Case(
+                    *(
+                        models.When(id=change_id, then=models.Value(state.last_seq + start + offset + 1))
+                        for offset, change_id in enumerate(batch)
+                    )
+                )
+            )
+        if ids:
+            state.last_seq += len(ids)
+            state.save(update_fields=["last_seq"])
+    return len(ids)
+
+
+def get_latest_change_seq() -> int:
+    return ChangeLogState.objects.values_list("last_seq", flat=True).first() or 0
+
+
+def get_pruned_change_seq() -> int:
+    return ChangeLogState.objects.values_list("pruned_through", flat=True).first() or 0
+
+
+def get_changes_since(seq: int, *, limit: int) -> list[Change]:
+    """Get the changes after the given sequence number, which have all committed."""
+    return list(Change.objects.filter(seq__gt=seq).order_by("seq")[:limit])
+
+
+def compact_changes() -> int:
+    """
+    Delete changes to objects that have changed again since, and deletions that are old enough to be pruned.
+
+    Any committed changes that were missed are sequenced first, as only sequenced changes are compacted.
+
+    :returns: the number of changes deleted.
+    """
+    sequence_changes()
+    now = timezone.now()
+    superseded = models.Exists(
+        Change.objects.filter(
+            object_type=models.OuterRef("object_type"),
+            object_id=models.OuterRef("object_id"),
+            seq__gt=models.OuterRef("seq"),
+        )
+    )
+    old_deletions = Change.objects.filter(
+        action=ChangeAction.DELETED, seq__isnull=False, changed_at__lt=now - DELETION_RETENTION
+    )
+
+    with transaction.atomic():
+        deleted, _ = Change.objects.filter(superseded).delete()
+        # Clients that last synced before a pruned deletion could miss it, so they will have to sync everything.
+        if pruned_through := old_deletions.aggregate(seq=models.Max("seq"))["seq"]:
+            deleted += old_deletions.filter(seq__lte=pruned_through).delete()[0]
+            pruned_through = max(pruned_through, get_pruned_change_seq())
+            ChangeLogState.objects.update_or_create(
+                id=1,
+                defaults={"pruned_through": pruned_through, "compacted_at": now},
+            )
+    return deleted
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("activity", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChangeLogState",
+            fields=[
+                ("id", models.PositiveSmallIntegerField(default=1, editable=False, primary_key=True, serialize=False)),
+                ("pruned_through", models.BigIntegerField(default=0)),
+                ("compacted_at", models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="Change",
+            fields=[
+                ("seq", models.BigAutoField(primary_key=True, serialize=False, verbose_name="sequence number")),
+                (
+                    "object_type",
+                    models.CharField(
+                        choices=[
+                            ("person", "Person"),
+                            ("accusation", "Accusation"),
+                            ("ratification", "Ratification"),
+                            ("consequence", "Consequence"),
+                            ("pub_event", "Pub event"),
+                            ("pub_event_rsvp", "Pub event RSVP"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("object_id", models.UUIDField(verbose_name="object ID")),
+                (
+                    "parent_id",
+                    models.UUIDField(
+                        blank=True,
+                        help_text="The accusation of a ratification, or the pub event of an RSVP.",
+                        null=True,
+                        verbose_name="parent ID",
+                    ),
+                ),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[("created", "Created"), ("updated", "Updated"), ("deleted", "Deleted")], max_length=10
+                    ),
+                ),
+                ("changed_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["seq"],
+                "indexes": [models.Index(fields=["object_type", "object_id", "seq"], name="change_object_idx")],
+            },
+        ),
+    ]
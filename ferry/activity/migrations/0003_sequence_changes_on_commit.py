@@ -0,0 +1,80 @@
+from django.apps.registry import Apps
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+
+
+def keep_sequence_numbers(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    """Carry on from the last sequence number, and make clients that are behind resync."""
+    Change = apps.get_model("activity", "Change")
+    ChangeLogState = apps.get_model("activity", "ChangeLogState")
+
+    last_seq = Change.objects.aggregate(seq=models.Max("seq"))["seq"]
+    if last_seq is None:
+        return
+    state, _ = ChangeLogState.objects.get_or_create(id=1)
+    state.last_seq = max(last_seq, state.pruned_through)
+    state.pruned_through = state.last_seq
+    state.save()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("activity", "0002_add_change_log"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="changelogstate",
+            name="last_seq",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunPython(keep_sequence_numbers, migrations.RunPython.noop),
+        # Sequence numbers are now given out on commit rather than on insert, so the changes are recreated.
+        migrations.DeleteModel(name="Change"),
+        migrations.CreateModel(
+            name="Change",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "seq",
+                    models.BigIntegerField(blank=True, null=True, unique=True, verbose_name="sequence number"),
+                ),
+                (
+                    "object_type",
+                    models.CharField(
+                        choices=[
+                            ("person", "Person"),
+                            ("accusation", "Accusation"),
+                            ("ratification", "Ratification"),
+                            ("consequence", "Consequence"),
+                            ("pub_event", "Pub event"),
+                            ("pub_event_rsvp", "Pub event RSVP"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("object_id", models.UUIDField(verbose_name="object ID")),
+                (
+                    "parent_id",
+                    models.UUIDField(
+                        blank=True,
+                        help_text="The accusation of a ratification, or the pub event of an RSVP.",
+                        null=True,
+                        verbose_name="parent ID",
+                    ),
+                ),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[("created", "Created"), ("updated", "Updated"), ("deleted", "Deleted")],
+                        max_length=10,
+                    ),
+                ),
+                ("changed_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["seq", "id"],
+                "indexes": [models.Index(fields=["object_type", "object_id", "seq"], name="change_object_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,137 @@
+import secrets
+import uuid
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+from ferry.accounts.models import User
+
+
+class ActivityType(models.TextChoices):
+    ACCUSATION_CREATED = "accusation.created", "Accusation created"
+    RATIFICATION_CREATED = "ratification.created", "Ratification created"
+    PUB_EVENT_ATTENDANCE_CHANGED = "pub_event.attendance_changed", "Pub event attendance changed"
+
+
+class Activity(models.Model):
+    """Something that happened, recorded in the same transaction so that it can be sent to subscribers."""
+
+    id = models.BigAutoField(verbose_name="ID", primary_key=True)
+    type = models.CharField(max_length=50, choices=ActivityType)
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True, editable=False)
+
+    class Meta:
+        verbose_name_plural = "activity"
+        ordering = ["id"]
+
+    def __str__(self) -> str:
+        return f"{self.get_type_display()} at {self.created_at}"
+
+
+def generate_webhook_secret() -> str:
+    return secrets.token_urlsafe(32)
+
+
+class WebhookSubscription(models.Model):
+    id = models.UUIDField(verbose_name="ID", primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="webhook_subscriptions")
+    url = models.URLField(verbose_name="URL", max_length=500)
+    activity_types = models.JSONField(default=list, help_text="The types of activity to send to the URL.")
+    secret = models.CharField(max_length=64, default=generate_webhook_secret, editable=False)
+    is_active = models.BooleanField(default=True)
+
+    created_at = models.DateTimeField(auto_now_add=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True, editable=False)
+
+    class Meta:
+        ordering = ["created_at"]
+
+    def __str__(self) -> str:
+        return self.url
+
+
+class WebhookDeliveryStatus(models.TextChoices):
+    PENDING = "P", "Pending"
+    DELIVERED = "D", "Delivered"
+    FAILED = "F", "Failed"
+
+
+class WebhookDelivery(models.Model):
+    id = models.UUIDField(verbose_name="ID", primary_key=True, default=uuid.uuid4, editable=False)
+    subscription = models.ForeignKey(WebhookSubscription, on_delete=models.CASCADE, related_name="deliveries")
+    activity = models.ForeignKey(Activity, on_delete=models.CASCADE, related_name="webhook_deliveries")
+    status = models.CharField(max_length=1, choices=WebhookDeliveryStatus, default=WebhookDeliveryStatus.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    delivered_at = models.DateTimeField(blank=True, null=True)
+
+    created_at = models.DateTimeField(auto_now_add=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True, editable=False)
+
+    class Meta:
+        verbose_name_plural = "webhook deliveries"
+        ordering = ["activity_id"]
+
+    def __str__(self) -> str:
+        return f"{self.activity} to {self.subscription}"
+
+
+class ChangeObjectType(models.TextChoices):
+    PERSON = "person", "Person"
+    ACCUSATION = "accusation", "Accusation"
+    RATIFICATION = "ratification", "Ratification"
+    CONSEQUENCE = "consequence", "Consequence"
+    PUB_EVENT = "pub_event", "Pub event"
+    PUB_EVENT_RSVP = "pub_event_rsvp", "Pub event RSVP"
+
+
+class ChangeAction(models.TextChoices):
+    CREATED = "created", "Created"
+    UPDATED = "updated", "Updated"
+    DELETED = "deleted", "Deleted"
+
+
+class Change(models.Model):
+    """
+    An entry in the change log, which lets API clients sync incrementally.
+
+    The sequence number is given out as the change commits and only increases, so clients can
+    ask for the changes after the last one they saw. Changes without one have not been sequenced
+    yet. Older changes to an object are compacted away once it changes again.
+    """
+
+    id = models.BigAutoField(verbose_name="ID", primary_key=True)
+    seq = models.BigIntegerField(verbose_name="sequence number", blank=True, null=True, unique=True)
+    object_type = models.CharField(max_length=20, choices=ChangeObjectType)
+    object_id = models.UUIDField(verbose_name="object ID")
+    parent_id = models.UUIDField(
+        verbose_name="parent ID",
+        blank=True,
+        null=True,
+        help_text="The accusation of a ratification, or the pub event of an RSVP.",
+    )
+    action = models.CharField(max_length=10, choices=ChangeAction)
+    changed_at = models.DateTimeField(auto_now_add=True, editable=False)
+
+    class Meta:
+        ordering = ["seq", "id"]
+        indexes = [models.Index(fields=["object_type", "object_id", "seq"], name="change_object_idx")]
+
+    def __str__(self) -> str:
+        return f"{self.get_object_type_display()} {self.object_id} {self.action}"
+
+
+class ChangeLogState(models.Model):
+    """
+    The last sequence number given out, and how much of the change log has been pruned, so that clients
+    that are too far behind can be told to resync.
+    """
+
+    id = models.PositiveSmallIntegerField(primary_key=True, default=1, editable=False)
+    last_seq = models.BigIntegerField(default=0)
+    pruned_through = models.BigIntegerField(default=0)
+    compacted_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self) -> str:
+        return f"Pruned through {self.pruned_through}"
@@ -0,0 +1,36 @@
+from typing import Any
+
+from django.db import connection
+
+from ferry.activity.models import Activity, ActivityType, WebhookDelivery, WebhookSubscription
+from ferry.jobs.queue import enqueue
+
+# Postgres only sends notifications once the transaction commits, so listeners never see uncommitted activity.
+ACTIVITY_CHANNEL = "ferry_activity"
+
+
+def publish_activity(activity_type: ActivityType, data: dict[str, Any]) -> Activity:
+    """
+    Record some activity, queue it for delivery to the webhooks subscribed to it, and notify live streams.
+
+    This should be called in the same transaction as the change, so that nothing is sent if the
+    change is rolled back.
+    """
+    activity = Activity.objects.create(type=activity_type, data=data)
+
+    subscriptions = [
+        subscription
+        for subscription in WebhookSubscription.objects.filter(is_active=True)
+        if activity_type in subscription.activity_types
+    ]
+    deliveries = WebhookDelivery.objects.bulk_create(
+        WebhookDelivery(subscription=subscription, activity=activity) for subscription in subscriptions
+    )
+    for delivery in deliveries:
+        enqueue("activity.deliver_webhooks", delivery_id=delivery.id)
+
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [ACTIVITY_CHANNEL, str(activity.id)])
+
+    return activity
@@ -0,0 +1,222 @@
+"""
+Live activity for the Server-Sent Events stream.
+
+Each worker has a single ``ActivityBroadcaster`` for its event loop, which watches for new
+activity and fans it out to every connected stream, so idle streams cost nothing but a queue.
+On Postgres it waits for the notifications sent as activity commits, and otherwise it polls
+the activity table. It only runs whilst at least one stream is connected.
+
+Activity IDs are taken when activity is created, but the activity can only be seen once its
+transaction commits, so activity can appear after activity with a later ID. The IDs that are
+skipped over are checked again until ``MISSING_ACTIVITY_TIMEOUT`` has passed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import weakref
+from collections.abc import AsyncIterator, Collection
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from asgiref.sync import sync_to_async
+from django.db import connection, models
+
+from ferry.activity.models import Activity, ActivityType
+from ferry.activity.repository import ACTIVITY_CHANNEL
+from ferry.pub.repository import get_next_pub_event
+
+if TYPE_CHECKING:
+    import psycopg
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 1.0
+# Even when notified, check for activity occasionally in case a notification was missed.
+LISTEN_TIMEOUT = 30.0
+MAX_QUEUED_ACTIVITY = 100
+ACTIVITY_BATCH_SIZE = 500
+# How long to keep checking for activity with an ID that was skipped over, in seconds.
+MISSING_ACTIVITY_TIMEOUT = 60.0
+MAX_MISSING_IDS = 1000
+
+
+class StreamActivity(NamedTuple):
+    # The ID to fetch activity after next time.
+    last_id: int
+    # The IDs before last_id without activity, which may belong to transactions that have not committed yet.
+    missing_ids: set[int]
+    activities: list[Activity]
+
+
+def get_stream_activity(
+    after_id: int, *, missing_ids: Collection[int] = (), limit: int = ACTIVITY_BATCH_SIZE
+) -> StreamActivity:
+    """
+    Get the activity after the given ID, or with one of the missing IDs, that is sent to streams.
+
+    Changes in attendance are only sent for the next pub event.
+    """
+    query = models.Q(id__gt=after_id)
+    if missing_ids:
+        query |= models.Q(id__in=missing_ids)
+    activities = list(Activity.objects.filter(query).order_by("id")[:limit])
+    if not activities:
+        return StreamActivity(after_id, set(missing_ids), [])
+
+    last_id = max(after_id, activities[-1].id)
+    seen_ids = {activity.id for activity in activities}
+    still_missing = {id_ for id_ in missing_ids if id_ not in seen_ids}
+    still_missing.update(id_ for id_ in range(after_id + 1, last_id) if id_ not in seen_ids)
+    if len(still_missing) > MAX_MISSING_IDS:
+        still_missing = set(sorted(still_missing)[-MAX_MISSING_IDS:])
+
+    if any(activity.type == ActivityType.PUB_EVENT_ATTENDANCE_CHANGED for activity in activities):
+        next_pub_event = get_next_pub_event()
+        next_pub_event_id = str(next_pub_event.id) if next_pub_event else None
+    else:
+        next_pub_event_id = None
+
+    return StreamActivity(
+        last_id,
+        still_missing,
+        [
+            activity
+            for activity in activities
+            if activity.type != ActivityType.PUB_EVENT_ATTENDANCE_CHANGED
+            or str(activity.data["id"]) == next_pub_event_id
+        ],
+    )
+
+
+def get_latest_activity_id() -> int:
+    return Activity.objects.order_by("-id").values_list("id", flat=True).first() or 0
+
+
+class ActivityBroadcaster:
+    """Fans new activity out to the streams of one event loop."""
+
+    def __init__(self, *, poll_interval: float = POLL_INTERVAL, max_queued_activity: int = MAX_QUEUED_ACTIVITY) -> None:
+        self._poll_interval = poll_interval
+        self._max_queued_activity = max_queued_activity
+        self._subscribers: set[asyncio.Queue[Activity | None]] = set()
+        self._task: asyncio.Task[None] | None = None
+        self._started = asyncio.Event()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[asyncio.Queue[Activity | None]]:
+        """
+        Receive new activity on a queue.
+
+        A subscriber that falls too far behind is sent None and dropped, and should reconnect.
+        """
+        queue: asyncio.Queue[Activity | None] = asyncio.Queue(maxsize=self._max_queued_activity + 1)
+        self._subscribers.add(queue)
+        if self._task is None or self._task.done():
+            self._started.clear()
+            self._task = asyncio.create_task(self._run())
+        try:
+            # Activity is only sent from the point the broadcaster started watching.
+            await self._started.wait()
+            yield queue
+        finally:
+            self._subscribers.discard(queue)
+            if not self._subscribers and self._task is not None:
+                self._task.cancel()
+                self._task = None
+
+    def _broadcast(self, activity: Activity) -> None:
+        for queue in list(self._subscribers):
+            if queue.qsize() >= self._max_queued_activity:
+                self._subscribers.discard(queue)
+                queue.put_nowait(None)
+            else:
+                queue.put_nowait(activity)
+
+    async def _run(self) -> None:
+        listener = await self._listen()
+        try:
+            last_id = await sync_to_async(get_latest_activity_id)()
+            # When each missing ID was first missed, by the event loop's clock.
+            missing_since: dict[int, float] = {}
+            self._started.set()
+            while True:
+                try:
+                    last_id, missing_ids, activities = await sync_to_async(get_stream_activity)(
+                        last_id, missing_ids=list(missing_since)
+                    )
+                except Exception:  # noqa: BLE001
+                    logger.exception("Failed to fetch activity for streams")
+                    activities = []
+                else:
+                    now = asyncio.get_running_loop().time()
+                    missing_since = {
+                        id_: missing_since.get(id_, now)
+                        for id_ in missing_ids
+                        if now - missing_since.get(id_, now) < MISSING_ACTIVITY_TIMEOUT
+                    }
+
+                for activity in activities:
+                    self._broadcast(activity)
+                if len(activities) < ACTIVITY_BATCH_SIZE:
+                    listener = await self._wait(listener)
+        finally:
+            # Let anyone still waiting for the broadcaster to start carry on, rather than hang.
+            self._started.set()
+            if listener is not None:
+                await listener.close()
+
+    async def _listen(self) -> psycopg.AsyncConnection[Any] | None:
+        if connection.vendor != "postgresql":
+            return None
+
+        try:
+            import psycopg
+
+            settings_dict = connection.settings_dict
+            listener = await psycopg.AsyncConnection.connect(
+                dbname=settings_dict["NAME"],
+                user=settings_dict["USER"],
+                password=settings_dict["PASSWORD"],
+                host=settings_dict["HOST"],
+                port=settings_dict["PORT"] or None,
+                autocommit=True,
+            )
+            await listener.execute(f"LISTEN {ACTIVITY_CHANNEL}")
+        except Exception:  # noqa: BLE001
+            logger.exception("Failed to listen for activity, falling back to polling")
+            return None
+        return listener
+
+    async def _wait(self, listener: psycopg.AsyncConnection[Any] | None) -> psycopg.AsyncConnection[Any] | None:
+        """Wait until there might be new activity, returning the listener to use next time."""
+        if listener is None:
+            await asyncio.sleep(self._poll_interval)
+            return None
+
+        try:
+            async for _ in listener.notifies(timeout=LISTEN_TIMEOUT, stop_after=1):
+                pass
+        except Exception:  # noqa: BLE001
+            logger.exception("Lost the connection listening for activity, reconnecting")
+            await listener.close()
+            await asyncio.sleep(self._poll_interval)
+            return await self._listen()
+        return listener
+
+
+_broadcasters: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, ActivityBroadcaster] = weakref.WeakKeyDictionary()
+
+
+def get_activity_broadcaster() -> ActivityBroadcaster:
+    """Get the broadcaster for the running event loop."""
+    loop = asyncio.get_running_loop()
+    broadcaster = _broadcasters.get(loop)
+    if broadcaster is None:
+        broadcaster = _broadcasters[loop] = ActivityBroadcaster()
+    return broadcaster
@@ -0,0 +1,24 @@
+from typing import Any
+
+from ferry.activity.changes import compact_changes, sequence_changes
+from ferry.activity.webhooks import deliver_webhooks
+from ferry.jobs.queue import task
+from ferry.jobs.schedule import periodic
+
+
+@task(name="activity.deliver_webhooks", batched=True, atomic=False)
+def deliver_webhooks_task(payloads: list[dict[str, Any]]) -> None:
+    deliver_webhooks(payload["delivery_id"] for payload in payloads)
+
+
+@periodic("*/5 * * * *")
+@task(name="activity.sequence_changes")
+def sequence_changes_task() -> None:
+    # Changes are sequenced as they commit, so this only picks up any that were missed.
+    sequence_changes()
+
+
+@periodic("45 3 * * *")
+@task(name="activity.compact_changes")
+def compact_changes_task() -> None:
+    compact_changes()
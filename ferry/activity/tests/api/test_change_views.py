@@ -0,0 +1,77 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import Client
+from django.urls import reverse_lazy
+
+from ferry.accounts.factories import PersonFactory
+from ferry.accounts.models import User
+from ferry.activity.changes import sequence_changes
+from ferry.activity.models import Change, ChangeLogState
+from ferry.conftest import APITest
+
+
+@pytest.mark.django_db
+class TestChangeFeedEndpoint(APITest):
+    url = reverse_lazy("api-2.0.0:changes-list")
+
+    def test_unauthenticated(self, client: Client) -> None:
+        resp = client.get(self.url)
+        assert resp.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_forbidden_for_non_superuser(self, client: Client, user: User) -> None:
+        resp = client.get(self.url, headers=self.get_headers(user))
+        assert resp.status_code == HTTPStatus.FORBIDDEN
+
+    def test_without_since_gets_latest_seq(self, client: Client, admin_user: User) -> None:
+        PersonFactory()
+        # Changes are sequenced as their transaction commits, which doesn't happen in tests.
+        sequence_changes()
+        latest = Change.objects.get().seq
+
+        resp = client.get(self.url, headers=self.get_headers(admin_user))
+
+        assert resp.status_code == HTTPStatus.OK
+        assert resp.json() == {"next_since": latest, "has_more": False, "results": []}
+
+    def test_changes_since(self, client: Client, admin_user: User) -> None:
+        # Arrange
+        PersonFactory()
+        sequence_changes()
+        since = Change.objects.get().seq
+        first, second = PersonFactory(), PersonFactory()
+        sequence_changes()
+        headers = self.get_headers(admin_user)
+
+        # Act
+        resp = client.get(self.url, {"since": since, "limit": 1}, headers=headers)
+
+        # Assert
+        assert resp.status_code == HTTPStatus.OK
+        data = resp.json()
+        assert data["has_more"] is True
+        assert [(change["type"], change["id"], change["action"]) for change in data["results"]] == [
+            ("person", str(first.id), "created"),
+        ]
+        assert data["next_since"] == data["results"][0]["seq"]
+
+        resp = client.get(self.url, {"since": data["next_since"]}, headers=headers)
+        data = resp.json()
+        assert data["has_more"] is False
+        assert [change["id"] for change in data["results"]] == [str(second.id)]
+
+    def test_no_new_changes(self, client: Client, admin_user: User) -> None:
+        resp = client.get(self.url, {"since": 10}, headers=self.get_headers(admin_user))
+
+        assert resp.json() == {"next_since": 10, "has_more": False, "results": []}
+
+    def test_compacted(self, client: Client, admin_user: User) -> None:
+        ChangeLogState.objects.create(pruned_through=10)
+
+        resp = client.get(self.url, {"since": 5}, headers=self.get_headers(admin_user))
+
+        assert resp.status_code == HTTPStatus.GONE
+
+    def test_invalid_since(self, client: Client, admin_user: User) -> None:
+        resp = client.get(self.url, {"since": "bees"}, headers=self.get_headers(admin_user))
+        assert resp.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,56 @@
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.http import StreamingHttpResponse
+from django.test import AsyncClient, Client
+from django.urls import reverse_lazy
+
+from ferry.accounts.models import User
+from ferry.activity.models import ActivityType
+from ferry.activity.repository import publish_activity
+from ferry.conftest import APITest
+
+
+@pytest.mark.django_db(transaction=True)
+class TestActivityStreamEndpoint(APITest):
+    url = reverse_lazy("api-2.0.0:stream")
+
+    def test_unauthenticated(self, client: Client) -> None:
+        resp = client.get(self.url)
+        assert resp.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_invalid_token(self, client: Client) -> None:
+        resp = client.get(self.url, headers={"Authorization": "Bearer bees"})
+        assert resp.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_unknown_types(self, client: Client, user: User) -> None:
+        resp = client.get(self.url, {"types": "accusation.created,bees"}, headers=self.get_headers(user))
+        assert resp.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_stream(self, user: User) -> None:
+        missed = publish_activity(ActivityType.RATIFICATION_CREATED, {"id": "missed"})
+        publish_activity(ActivityType.ACCUSATION_CREATED, {"id": "filtered"})
+        headers = {**self.get_headers(user), "Last-Event-ID": str(missed.id - 1)}
+
+        async def read_events() -> list[str]:
+            resp = await AsyncClient().get(self.url, {"types": "ratification.created"}, headers=headers)
+            assert resp.status_code == HTTPStatus.OK
+            assert resp["Content-Type"] == "text/event-stream"
+            assert isinstance(resp, StreamingHttpResponse)
+
+            events = []
+            async for chunk in resp.streaming_content:
+                events.append(chunk.decode() if isinstance(chunk, bytes) else str(chunk))
+                if len(events) == 2:
+                    new = await sync_to_async(publish_activity)(ActivityType.RATIFICATION_CREATED, {"id": "new"})
+                if len(events) == 3:
+                    break
+            assert new.id > missed.id
+            return events
+
+        events = async_to_sync(read_events)()
+
+        assert events[0] == "retry: 3000\n\n"
+        assert events[1] == f'id: {missed.id}\nevent: ratification.created\ndata: {{"id": "missed"}}\n\n'
+        assert events[2].startswith("id: ") and '{"id": "new"}' in events[2]
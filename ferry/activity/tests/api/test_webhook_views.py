@@ -0,0 +1,66 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import Client
+from django.urls import reverse_lazy
+
+from ferry.accounts.models import User
+from ferry.activity.models import ActivityType, WebhookSubscription
+from ferry.conftest import APITest
+
+
+@pytest.mark.django_db
+class TestWebhookSubscriptionEndpoints(APITest):
+    url = reverse_lazy("api-2.0.0:webhooks-list")
+
+    def test_unauthenticated(self, client: Client) -> None:
+        resp = client.get(self.url)
+        assert resp.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_forbidden_for_non_superuser(self, client: Client, user: User) -> None:
+        resp = client.get(self.url, headers=self.get_headers(user))
+        assert resp.status_code == HTTPStatus.FORBIDDEN
+
+    def test_create(self, client: Client, admin_user: User) -> None:
+        # Act
+        resp = client.post(
+            self.url,
+            {"url": "https://example.com/hook", "activity_types": ["ratification.created", "accusation.created"]},
+            headers=self.get_headers(admin_user),
+            content_type="application/json",
+        )
+
+        # Assert
+        assert resp.status_code == HTTPStatus.CREATED
+        data = resp.json()
+        subscription = WebhookSubscription.objects.get()
+        assert subscription.user == admin_user
+        assert data["activity_types"] == ["accusation.created", "ratification.created"]
+        assert data["secret"] == subscription.secret
+        assert len(subscription.secret) > 20
+
+    def test_create_invalid_activity_type(self, client: Client, admin_user: User) -> None:
+        resp = client.post(
+            self.url,
+            {"url": "https://example.com/hook", "activity_types": ["bees"]},
+            headers=self.get_headers(admin_user),
+            content_type="application/json",
+        )
+        assert resp.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_list_only_own_subscriptions(self, client: Client, admin_user: User) -> None:
+        # Arrange
+        other_admin = User.objects.create(username="other", is_superuser=True)
+        own = WebhookSubscription.objects.create(
+            user=admin_user, url="https://example.com/a", activity_types=[ActivityType.ACCUSATION_CREATED]
+        )
+        WebhookSubscription.objects.create(
+            user=other_admin, url="https://example.com/b", activity_types=[ActivityType.ACCUSATION_CREATED]
+        )
+
+        # Act
+        resp = client.get(self.url, headers=self.get_headers(admin_user))
+
+        # Assert
+        assert resp.status_code == HTTPStatus.OK
+        assert [subscription["id"] for subscription in resp.json()["results"]] == [str(own.id)]
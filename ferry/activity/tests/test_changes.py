@@ -0,0 +1,152 @@
+from datetime import timedelta
+from typing import Any
+
+import pytest
+import time_machine
+from django.utils import timezone
+
+from ferry.accounts.factories import PersonFactory
+from ferry.accounts.models import Person
+from ferry.activity.changes import (
+    compact_changes,
+    get_changes_since,
+    get_latest_change_seq,
+    get_pruned_change_seq,
+    sequence_changes,
+)
+from ferry.activity.models import Change, ChangeAction, ChangeObjectType
+from ferry.court.factories import AccusationFactory
+from ferry.pub.factories import PubEventFactory, PubEventRSVPFactory
+from ferry.pub.models import PubEventRSVPMethod
+from ferry.pub.repository import invalidate_pub_event_snapshot, toggle_rsvp_for_pub_event
+
+
+@pytest.mark.django_db
+class TestChangeLog:
+    def test_save_and_delete_are_recorded(self) -> None:
+        person: Person = PersonFactory()  # type: ignore[assignment]
+        person.display_name = "bees"
+        person.save()
+        person_id = person.id
+        person.delete()
+
+        changes = Change.objects.filter(object_type=ChangeObjectType.PERSON)
+        assert list(changes.values_list("object_id", "action")) == [
+            (person_id, ChangeAction.CREATED),
+            (person_id, ChangeAction.UPDATED),
+            (person_id, ChangeAction.DELETED),
+        ]
+
+    def test_invalidated_pub_event_is_recorded(self) -> None:
+        pub_event = PubEventFactory()
+        Change.objects.all().delete()
+
+        invalidate_pub_event_snapshot(pub_event)
+
+        change = Change.objects.get()
+        assert (change.object_type, change.object_id, change.action) == (
+            ChangeObjectType.PUB_EVENT,
+            pub_event.id,
+            ChangeAction.UPDATED,
+        )
+
+    def test_ratification_has_accusation_as_parent(self) -> None:
+        accusation = AccusationFactory()
+
+        change = Change.objects.get(object_type=ChangeObjectType.RATIFICATION)
+        assert change.object_id == accusation.ratification.id
+        assert change.parent_id == accusation.id
+
+    def test_bulk_rsvp_toggle_is_recorded(self) -> None:
+        rsvp = PubEventRSVPFactory(method=PubEventRSVPMethod.WEB)
+        Change.objects.all().delete()
+
+        toggle_rsvp_for_pub_event(rsvp.pub_event, rsvp.person)
+
+        change = Change.objects.get()
+        assert (change.object_type, change.object_id, change.parent_id, change.action) == (
+            ChangeObjectType.PUB_EVENT_RSVP,
+            rsvp.id,
+            rsvp.pub_event_id,
+            ChangeAction.UPDATED,
+        )
+
+    def test_unsequenced_changes_are_held_back(self) -> None:
+        PubEventFactory()
+
+        assert get_changes_since(0, limit=10) == []
+        sequence_changes()
+        assert get_changes_since(0, limit=10) == list(Change.objects.all())
+
+    def test_changes_since(self) -> None:
+        PersonFactory()
+        sequence_changes()
+        last_seen = Change.objects.get().seq
+        person = PersonFactory()
+        sequence_changes()
+
+        assert [change.object_id for change in get_changes_since(last_seen, limit=10)] == [person.id]
+
+    def test_sequenced_on_commit(self, django_capture_on_commit_callbacks: Any) -> None:
+        with django_capture_on_commit_callbacks(execute=True):
+            person = PersonFactory()
+
+        change = Change.objects.get()
+        assert change.seq == get_latest_change_seq() == 1
+        assert get_changes_since(0, limit=10) == [change]
+        assert person.id == change.object_id
+
+    def test_late_commit_is_not_skipped(self, django_capture_on_commit_callbacks: Any) -> None:
+        # A transaction that recorded a change first, but commits after another.
+        with django_capture_on_commit_callbacks() as late_commit:
+            late = PersonFactory()
+        with django_capture_on_commit_callbacks(execute=True):
+            early = PersonFactory()
+
+        changes = get_changes_since(0, limit=10)
+        assert [change.object_id for change in changes] == [early.id]
+        last_seen = changes[-1].seq
+
+        for callback in late_commit:
+            callback()
+
+        assert [change.object_id for change in get_changes_since(last_seen, limit=10)] == [late.id]
+
+    def test_sequence_missed_changes(self) -> None:
+        PersonFactory.create_batch(3)
+
+        assert sequence_changes() == 3
+
+        assert list(Change.objects.values_list("seq", flat=True)) == [1, 2, 3]
+        assert sequence_changes() == 0
+
+
+@pytest.mark.django_db
+class TestCompactChanges:
+    def test_superseded_changes_are_deleted(self) -> None:
+        person = PersonFactory()
+        person.save()
+        other = PersonFactory()
+
+        assert compact_changes() == 1
+
+        assert list(Change.objects.values_list("object_id", "action")) == [
+            (person.id, ChangeAction.UPDATED),
+            (other.id, ChangeAction.CREATED),
+        ]
+        assert get_pruned_change_seq() == 0
+
+    def test_old_deletions_are_pruned(self) -> None:
+        with time_machine.travel(timezone.now() - timedelta(days=31)):
+            PersonFactory().delete()
+        sequence_changes()
+        deletion = Change.objects.get(action=ChangeAction.DELETED)
+        recent = PersonFactory()
+        recent_id = recent.id
+        recent.delete()
+
+        # Both creations are superseded, and the old deletion is pruned.
+        assert compact_changes() == 3
+
+        assert list(Change.objects.values_list("object_id", "action")) == [(recent_id, ChangeAction.DELETED)]
+        assert get_pruned_change_seq() == deletion.seq
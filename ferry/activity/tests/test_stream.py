@@ -0,0 +1,88 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.utils import timezone
+
+from ferry.activity.models import Activity, ActivityType
+from ferry.activity.repository import publish_activity
+from ferry.activity.stream import ActivityBroadcaster, get_stream_activity
+from ferry.pub.factories import PubEventFactory
+
+
+@pytest.mark.django_db
+class TestGetStreamActivity:
+    def test_attendance_only_for_next_pub_event(self) -> None:
+        next_pub_event = PubEventFactory(timestamp=timezone.now() + timedelta(days=1))
+        later_pub_event = PubEventFactory(timestamp=timezone.now() + timedelta(days=8))
+        accusation = publish_activity(ActivityType.ACCUSATION_CREATED, {"id": "a"})
+        next_attendance = publish_activity(
+            ActivityType.PUB_EVENT_ATTENDANCE_CHANGED, {"id": next_pub_event.id, "attendees": []}
+        )
+        later_attendance = publish_activity(
+            ActivityType.PUB_EVENT_ATTENDANCE_CHANGED, {"id": later_pub_event.id, "attendees": []}
+        )
+
+        last_id, missing_ids, activities = get_stream_activity(0)
+
+        assert last_id == later_attendance.id
+        assert missing_ids == set()
+        assert activities == [accusation, next_attendance]
+
+    def test_nothing_new(self) -> None:
+        activity = publish_activity(ActivityType.ACCUSATION_CREATED, {"id": "a"})
+
+        assert get_stream_activity(activity.id) == (activity.id, set(), [])
+
+    def test_activity_committed_late(self) -> None:
+        first, uncommitted, last = (publish_activity(ActivityType.ACCUSATION_CREATED, {"id": i}) for i in "abc")
+        uncommitted_id = uncommitted.id
+        # Stand in for activity whose transaction has not committed yet.
+        uncommitted.delete()
+
+        last_id, missing_ids, activities = get_stream_activity(first.id - 1)
+
+        assert last_id == last.id
+        assert missing_ids == {uncommitted_id}
+        assert activities == [first, last]
+
+        late = Activity.objects.create(id=uncommitted_id, type=ActivityType.ACCUSATION_CREATED, data={"id": "b"})
+
+        assert get_stream_activity(last_id, missing_ids=missing_ids) == (last.id, set(), [late])
+
+
+@pytest.mark.django_db(transaction=True)
+class TestActivityBroadcaster:
+    def test_activity_is_sent_to_every_subscriber(self) -> None:
+        publish_activity(ActivityType.ACCUSATION_CREATED, {"id": "old"})
+
+        async def run() -> list[Activity | None]:
+            broadcaster = ActivityBroadcaster(poll_interval=0.01)
+            async with broadcaster.subscribe() as first, broadcaster.subscribe() as second:
+                assert broadcaster.subscriber_count == 2
+                await sync_to_async(publish_activity)(ActivityType.ACCUSATION_CREATED, {"id": "new"})
+                received = [await asyncio.wait_for(queue.get(), timeout=1) for queue in (first, second)]
+            assert broadcaster.subscriber_count == 0
+            assert broadcaster._task is None
+            return received
+
+        received = async_to_sync(run)()
+
+        assert [activity.data if activity else None for activity in received] == [{"id": "new"}, {"id": "new"}]
+
+    def test_slow_subscriber_is_dropped(self) -> None:
+        async def run() -> None:
+            broadcaster = ActivityBroadcaster(poll_interval=0.01, max_queued_activity=2)
+            async with broadcaster.subscribe() as queue:
+                for i in range(3):
+                    await sync_to_async(publish_activity)(ActivityType.ACCUSATION_CREATED, {"id": i})
+                async with asyncio.timeout(1):
+                    while broadcaster.subscriber_count:
+                        await asyncio.sleep(0.01)
+
+                items = [queue.get_nowait() for _ in range(queue.qsize())]
+                assert items[-1] is None
+                assert len(items) == 3
+
+        async_to_sync(run)()
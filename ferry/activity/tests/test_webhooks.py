@@ -0,0 +1,108 @@
+import hashlib
+import hmac
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from ferry.accounts.models import User
+from ferry.activity.models import Activity, ActivityType, WebhookDelivery, WebhookDeliveryStatus, WebhookSubscription
+from ferry.activity.repository import publish_activity
+from ferry.activity.webhooks import MAX_DELIVERY_ATTEMPTS, deliver_webhooks, sign_webhook
+from ferry.court.factories import AccusationFactory
+from ferry.jobs.models import Job
+
+
+@pytest.fixture
+def subscription(admin_user: User) -> WebhookSubscription:
+    return WebhookSubscription.objects.create(
+        user=admin_user,
+        url="https://example.com/hook",
+        activity_types=[ActivityType.ACCUSATION_CREATED],
+    )
+
+
+def test_sign_webhook() -> None:
+    signature = sign_webhook("secret", 1700000000, b'{"deliveries": []}')
+
+    expected = hmac.new(b"secret", b'1700000000.{"deliveries": []}', hashlib.sha256).hexdigest()
+    assert signature == f"t=1700000000,v1={expected}"
+
+
+@pytest.mark.django_db
+class TestPublishActivity:
+    def test_only_matching_subscriptions_get_deliveries(self, subscription: WebhookSubscription) -> None:
+        WebhookSubscription.objects.create(
+            user=subscription.user,
+            url="https://example.com/other",
+            activity_types=[ActivityType.RATIFICATION_CREATED],
+        )
+        WebhookSubscription.objects.create(
+            user=subscription.user,
+            url="https://example.com/inactive",
+            activity_types=[ActivityType.ACCUSATION_CREATED],
+            is_active=False,
+        )
+
+        activity = publish_activity(ActivityType.ACCUSATION_CREATED, {"id": 1})
+
+        delivery = WebhookDelivery.objects.get()
+        assert delivery.subscription == subscription
+        assert delivery.activity == activity
+        assert Job.objects.get().payload == {"delivery_id": str(delivery.id)}
+
+    def test_creating_accusation_publishes_activity(self) -> None:
+        accusation = AccusationFactory()
+
+        activity = Activity.objects.get(type=ActivityType.ACCUSATION_CREATED)
+        assert activity.data["id"] == str(accusation.id)
+        assert Activity.objects.filter(type=ActivityType.RATIFICATION_CREATED).exists()
+
+
+@pytest.mark.django_db
+class TestDeliverWebhooks:
+    @patch("ferry.activity.webhooks.get_session")
+    def test_deliveries_are_batched_and_signed(self, mock_get_session: Mock, subscription: WebhookSubscription) -> None:
+        publish_activity(ActivityType.ACCUSATION_CREATED, {"id": 1})
+        publish_activity(ActivityType.ACCUSATION_CREATED, {"id": 2})
+
+        deliver_webhooks(WebhookDelivery.objects.values_list("id", flat=True))
+
+        mock_session = mock_get_session.return_value
+        mock_session.post.assert_called_once()
+        url = mock_session.post.call_args.args[0]
+        body = mock_session.post.call_args.kwargs["data"]
+        signature = mock_session.post.call_args.kwargs["headers"]["X-Ferry-Signature"]
+        assert url == subscription.url
+        assert [delivery["data"] for delivery in json.loads(body)["deliveries"]] == [{"id": 1}, {"id": 2}]
+        timestamp = int(signature.split(",")[0].removeprefix("t="))
+        assert signature == sign_webhook(subscription.secret, timestamp, body)
+        assert set(WebhookDelivery.objects.values_list("status", "attempts")) == {(WebhookDeliveryStatus.DELIVERED, 1)}
+
+    @patch("ferry.activity.webhooks.get_session")
+    def test_failed_delivery_is_retried(self, mock_get_session: Mock, subscription: WebhookSubscription) -> None:
+        mock_get_session.return_value.post.side_effect = requests.ConnectionError("nope")
+        publish_activity(ActivityType.ACCUSATION_CREATED, {"id": 1})
+        delivery = WebhookDelivery.objects.get()
+
+        deliver_webhooks([delivery.id])
+
+        delivery.refresh_from_db()
+        assert delivery.status == WebhookDeliveryStatus.PENDING
+        assert delivery.attempts == 1
+        assert "nope" in delivery.last_error
+        assert Job.objects.filter(task="activity.deliver_webhooks").count() == 2
+
+    @patch("ferry.activity.webhooks.get_session")
+    def test_delivery_fails_after_max_attempts(self, mock_get_session: Mock, subscription: WebhookSubscription) -> None:
+        mock_get_session.return_value.post.side_effect = requests.ConnectionError("nope")
+        publish_activity(ActivityType.ACCUSATION_CREATED, {"id": 1})
+        delivery = WebhookDelivery.objects.get()
+        WebhookDelivery.objects.update(attempts=MAX_DELIVERY_ATTEMPTS - 1)
+
+        deliver_webhooks([delivery.id])
+
+        delivery.refresh_from_db()
+        assert delivery.status == WebhookDeliveryStatus.FAILED
+        assert Job.objects.filter(task="activity.deliver_webhooks").count() == 1
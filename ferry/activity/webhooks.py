@@ -0,0 +1,120 @@
+"""
+Delivery of activity to webhook subscribers.
+
+Deliveries for the same subscriber are sent together as a batch in a single request. Each
+request is signed with the subscription's secret, so that the subscriber can check that it
+came from us: the ``X-Ferry-Signature`` header contains the timestamp and a HMAC-SHA256 of
+``"{timestamp}.{body}"``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+import time
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import timedelta
+from functools import lru_cache
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+from ferry.activity.models import WebhookDelivery, WebhookDeliveryStatus, WebhookSubscription
+from ferry.jobs.queue import enqueue
+
+if TYPE_CHECKING:
+    import requests
+
+WEBHOOK_TIMEOUT = 5
+MAX_DELIVERY_ATTEMPTS = 8
+RETRY_DELAY = timedelta(minutes=1)
+
+
+@lru_cache
+def get_session() -> requests.Session:
+    # requests is slow to import, so is only loaded once there is something to deliver.
+    import requests
+
+    return requests.Session()
+
+
+def sign_webhook(secret: str, timestamp: int, body: bytes) -> str:
+    signature = hmac.new(secret.encode(), f"{timestamp}.".encode() + body, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={signature}"
+
+
+def _send_deliveries(subscription: WebhookSubscription, deliveries: list[WebhookDelivery]) -> None:
+    body = json.dumps(
+        {
+            "deliveries": [
+                {
+                    "id": delivery.id,
+                    "type": delivery.activity.type,
+                    "data": delivery.activity.data,
+                    "created_at": delivery.activity.created_at,
+                }
+                for delivery in deliveries
+            ],
+        },
+        cls=DjangoJSONEncoder,
+    ).encode()
+    resp = get_session().post(
+        subscription.url,
+        data=body,
+        headers={
+            "Content-Type": "application/json",
+            "X-Ferry-Signature": sign_webhook(subscription.secret, int(time.time()), body),
+        },
+        timeout=WEBHOOK_TIMEOUT,
+    )
+    resp.raise_for_status()
+
+
+def _retry_deliveries(deliveries: list[WebhookDelivery], error: str) -> None:
+    for delivery in deliveries:
+        delivery.attempts += 1
+        delivery.last_error = error
+        if delivery.attempts < MAX_DELIVERY_ATTEMPTS:
+            delay = RETRY_DELAY * 2 ** (delivery.attempts - 1)
+            enqueue("activity.deliver_webhooks", delay=delay, delivery_id=delivery.id)
+        else:
+            delivery.status = WebhookDeliveryStatus.FAILED
+    WebhookDelivery.objects.bulk_update(deliveries, ["attempts", "last_error", "status"])
+
+
+def deliver_webhooks(delivery_ids: Iterable[UUID | str]) -> None:
+    """
+    Send pending deliveries to their subscribers, batched by subscriber.
+
+    A subscriber that fails does not hold up the others: its deliveries are queued to be retried
+    later, until they run out of attempts.
+    """
+    import requests
+
+    deliveries = WebhookDelivery.objects.filter(
+        id__in=delivery_ids,
+        status=WebhookDeliveryStatus.PENDING,
+        subscription__is_active=True,
+    ).select_related("activity", "subscription")
+
+    deliveries_by_subscription: dict[WebhookSubscription, list[WebhookDelivery]] = defaultdict(list)
+    for delivery in deliveries.order_by("activity_id"):
+        deliveries_by_subscription[delivery.subscription].append(delivery)
+
+    for subscription, subscription_deliveries in deliveries_by_subscription.items():
+        try:
+            _send_deliveries(subscription, subscription_deliveries)
+        except requests.RequestException as e:
+            _retry_deliveries(subscription_deliveries, repr(e))
+        else:
+            WebhookDelivery.objects.filter(id__in=[delivery.id for delivery in subscription_deliveries]).update(
+                status=WebhookDeliveryStatus.DELIVERED,
+                attempts=models.F("attempts") + 1,
+                last_error="",
+                delivered_at=timezone.now(),
+            )
@@ -1,9 +1,21 @@
+from collections.abc import Iterator
+
 import pytest
+from django.core.cache import caches
 
 from ferry.accounts.models import Person, User
+from ferry.core.cache import get_cache
 from ferry.court.factories import PersonFactory
 
 
+@pytest.fixture(autouse=True)
+def clear_caches() -> Iterator[None]:
+    """Cached values would outlive the data rolled back after each test."""
+    yield
+    get_cache().clear()
+    caches["default"].clear()
+
+
 @pytest.fixture
 def person() -> Person:
     return PersonFactory()  # type: ignore[return-value]
@@ -0,0 +1,195 @@
+"""
+Making many API requests in one.
+
+``POST /api/v2/batch/`` runs a list of requests against the API in order, with the user that
+made the batch, and returns each response. With ``atomic``, the requests run in a transaction
+that is rolled back if any of them fails, and the requests after the failure are not run.
+
+A request can use the responses before it: ``{{0.id}}`` in its path or body is replaced with
+the ``id`` in the body of the first response. A string that is only a reference is replaced
+with the value itself, so references to numbers stay numbers.
+
+A request that fails with an unexpected error gets a 500 response, rather than failing the batch.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import logging
+import re
+from http import HTTPStatus
+from typing import Any
+from urllib.parse import urlsplit
+
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import transaction
+from django.http import HttpResponseBase
+from django.urls import Resolver404, resolve
+from drf_spectacular.utils import extend_schema
+from rest_framework import serializers
+from rest_framework.decorators import api_view
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_REQUESTS = 20
+
+# The API views that cannot be part of a batch, by URL name.
+EXCLUDED_URL_NAMES = {"batch", "stream"}
+
+REFERENCE_RE = re.compile(r"\{\{\s*(?P<index>\d+)(?P<keys>(?:\.[\w-]+)*)\s*\}\}")
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(choices=["GET", "POST", "PUT", "PATCH", "DELETE"])
+    path = serializers.RegexField(r"^/api/v2/", help_text="The path of the request, which may have a query string.")
+    body = serializers.JSONField(required=False, allow_null=True, default=None)
+    headers = serializers.DictField(child=serializers.CharField(), required=False, default=dict)
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = serializers.ListField(child=BatchRequestSerializer(), allow_empty=False, max_length=MAX_BATCH_REQUESTS)
+    atomic = serializers.BooleanField(
+        default=False, help_text="Roll back every request if any of them fails, and stop at the failure."
+    )
+
+
+class BatchResponseSerializer(serializers.Serializer):
+    status = serializers.IntegerField()
+    headers = serializers.DictField(child=serializers.CharField())
+    body = serializers.JSONField(allow_null=True)
+
+
+class BatchResultSerializer(serializers.Serializer):
+    responses = BatchResponseSerializer(many=True, help_text="The response to each request that was run, in order.")
+    rolled_back = serializers.BooleanField()
+
+
+class UnresolvedReferenceError(Exception):
+    pass
+
+
+def _get_referenced_value(match: re.Match[str], responses: list[dict[str, Any]]) -> Any:
+    index = int(match["index"])
+    if index >= len(responses):
+        raise UnresolvedReferenceError(f"{match[0]} refers to a request that has not been run yet.")
+
+    value = responses[index]["body"]
+    for key in match["keys"].split(".")[1:]:
+        if isinstance(value, dict) and key in value:
+            value = value[key]
+        elif isinstance(value, list) and key.isdigit() and int(key) < len(value):
+            value = value[int(key)]
+        else:
+            raise UnresolvedReferenceError(f"{match[0]} refers to something that is not in the response.")
+    return value
+
+
+def resolve_references(value: Any, responses: list[dict[str, Any]]) -> Any:
+    """Replace the references to earlier responses in a path or body."""
+    if isinstance(value, str):
+        if match := REFERENCE_RE.fullmatch(value):
+            return _get_referenced_value(match, responses)
+        return REFERENCE_RE.sub(lambda match: str(_get_referenced_value(match, responses)), value)
+    if isinstance(value, list):
+        return [resolve_references(item, responses) for item in value]
+    if isinstance(value, dict):
+        return {key: resolve_references(item, responses) for key, item in value.items()}
+    return value
+
+
+def _build_request(request: Request, method: str, path: str, body: Any, headers: dict[str, str]) -> WSGIRequest:
+    url = urlsplit(path)
+    content = b"" if body is None else json.dumps(body, cls=JSONEncoder).encode()
+
+    # Keep what describes the server and client, but not the headers or body of the batch.
+    environ = {
+        key: value
+        for key, value in request.META.items()
+        if not key.startswith(("HTTP_", "CONTENT_", "wsgi.")) or key == "HTTP_HOST"
+    }
+    environ.update(
+        {f"HTTP_{name.upper().replace('-', '_')}": value for name, value in headers.items()},
+        REQUEST_METHOD=method,
+        PATH_INFO=url.path,
+        QUERY_STRING=url.query,
+        CONTENT_TYPE="application/json",
+        CONTENT_LENGTH=str(len(content)),
+    )
+    environ["wsgi.input"] = io.BytesIO(content)
+    environ["wsgi.url_scheme"] = request.scheme
+
+    sub_request = WSGIRequest(environ)
+    # The batch has already been authenticated, so each request uses the same user and token.
+    sub_request._force_auth_user = request.user  # type: ignore[attr-defined]
+    sub_request._force_auth_token = request.auth  # type: ignore[attr-defined]
+    return sub_request
+
+
+def _error(status: HTTPStatus, detail: str) -> dict[str, Any]:
+    return {"status": status, "headers": {}, "body": {"detail": detail}}
+
+
+def _to_result(response: HttpResponseBase) -> dict[str, Any]:
+    if isinstance(response, Response):
+        body = response.data
+    elif response.get("Content-Type", "").startswith("application/json"):
+        body = json.loads(response.content)  # type: ignore[attr-defined]
+    else:
+        body = response.content.decode()  # type: ignore[attr-defined]
+    return {"status": response.status_code, "headers": dict(response.items()), "body": body}
+
+
+def run_request(request: Request, sub_request_data: dict[str, Any], responses: list[dict[str, Any]]) -> dict[str, Any]:
+    try:
+        path = resolve_references(sub_request_data["path"], responses)
+        body = resolve_references(sub_request_data["body"], responses)
+    except UnresolvedReferenceError as exc:
+        return _error(HTTPStatus.BAD_REQUEST, str(exc))
+
+    try:
+        match = resolve(urlsplit(path).path)
+    except Resolver404:
+        return _error(HTTPStatus.NOT_FOUND, "Not found.")
+    if match.namespace != "api" or match.url_name in EXCLUDED_URL_NAMES:
+        return _error(HTTPStatus.BAD_REQUEST, "This path cannot be part of a batch.")
+
+    sub_request = _build_request(request, sub_request_data["method"], path, body, sub_request_data["headers"])
+    sub_request.resolver_match = match
+    try:
+        return _to_result(match.func(sub_request, *match.args, **match.kwargs))
+    except Exception:
+        logger.exception("Request in batch failed: %s %s", sub_request_data["method"], path)
+        return _error(HTTPStatus.INTERNAL_SERVER_ERROR, "A server error occurred.")
+
+
+@extend_schema(
+    tags=["Batch"],
+    request=BatchSerializer,
+    responses={200: BatchResultSerializer},
+    description=(
+        "Run many API requests in one. `{{n.key}}` in a path or body is replaced with `key` from the body of "
+        "response `n`."
+    ),
+)
+@api_view(["POST"])
+def batch(request: Request) -> Response:
+    serializer = BatchSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    atomic = serializer.validated_data["atomic"]
+
+    responses: list[dict[str, Any]] = []
+    rolled_back = False
+    with transaction.atomic() if atomic else contextlib.nullcontext():
+        for sub_request_data in serializer.validated_data["requests"]:
+            responses.append(run_request(request, sub_request_data, responses))
+            if atomic and responses[-1]["status"] >= HTTPStatus.BAD_REQUEST:
+                transaction.set_rollback(True)
+                rolled_back = True
+                break
+
+    return Response({"responses": responses, "rolled_back": rolled_back})
@@ -0,0 +1,162 @@
+"""
+Compiled serializers for read-only list endpoints.
+
+A serializer is compiled into the columns it needs and a flat function that builds its output
+from a row of ``QuerySet.values()``, which skips creating model instances and walking DRF's
+fields for each object. Each value is still converted by the serializer's own field, so the
+output is exactly the same as the serializer's.
+
+Only serializers made of model fields, primary key relations and nested serializers of single
+related objects can be compiled. Viewsets opt in with ``CompiledListModelMixin``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from functools import lru_cache
+from typing import Any
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework import generics, relations, serializers
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from ferry.core.api.fieldsets import FieldSelection
+
+Row = dict[str, Any]
+Getter = Callable[[Row], Any]
+
+
+class UncompilableSerializerError(Exception):
+    pass
+
+
+class CompiledSerializer:
+    def __init__(
+        self, serializer_class: type[serializers.ModelSerializer], field_selection: FieldSelection | None = None
+    ) -> None:
+        self.serializer_class = serializer_class
+        serializer = serializer_class(context={"field_selection": field_selection})
+        self.columns, self._build = _compile(serializer, serializer_class.Meta.model, prefix="")
+
+    def __repr__(self) -> str:
+        return f"<CompiledSerializer {self.serializer_class.__name__}>"
+
+    def get_rows(self, queryset: models.QuerySet[Any], *extra_columns: str) -> models.QuerySet[Any, Row]:
+        """Get the rows to build from, with any other columns that the caller needs."""
+        return queryset.values(*dict.fromkeys([*self.columns, *extra_columns]))
+
+    def build(self, row: Row) -> dict[str, Any]:
+        return self._build(row)
+
+    def build_many(self, rows: Iterable[Row]) -> list[dict[str, Any]]:
+        build = self._build
+        return [build(row) for row in rows]
+
+
+def _get_model_field(model: type[models.Model], name: str, serializer_field: serializers.Field) -> models.Field:
+    try:
+        return model._meta.get_field(name)  # type: ignore[return-value]
+    except FieldDoesNotExist:
+        raise UncompilableSerializerError(
+            f"{serializer_field.field_name} is not a field of {model.__name__}, so cannot be read from a row."
+        ) from None
+
+
+def _resolve_source(field: serializers.Field, model: type[models.Model]) -> tuple[str, models.Field]:
+    """Get the lookup for the source of a serializer field, and the model field it ends at."""
+    if not field.source_attrs:
+        raise UncompilableSerializerError(f"{field.field_name} uses the whole object, so cannot be compiled.")
+
+    model_field = _get_model_field(model, field.source_attrs[0], field)
+    for attr in field.source_attrs[1:]:
+        if not (model_field.many_to_one or model_field.one_to_one):
+            raise UncompilableSerializerError(f"{field.field_name} follows a relation to many objects.")
+        model_field = _get_model_field(model_field.related_model, attr, field)  # type: ignore[arg-type]
+    return "__".join(field.source_attrs), model_field
+
+
+def _get_value(column: str, to_representation: Callable[[Any], Any]) -> Getter:
+    def get_value(row: Row) -> Any:
+        value = row[column]
+        return None if value is None else to_representation(value)
+
+    return get_value
+
+
+def _pk_to_representation(field: relations.PrimaryKeyRelatedField) -> Callable[[Any], Any]:
+    def to_representation(pk: Any) -> Any:
+        return field.to_representation(relations.PKOnlyObject(pk))
+
+    return to_representation
+
+
+def _get_nested(pk_column: str, build: Getter) -> Getter:
+    def get_nested(row: Row) -> Any:
+        return None if row[pk_column] is None else build(row)
+
+    return get_nested
+
+
+def _compile(
+    serializer: serializers.Serializer, model: type[models.Model], *, prefix: str
+) -> tuple[list[str], Callable[[Row], dict[str, Any]]]:
+    serializer_class = type(serializer)
+    if not isinstance(serializer, serializers.ModelSerializer):
+        raise UncompilableSerializerError(f"{serializer_class.__name__} is not a model serializer.")
+    if serializer_class.to_representation is not serializers.Serializer.to_representation:
+        raise UncompilableSerializerError(f"{serializer_class.__name__} has its own to_representation.")
+
+    columns: list[str] = []
+    getters: list[tuple[str, Getter]] = []
+    for field in serializer._readable_fields:
+        if isinstance(field, serializers.ListSerializer | relations.ManyRelatedField):
+            raise UncompilableSerializerError(f"{field.field_name} is a relation to many objects.")
+
+        assert field.field_name is not None
+        lookup, model_field = _resolve_source(field, model)
+        getter: Getter
+        if isinstance(field, serializers.Serializer):
+            if not (model_field.many_to_one or model_field.one_to_one):
+                raise UncompilableSerializerError(f"{field.field_name} is not a relation to a single object.")
+            related_model: type[models.Model] = model_field.related_model  # type: ignore[assignment]
+            pk_column = f"{prefix}{lookup}__{related_model._meta.pk.name}"
+            nested_columns, build_nested = _compile(field, related_model, prefix=f"{prefix}{lookup}__")
+            columns += [pk_column, *nested_columns]
+            getter = _get_nested(pk_column, build_nested)
+        elif isinstance(field, relations.PrimaryKeyRelatedField):
+            columns.append(f"{prefix}{lookup}")
+            getter = _get_value(columns[-1], _pk_to_representation(field))
+        elif isinstance(field, serializers.SerializerMethodField | relations.RelatedField) or model_field.is_relation:
+            raise UncompilableSerializerError(f"{field.field_name} is not read from a column.")
+        else:
+            columns.append(f"{prefix}{lookup}")
+            getter = _get_value(columns[-1], field.to_representation)
+        getters.append((field.field_name, getter))
+
+    def build(row: Row) -> dict[str, Any]:
+        return {name: get(row) for name, get in getters}
+
+    return list(dict.fromkeys(columns)), build
+
+
+@lru_cache
+def compile_serializer(
+    serializer_class: type[serializers.ModelSerializer], field_selection: FieldSelection | None = None
+) -> CompiledSerializer:
+    return CompiledSerializer(serializer_class, field_selection)
+
+
+class CompiledListModelMixin(generics.GenericAPIView):
+    """List objects with the compiled form of the viewset's serializer, rather than model instances."""
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        field_selection = self.get_serializer_context().get("field_selection")
+        compiled = compile_serializer(self.get_serializer_class(), field_selection)  # type: ignore[arg-type]
+        rows = compiled.get_rows(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(compiled.build_many(page))
+        return Response(compiled.build_many(rows))
@@ -0,0 +1,109 @@
+"""
+Sparse fieldsets and expansion for API responses.
+
+Clients can ask for only some fields with ``?fields=id,discord_id``, and can ask for only some
+related objects to be nested with ``?expand=ratification``. Related objects that are not
+expanded are replaced with their primary key. Without either parameter, responses are unchanged.
+
+Views use the selection to skip the annotations and joins that only the left out fields need.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any, NamedTuple
+
+from django.http import QueryDict
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import generics, permissions, serializers
+
+FIELDS_PARAM = "fields"
+EXPAND_PARAM = "expand"
+
+FIELD_SELECTION_PARAMETERS = [
+    OpenApiParameter(
+        FIELDS_PARAM,
+        str,
+        description="A comma separated list of the fields to return. All fields are returned if not given.",
+    ),
+    OpenApiParameter(
+        EXPAND_PARAM,
+        str,
+        description=(
+            "A comma separated list of the related objects to nest. Related objects that are not listed are "
+            "returned as their ID. All related objects are nested if not given."
+        ),
+    ),
+]
+
+
+def _parse_names(values: Iterable[str]) -> frozenset[str]:
+    return frozenset(name.strip() for value in values for name in value.split(",") if name.strip())
+
+
+class FieldSelection(NamedTuple):
+    # None means that every field is included, or every related object is expanded.
+    fields: frozenset[str] | None = None
+    expand: frozenset[str] | None = None
+
+    @classmethod
+    def from_query_params(cls, query_params: QueryDict) -> FieldSelection:
+        return cls(
+            fields=_parse_names(query_params.getlist(FIELDS_PARAM)) if FIELDS_PARAM in query_params else None,
+            expand=_parse_names(query_params.getlist(EXPAND_PARAM)) if EXPAND_PARAM in query_params else None,
+        )
+
+    def includes(self, *names: str) -> bool:
+        """Whether any of the named fields is included."""
+        return self.fields is None or not self.fields.isdisjoint(names)
+
+    def expands(self, name: str) -> bool:
+        return self.expand is None or name in self.expand
+
+
+class SparseFieldsetSerializerMixin(serializers.ModelSerializer):
+    """
+    Leave out the fields that the ``field_selection`` in the context does not include.
+
+    Nested serializers listed in ``Meta.expandable_fields`` are replaced with the primary key
+    of the related object unless the selection expands them.
+    """
+
+    def get_field_selection(self) -> FieldSelection | None:
+        # Only the top level serializer is trimmed, rather than any nested in it.
+        if self.parent is None or (isinstance(self.parent, serializers.ListSerializer) and self.parent.parent is None):
+            return self.context.get("field_selection")
+        return None
+
+    def get_fields(self) -> dict[str, serializers.Field]:
+        fields = super().get_fields()
+        if (selection := self.get_field_selection()) is None:
+            return fields
+
+        if selection.fields is not None:
+            fields = {name: field for name, field in fields.items() if name in selection.fields}
+
+        for name in getattr(self.Meta, "expandable_fields", ()):
+            if name in fields and not selection.expands(name):
+                fields[name] = serializers.PrimaryKeyRelatedField(read_only=True, source=fields[name].source)
+        return fields
+
+
+class SparseFieldsetMixin(generics.GenericAPIView):
+    """Pass the fields and expansions that the client asked for to the serializer when reading."""
+
+    # Actions that read, but are sent as a POST.
+    read_actions: tuple[str, ...] = ("lookup",)
+
+    def get_field_selection(self) -> FieldSelection | None:
+        if self.request is None:
+            return None
+        if (
+            self.request.method not in permissions.SAFE_METHODS
+            and getattr(self, "action", None) not in self.read_actions
+        ):
+            return None
+        return FieldSelection.from_query_params(self.request.query_params)
+
+    def get_serializer_context(self) -> dict[str, Any]:
+        return {**super().get_serializer_context(), "field_selection": self.get_field_selection()}
@@ -0,0 +1,50 @@
+"""
+Looking up many objects at once.
+
+Lookup endpoints take a list of keys, such as IDs or Discord IDs, find every object in one
+query and return a map from each key to the object, or to null if there is no such object.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable, Iterable
+from typing import Any
+
+from rest_framework import serializers
+
+MAX_LOOKUP_KEYS = 500
+
+
+def lookup_keys_field(child: serializers.Field) -> serializers.ListField:
+    return serializers.ListField(child=child, required=False, allow_empty=False, max_length=MAX_LOOKUP_KEYS)
+
+
+def lookup_response_schema(component_name: str) -> dict[str, Any]:
+    """The schema of a lookup response, which maps each key to a component or null."""
+    return {
+        "type": "object",
+        "additionalProperties": {"allOf": [{"$ref": f"#/components/schemas/{component_name}"}], "nullable": True},
+    }
+
+
+class LookupSerializer(serializers.Serializer):
+    """A lookup request, which gives exactly one of its lists of keys."""
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        if len(attrs) != 1:
+            raise serializers.ValidationError(f"Give exactly one of: {', '.join(self.fields)}.")
+        return attrs
+
+    @property
+    def lookup(self) -> tuple[str, list[Any]]:
+        """The name of the keys that were given, and the keys without duplicates."""
+        ((name, keys),) = self.validated_data.items()
+        return name, list(dict.fromkeys(keys))
+
+
+def get_lookup_results(
+    keys: Iterable[Hashable], found: dict[Any, Any], serialize: Callable[[list[Any]], list[Any]]
+) -> dict[str, Any]:
+    """Map each key to what was found for it, serializing everything that was found at once."""
+    data = dict(zip(found, serialize(list(found.values())), strict=True))
+    return {str(key): data.get(key) for key in keys}
@@ -0,0 +1,137 @@
+"""
+Pagination that can skip counting the whole list.
+
+Counting runs the list's query again over every matching row, which costs more than fetching
+the page for large or annotated lists. The ``count`` parameter, or ``pagination_count_mode``
+on the view, chooses how the total is found:
+
+- ``exact`` counts every row, as DRF's pagination does.
+- ``none`` doesn't count. It fetches one extra row to find out whether there is another page,
+  and returns that as ``has_more``.
+- ``estimated`` uses the estimate from the Postgres planner, as well as ``has_more``. Small
+  lists, and databases other than Postgres, are counted exactly.
+"""
+
+from __future__ import annotations
+
+import enum
+import json
+from collections.abc import Sequence
+from typing import Any
+
+from django.db import connections
+from django.db.models import QuerySet
+from rest_framework import pagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class CountMode(enum.StrEnum):
+    EXACT = "exact"
+    NONE = "none"
+    ESTIMATED = "estimated"
+
+
+def estimate_count(queryset: QuerySet[Any, Any]) -> int | None:
+    """Estimate the number of rows in a queryset from the planner, or None if the database can't."""
+    if connections[queryset.db].vendor != "postgresql":
+        return None
+    plan = json.loads(queryset.order_by().explain(format="json"))
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class OptionalCountPagination(pagination.LimitOffsetPagination):
+    count_query_param = "count"
+    count_query_description = (
+        "How to count the results: `exact`, `estimated` from database statistics, or `none`. "
+        "Without an exact count, `has_more` says whether there is another page."
+    )
+    # Lists estimated to be smaller than this are counted exactly, as that is cheap and small estimates are poor.
+    exact_count_threshold = 1000
+
+    count_mode = CountMode.EXACT
+    count_is_estimated = False
+    has_more = False
+
+    def get_count_mode(self, request: Request, view: Any = None) -> CountMode:
+        try:
+            return CountMode(request.query_params[self.count_query_param])
+        except (KeyError, ValueError):
+            return getattr(view, "pagination_count_mode", CountMode.EXACT)
+
+    def get_estimated_count(self, queryset: QuerySet[Any, Any] | Sequence[Any]) -> int:
+        estimate = estimate_count(queryset) if isinstance(queryset, QuerySet) else None
+        if estimate is not None and estimate >= self.exact_count_threshold:
+            self.count_is_estimated = True
+            return estimate
+
+        self.count_is_estimated = False
+        return self.get_count(queryset)
+
+    def paginate_queryset(
+        self, queryset: QuerySet[Any, Any] | Sequence[Any], request: Request, view: Any = None
+    ) -> list[Any] | None:
+        self.count_mode = self.get_count_mode(request, view)
+        if self.count_mode == CountMode.EXACT:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.offset = self.get_offset(request)
+        if self.count_mode == CountMode.ESTIMATED:
+            self.count = self.get_estimated_count(queryset)
+
+        results = list(queryset[self.offset : self.offset + self.limit + 1])
+        self.has_more = len(results) > self.limit
+        return results[: self.limit]
+
+    def get_next_link(self) -> str | None:
+        if self.count_mode == CountMode.EXACT:
+            return super().get_next_link()
+        if not self.has_more:
+            return None
+
+        assert self.request is not None and self.limit is not None and self.offset is not None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(url, self.offset_query_param, self.offset + self.limit)
+
+    def get_paginated_response(self, data: Sequence[Any]) -> Response:
+        if self.count_mode == CountMode.EXACT:
+            return super().get_paginated_response(data)
+
+        response: dict[str, Any] = {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "has_more": self.has_more,
+            "results": data,
+        }
+        if self.count_mode == CountMode.ESTIMATED:
+            response = {"count": self.count, "count_is_estimated": self.count_is_estimated, **response}
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema: dict[str, Any]) -> dict[str, Any]:
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["required"] = ["results"]
+        response_schema["properties"] = {
+            **response_schema["properties"],
+            "count_is_estimated": {"type": "boolean", "description": "Whether `count` is an estimate."},
+            "has_more": {"type": "boolean", "description": "Whether there is another page, if not counted exactly."},
+        }
+        return response_schema
+
+    def get_schema_operation_parameters(self, view: Any) -> list[dict[str, Any]]:
+        return [
+            *super().get_schema_operation_parameters(view),
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": self.count_query_description,
+                "schema": {"type": "string", "enum": [mode.value for mode in CountMode]},
+            },
+        ]
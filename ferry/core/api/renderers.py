@@ -0,0 +1,60 @@
+"""
+Renderers for API responses.
+
+``FastJSONRenderer`` produces the same JSON as DRF's ``JSONRenderer``, but encodes with orjson,
+which writes bytes directly and encodes UUIDs itself. Anything orjson does not know how to
+encode, such as decimals and lazy strings, is converted by DRF's encoder as before.
+
+``MessagePackRenderer`` is a compact binary alternative for clients that ask for it with
+``Accept: application/msgpack``, such as the bot's sync calls.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+import msgpack
+import orjson
+from rest_framework import renderers
+from rest_framework.utils.encoders import JSONEncoder
+
+# The UTF-8 encodings of the line and paragraph separators, and the escapes DRF replaces them with.
+JS_LINE_TERMINATORS = [(b"\xe2\x80\xa8", b"\\u2028"), (b"\xe2\x80\xa9", b"\\u2029")]
+
+# Converts the types that neither orjson nor msgpack encode, in the same way as DRF's JSONRenderer.
+encode_default = JSONEncoder().default
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    def render(
+        self, data: Any, accepted_media_type: str | None = None, renderer_context: Mapping[str, Any] | None = None
+    ) -> bytes:
+        # Pretty printing is for people, so leave it to DRF.
+        indent = self.get_indent(accepted_media_type or "", renderer_context or {})
+        if data is None or indent is not None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        content = orjson.dumps(
+            data,
+            default=encode_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME,
+        )
+        for terminator, escaped in JS_LINE_TERMINATORS:
+            if terminator in content:
+                content = content.replace(terminator, escaped)
+        return content
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(
+        self, data: Any, accepted_media_type: str | None = None, renderer_context: Mapping[str, Any] | None = None
+    ) -> bytes:
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=encode_default)
@@ -1,15 +1,25 @@
+from django.urls import path
 from rest_framework import routers
 
 from ferry.accounts.api.views import PersonViewset, UserViewset
+from ferry.activity.api.views import ChangeViewset, WebhookSubscriptionViewset, stream_activity
+from ferry.core.api.batch import batch
 from ferry.court.api.views import AccusationViewset, ConsequenceViewset
-from ferry.pub.api.views import PubEventViewset, PubViewset
+from ferry.pub.api.views import PubEventViewset, PubStatsViewset, PubViewset
 
 router = routers.SimpleRouter()
+router.register("changes", ChangeViewset, basename="changes")
 router.register("court/accusations", AccusationViewset, basename="accusations")
 router.register("court/consequences", ConsequenceViewset, basename="consequences")
 router.register("pub/events", PubEventViewset, basename="events")
 router.register("pub/pubs", PubViewset, basename="pubs")
+router.register("pub/stats", PubStatsViewset, basename="pub-stats")
 router.register("people", PersonViewset, basename="people")
 router.register("users", UserViewset, basename="users")
+router.register("webhooks", WebhookSubscriptionViewset, basename="webhooks")
 
-urls = router.urls
+urls = [
+    path("batch/", batch, name="batch"),
+    path("stream/", stream_activity, name="stream"),
+    *router.urls,
+]
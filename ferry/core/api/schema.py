@@ -0,0 +1,94 @@
+"""
+The OpenAPI schema, generated once for each version of the code rather than on every request.
+
+The schema is rendered as YAML and JSON and kept in the shared cache under the code version,
+so it is only generated again after the code changes. ``manage.py build_api_schema`` builds it
+ahead of time, and otherwise the first worker to need it does.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import drf_spectacular
+import rest_framework
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.views import SpectacularAPIView
+from rest_framework.request import Request
+
+from ferry.core.invalidation import SHARED_CACHE_ALIAS
+
+SCHEMA_RENDERERS = {"yaml": OpenApiYamlRenderer, "json": OpenApiJsonRenderer}
+
+
+class RenderedSchema(NamedTuple):
+    content: bytes
+    etag: str
+
+
+@lru_cache
+def get_code_version() -> str:
+    """A hash of ferry's code and the versions of the libraries that generate the schema."""
+    digest = hashlib.sha256(f"{drf_spectacular.__version__}:{rest_framework.VERSION}".encode())
+    base_dir = Path(settings.BASE_DIR)
+    for path in sorted(base_dir.rglob("*.py")):
+        digest.update(str(path.relative_to(base_dir)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _get_schema_cache_key() -> str:
+    return f"ferry:api-schema:{get_code_version()}"
+
+
+def build_api_schema() -> dict[str, RenderedSchema]:
+    """Generate the schema and store it in the shared cache."""
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    schema = generator.get_schema(request=None, public=True)
+
+    rendered = {}
+    for schema_format, renderer_class in SCHEMA_RENDERERS.items():
+        content = renderer_class().render(schema, renderer_context={})
+        assert isinstance(content, bytes)
+        rendered[schema_format] = RenderedSchema(content, quote_etag(hashlib.sha256(content).hexdigest()[:32]))
+
+    caches[SHARED_CACHE_ALIAS].set(_get_schema_cache_key(), rendered, timeout=None)
+    return rendered
+
+
+@lru_cache
+def get_api_schema() -> dict[str, RenderedSchema]:
+    """Get the schema rendered in each format, building it if this version of the code has not yet."""
+    return caches[SHARED_CACHE_ALIAS].get(_get_schema_cache_key()) or build_api_schema()
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """Serves the prebuilt schema, with an ETag so that clients only download it again after it changes."""
+
+    def _get_schema_response(self, request: Request) -> Any:
+        # Other languages and versions of the schema are rarely asked for, so are still generated on demand.
+        if request.GET.get("lang") or self._get_version_parameter(request):
+            return super()._get_schema_response(request)
+
+        renderer = request.accepted_renderer
+        schema = get_api_schema()["json" if renderer.format == "json" else "yaml"]
+        if not_modified := get_conditional_response(request, etag=schema.etag):
+            return not_modified
+
+        content_type = request.accepted_media_type
+        if renderer.charset:
+            content_type += f"; charset={renderer.charset}"
+        response = HttpResponse(schema.content, content_type=content_type)
+        response["ETag"] = schema.etag
+        response["Content-Disposition"] = f'inline; filename="{self._get_filename(request, None)}"'
+        patch_cache_control(response, no_cache=True)
+        return response
@@ -0,0 +1,243 @@
+"""
+A two-tier cache for data that is read far more often than it changes.
+
+Values are kept in a small LRU cache in each process, in front of the shared Django cache, so
+that a value computed by one worker can be reused by the others. Every value belongs to one or
+more namespaces of data, such as ``"pub"``, and is dropped from both tiers once any of them has
+changed: the in-process tier follows the generations of the invalidation bus, and the shared
+tier stores the versions of the namespaces alongside the value.
+
+Repository functions are cached with the ``@memoize`` decorator. Cached values are shared
+between callers, so they must not be modified.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import uuid
+from collections import Counter, OrderedDict
+from collections.abc import Callable, Iterable
+from functools import lru_cache
+from time import monotonic
+from typing import Any, Generic, NamedTuple, ParamSpec, TypeVar
+
+from django.core.cache import BaseCache, caches
+from django.db import models
+
+from ferry.core.invalidation import (
+    SHARED_CACHE_ALIAS,
+    bump_cache_versions,
+    get_invalidation_bus,
+    get_shared_version_key,
+)
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+DEFAULT_TTL = 300
+LOCAL_TTL = 60
+LOCAL_MAX_ENTRIES = 1024
+
+
+class CacheStats(NamedTuple):
+    local_hits: int
+    shared_hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+
+    @property
+    def hit_rate(self) -> float:
+        hits = self.local_hits + self.shared_hits
+        return hits / (hits + self.misses) if hits + self.misses else 0.0
+
+
+class _LocalEntry(NamedTuple):
+    generations: tuple[int, ...]
+    expires_at: float
+    value: Any
+
+
+_MISSING = object()
+
+
+class TwoTierCache:
+    def __init__(
+        self,
+        *,
+        alias: str = SHARED_CACHE_ALIAS,
+        max_entries: int = LOCAL_MAX_ENTRIES,
+        local_ttl: float = LOCAL_TTL,
+    ) -> None:
+        self._alias = alias
+        self._max_entries = max_entries
+        self._local_ttl = local_ttl
+        self._lock = threading.Lock()
+        self._local: OrderedDict[str, _LocalEntry] = OrderedDict()
+        self._stats: Counter[str] = Counter()
+
+    @property
+    def shared(self) -> BaseCache:
+        return caches[self._alias]
+
+    def get_stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(**{field: self._stats[field] for field in CacheStats._fields})
+
+    def get_or_set(self, key: str, func: Callable[[], R], *, namespaces: Iterable[str], ttl: float = DEFAULT_TTL) -> R:
+        """
+        Get a value from the cache, or compute and store it.
+
+        :param namespaces: the namespaces of the data the value is computed from.
+        :param ttl: how long to keep the value for, in seconds. It is kept in the in-process
+            tier for at most ``LOCAL_TTL`` seconds.
+        """
+        namespaces = tuple(namespaces)
+        # Versions are read before computing, so that a change made whilst computing discards the value.
+        bus = get_invalidation_bus()
+        generations = tuple(bus.get_generation(namespace) for namespace in namespaces)
+        value = self._get_local(key, generations)
+        if value is not _MISSING:
+            return value
+
+        shared_key = f"ferry:{key}"
+        version_keys = [get_shared_version_key(namespace) for namespace in namespaces]
+        found = self.shared.get_many([shared_key, *version_keys])
+        versions = self._get_shared_versions(version_keys, found)
+
+        if shared_key in found:
+            entry_versions, value = found[shared_key]
+            if entry_versions == versions:
+                self._count("shared_hits")
+                self._set_local(key, generations, value, ttl)
+                return value
+            self._count("invalidations")
+
+        self._count("misses")
+        value = func()
+        self.shared.set(shared_key, (versions, value), ttl)
+        self._set_local(key, generations, value, ttl)
+        return value
+
+    def delete(self, key: str) -> None:
+        """Drop a value from this process and the shared cache."""
+        with self._lock:
+            self._local.pop(key, None)
+        self.shared.delete(f"ferry:{key}")
+
+    def clear(self) -> None:
+        """Empty the in-process tier and reset the statistics."""
+        with self._lock:
+            self._local.clear()
+            self._stats.clear()
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self._stats[stat] += 1
+
+    def _get_local(self, key: str, generations: tuple[int, ...]) -> Any:
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return _MISSING
+
+            if entry.generations != generations:
+                del self._local[key]
+                self._stats["invalidations"] += 1
+                return _MISSING
+            if entry.expires_at <= monotonic():
+                del self._local[key]
+                self._stats["expirations"] += 1
+                return _MISSING
+
+            self._local.move_to_end(key)
+            self._stats["local_hits"] += 1
+            return entry.value
+
+    def _set_local(self, key: str, generations: tuple[int, ...], value: Any, ttl: float) -> None:
+        expires_at = monotonic() + min(ttl, self._local_ttl)
+        with self._lock:
+            self._local[key] = _LocalEntry(generations, expires_at, value)
+            self._local.move_to_end(key)
+            while len(self._local) > self._max_entries:
+                self._local.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def _get_shared_versions(self, version_keys: list[str], found: dict[str, Any]) -> tuple[str, ...]:
+        versions = []
+        for version_key in version_keys:
+            version = found.get(version_key)
+            if version is None:
+                # A missing version, such as one that has been evicted, must not match anything stored before.
+                version = uuid.uuid4().hex
+                if not self.shared.add(version_key, version, timeout=None):
+                    version = self.shared.get(version_key, version)
+            versions.append(version)
+        return tuple(versions)
+
+
+@lru_cache
+def get_cache() -> TwoTierCache:
+    return TwoTierCache()
+
+
+def _get_key_part(value: Any) -> str:
+    if isinstance(value, models.Model):
+        return f"{value._meta.label}:{value.pk}"
+    return repr(value)
+
+
+class MemoizedFunction(Generic[P, R]):  # noqa: UP046
+    def __init__(self, func: Callable[P, R], *, namespaces: Iterable[str], ttl: float) -> None:
+        self.func = func
+        self.name = f"{func.__module__}.{func.__qualname__}"
+        self.namespaces = tuple(namespaces)
+        self.ttl = ttl
+        self.__doc__ = func.__doc__
+
+    def __call__(self, *args: P.args, **kwargs: P.kwargs) -> R:
+        return get_cache().get_or_set(
+            self.get_key(*args, **kwargs),
+            lambda: self.func(*args, **kwargs),
+            namespaces=self.namespaces,
+            ttl=self.ttl,
+        )
+
+    def __repr__(self) -> str:
+        return f"<MemoizedFunction {self.name}>"
+
+    def get_key(self, *args: P.args, **kwargs: P.kwargs) -> str:
+        parts = [_get_key_part(arg) for arg in args]
+        parts += [f"{name}={_get_key_part(value)}" for name, value in sorted(kwargs.items())]
+        return f"{self.name}:{hashlib.sha256(chr(0).join(parts).encode()).hexdigest()}"
+
+    def invalidate(self, *args: P.args, **kwargs: P.kwargs) -> None:
+        """
+        Drop the cached value for the given arguments from this process and the shared cache.
+
+        Other processes keep their copy until it expires from their in-process tier, so use
+        ``invalidate_all`` if they must not see the old value.
+        """
+        get_cache().delete(self.get_key(*args, **kwargs))
+
+    def invalidate_all(self) -> None:
+        """Drop every value cached in the function's namespaces, in every process."""
+        bump_cache_versions(*self.namespaces)
+
+
+def memoize(
+    *, namespaces: Iterable[str], ttl: float = DEFAULT_TTL
+) -> Callable[[Callable[P, R]], MemoizedFunction[P, R]]:
+    """
+    Cache the results of a function until the data in any of its namespaces changes.
+
+    Arguments are part of the key, with model instances identified by their primary key, so
+    the function must only depend on those and the data in its namespaces.
+    """
+
+    def decorator(func: Callable[P, R]) -> MemoizedFunction[P, R]:
+        return MemoizedFunction(func, namespaces=namespaces, ttl=ttl)
+
+    return decorator
@@ -1,36 +1,372 @@
-from typing import Any
+from __future__ import annotations
+
+import asyncio
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
 
-import requests
 from django.conf import settings
 
+if TYPE_CHECKING:
+    import httpx
+    import requests
+
+DISCORD_API_URL = "https://discord.com/api/v10"
+
+# IDs that follow these path segments are "major parameters", which Discord uses to separate rate limit buckets.
+MAJOR_PARAMETER_RE = re.compile(r"(?<!guilds/)(?<!channels/)(?<!webhooks/)\b\d+\b")
+
 
 class NoSuchGuildMemberError(Exception):
     pass
 
 
-class DiscordClient:
-    def __init__(self, bot_token: str) -> None:
-        self._bot_token = bot_token
+class DiscordRateLimitedError(Exception):
+    """Discord is still rate limiting us after retrying."""
+
+    def __init__(self, retry_after: float) -> None:
+        self.retry_after = retry_after
+
+
+class _RateLimitBucket:
+    def __init__(self) -> None:
+        self.limit: int | None = None
+        # What Discord last said was remaining, less the requests reserved since. It is negative whilst
+        # requests are waiting for later windows.
+        self.remaining: int | None = None
+        self.reset_at = 0.0
+        # The longest time Discord has said the bucket takes to reset, as the closest we get to its window.
+        self.window: float | None = None
+
 
-    def _request(self, method: str, endpoint: str) -> Any:
-        headers = {
+class _ClientState:
+    """The cached members and rate limits of a bot, which can be shared by several clients."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.member_cache: OrderedDict[tuple[int, int], tuple[float, dict[str, Any] | None]] = OrderedDict()
+        self.route_buckets: dict[str, str] = {}
+        self.buckets: dict[str, _RateLimitBucket] = {}
+        self.global_reset_at = 0.0
+
+
+class _BaseDiscordClient:
+    """
+    The state shared by the sync and async Discord clients.
+
+    Clients are intended to be long-lived: they cache guild members, including unknown
+    members, and wait for Discord's rate limit buckets to reset. A client can be made
+    ``shared_with`` another for the same bot, so that they share the cache and the buckets.
+    """
+
+    def __init__(
+        self,
+        bot_token: str,
+        *,
+        base_url: str = DISCORD_API_URL,
+        timeout: float = 2,
+        member_cache_ttl: float = 300,
+        missing_member_cache_ttl: float = 60,
+        member_cache_size: int = 1024,
+        max_retries: int = 3,
+        max_rate_limit_wait: float = 5,
+        shared_with: _BaseDiscordClient | None = None,
+    ) -> None:
+        self._bot_token: str = bot_token
+        self._base_url = base_url.rstrip("/")
+        self._timeout = timeout
+        self._member_cache_ttl = member_cache_ttl
+        self._missing_member_cache_ttl = missing_member_cache_ttl
+        self._member_cache_size = member_cache_size
+        self._max_retries = max_retries
+        self._max_rate_limit_wait = max_rate_limit_wait
+        self._headers = {
             "Accept": "application/json",
             "Content-Type": "application/json",
             "Authorization": f"Bot {self._bot_token}",
         }
-        resp = requests.request(method, f"https://discord.com/api/v10/{endpoint}", headers=headers, timeout=2)
-        resp.raise_for_status()
-        return resp.json()
+
+        if shared_with is None:
+            self._state = _ClientState()
+        elif shared_with._bot_token == bot_token:
+            self._state = shared_with._state
+        else:
+            raise ValueError("Only clients for the same bot can share their state.")
+
+    def _get_route(self, method: str, endpoint: str) -> str:
+        return f"{method} {MAJOR_PARAMETER_RE.sub('{id}', endpoint)}"
+
+    def _get_bucket(self, route: str) -> _RateLimitBucket:
+        bucket_id = self._state.route_buckets.get(route, route)
+        return self._state.buckets.setdefault(bucket_id, _RateLimitBucket())
+
+    def _reserve_request(self, route: str) -> float:
+        """
+        Reserve a request from the route's rate limit bucket, returning how long to wait before sending it.
+
+        Requests are counted as they are reserved, so that concurrent requests do not all see the
+        same requests remaining. Once the bucket runs out, requests are reserved from the windows after
+        the next reset, ``limit`` requests to each.
+        """
+        now = time.monotonic()
+        with self._state.lock:
+            bucket = self._get_bucket(route)
+            if bucket.remaining is not None and bucket.reset_at <= now:
+                if bucket.limit is None:
+                    bucket.remaining = None
+                else:
+                    # Move on to the current window, keeping the requests reserved from it.
+                    windows = 1 if not bucket.window else 1 + int((now - bucket.reset_at) // bucket.window)
+                    bucket.remaining = min(bucket.remaining + bucket.limit * windows, bucket.limit)
+                    bucket.reset_at += (bucket.window or 0) * windows
+
+            reset_at = self._state.global_reset_at
+            if bucket.remaining is not None and bucket.remaining <= 0:
+                # Spread the waiting requests over the windows they fit in, rather than all sending at the reset.
+                later_windows = -bucket.remaining // bucket.limit if bucket.limit and bucket.window else 0
+                reset_at = max(reset_at, bucket.reset_at + (bucket.window or 0) * later_windows)
+
+            delay = reset_at - now
+            if delay > self._max_rate_limit_wait:
+                raise DiscordRateLimitedError(delay)
+            if bucket.remaining is not None:
+                bucket.remaining -= 1
+        return delay
+
+    def _update_rate_limit(self, route: str, resp: requests.Response | httpx.Response) -> None:
+        headers = resp.headers
+        now = time.monotonic()
+        with self._state.lock:
+            if bucket_id := headers.get("X-RateLimit-Bucket"):
+                self._state.route_buckets[route] = bucket_id
+            bucket = self._get_bucket(route)
+
+            if "X-RateLimit-Limit" in headers:
+                bucket.limit = int(headers["X-RateLimit-Limit"])
+            if "X-RateLimit-Remaining" in headers:
+                remaining = int(headers["X-RateLimit-Remaining"])
+                # Discord has not yet counted the requests reserved since this one was sent.
+                if bucket.remaining is not None and bucket.reset_at > now:
+                    remaining = min(remaining, bucket.remaining)
+                bucket.remaining = remaining
+            if "X-RateLimit-Reset-After" in headers:
+                reset_after = float(headers["X-RateLimit-Reset-After"])
+                bucket.reset_at = now + reset_after
+                bucket.window = max(bucket.window or 0, reset_after)
+
+            if resp.status_code == 429:
+                retry_after = float(headers.get("Retry-After", 0) or 0)
+                try:
+                    retry_after = float(resp.json().get("retry_after", retry_after))
+                except ValueError:
+                    pass
+
+                if headers.get("X-RateLimit-Global") == "true" or headers.get("X-RateLimit-Scope") == "global":
+                    self._state.global_reset_at = now + retry_after
+                else:
+                    bucket.remaining = 0
+                    bucket.reset_at = now + retry_after
+
+    def _get_cached_member(self, key: tuple[int, int]) -> tuple[bool, dict[str, Any] | None]:
+        with self._state.lock:
+            try:
+                expires_at, member = self._state.member_cache[key]
+            except KeyError:
+                return False, None
+            if expires_at < time.monotonic():
+                del self._state.member_cache[key]
+                return False, None
+            self._state.member_cache.move_to_end(key)
+            return True, member
+
+    def _cache_member(self, key: tuple[int, int], member: dict[str, Any] | None) -> None:
+        ttl = self._member_cache_ttl if member is not None else self._missing_member_cache_ttl
+        with self._state.lock:
+            self._state.member_cache[key] = (time.monotonic() + ttl, member)
+            self._state.member_cache.move_to_end(key)
+            while len(self._state.member_cache) > self._member_cache_size:
+                self._state.member_cache.popitem(last=False)
+
+    def get_cached_guild_member_by_id(self, guild_id: int, user_id: int) -> dict[str, Any] | None:
+        """Get a guild member only if it has been cached recently, returning None otherwise."""
+        is_cached, member = self._get_cached_member((int(guild_id), int(user_id)))
+        if is_cached and member is None:
+            raise NoSuchGuildMemberError()
+        return member
+
+
+class DiscordClient(_BaseDiscordClient):
+    """A client for the Discord REST API, which keeps a pool of connections."""
+
+    def __init__(
+        self,
+        bot_token: str,
+        *,
+        sleep: Callable[[float], None] = time.sleep,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(bot_token, **kwargs)
+        self._sleep = sleep
+
+        # The HTTP libraries are slow to import, so are only loaded once a client is needed.
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self._session = requests.Session()
+        self._session.headers.update(self._headers)
+        self._session.mount("https://", HTTPAdapter(pool_maxsize=10))
+        self._session.mount("http://", HTTPAdapter(pool_maxsize=10))
+
+    def _request(self, method: str, endpoint: str, *, params: dict[str, Any] | None = None) -> Any:
+        route = self._get_route(method, endpoint)
+
+        for _ in range(self._max_retries + 1):
+            if (delay := self._reserve_request(route)) > 0:
+                self._sleep(delay)
+            resp = self._session.request(method, f"{self._base_url}/{endpoint}", params=params, timeout=self._timeout)
+            self._update_rate_limit(route, resp)
+            if resp.status_code != 429:
+                resp.raise_for_status()
+                return resp.json()
+
+        raise DiscordRateLimitedError(float(resp.headers.get("Retry-After", 0) or 0))
 
     def get_guild_member_by_id(self, guild_id: int, user_id: int) -> dict[str, Any]:
-        try:
-            return self._request("GET", f"guilds/{guild_id}/members/{user_id}")
-        except requests.HTTPError as e:
-            if e.response.status_code == 404:
-                raise NoSuchGuildMemberError() from None
-            else:
-                raise
+        import requests
+
+        key = (int(guild_id), int(user_id))
+        is_cached, member = self._get_cached_member(key)
+        if not is_cached:
+            try:
+                member = self._request("GET", f"guilds/{guild_id}/members/{user_id}")
+            except requests.HTTPError as e:
+                if e.response.status_code != 404:
+                    raise
+                member = None
+            self._cache_member(key, member)
+
+        if member is None:
+            raise NoSuchGuildMemberError()
+        return member
+
+    def iter_guild_members(self, guild_id: int, *, page_size: int = 1000) -> Iterator[dict[str, Any]]:
+        """
+        Iterate over every member of a guild, a page at a time.
+
+        The members are not cached, as a whole guild would push out the members looked up recently.
+        """
+        after = 0
+        while True:
+            members = self._request("GET", f"guilds/{guild_id}/members", params={"limit": page_size, "after": after})
+            yield from members
+
+            if len(members) < page_size:
+                return
+            after = max(int(member["user"]["id"]) for member in members)
+
+
+class AsyncDiscordClient(_BaseDiscordClient):
+    """
+    An asyncio client for the Discord REST API, for making many requests concurrently.
+
+    The client must only be used from the event loop that created it. At most
+    ``max_concurrency`` requests are made to Discord at once.
+    """
+
+    def __init__(
+        self,
+        bot_token: str,
+        *,
+        max_concurrency: int = 10,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(bot_token, **kwargs)
+        self._sleep = sleep
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        import httpx
+
+        self._client = httpx.AsyncClient(
+            headers=self._headers,
+            timeout=self._timeout,
+            limits=httpx.Limits(max_connections=max_concurrency),
+        )
+
+    async def __aenter__(self) -> AsyncDiscordClient:
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def _request(self, method: str, endpoint: str, *, params: dict[str, Any] | None = None) -> Any:
+        route = self._get_route(method, endpoint)
+
+        for _ in range(self._max_retries + 1):
+            if (delay := self._reserve_request(route)) > 0:
+                await self._sleep(delay)
+            async with self._semaphore:
+                resp = await self._client.request(method, f"{self._base_url}/{endpoint}", params=params)
+            self._update_rate_limit(route, resp)
+            if resp.status_code != 429:
+                resp.raise_for_status()
+                return resp.json()
+
+        raise DiscordRateLimitedError(float(resp.headers.get("Retry-After", 0) or 0))
+
+    async def get_guild_member_by_id(self, guild_id: int, user_id: int) -> dict[str, Any]:
+        import httpx
+
+        key = (int(guild_id), int(user_id))
+        is_cached, member = self._get_cached_member(key)
+        if not is_cached:
+            try:
+                member = await self._request("GET", f"guilds/{guild_id}/members/{user_id}")
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code != 404:
+                    raise
+                member = None
+            self._cache_member(key, member)
+
+        if member is None:
+            raise NoSuchGuildMemberError()
+        return member
+
+    async def get_guild_members_by_ids(
+        self, guild_id: int, user_ids: Iterable[int]
+    ) -> dict[int, dict[str, Any] | None]:
+        """Get many guild members concurrently, with None for users that are not members of the guild."""
+
+        async def get_member(user_id: int) -> tuple[int, dict[str, Any] | None]:
+            try:
+                return user_id, await self.get_guild_member_by_id(guild_id, user_id)
+            except NoSuchGuildMemberError:
+                return user_id, None
+
+        return dict(await asyncio.gather(*(get_member(user_id) for user_id in set(user_ids))))
+
+
+@lru_cache
+def _get_discord_client_for_token(bot_token: str) -> DiscordClient:
+    return DiscordClient(bot_token)
 
 
 def get_discord_client() -> DiscordClient:
-    return DiscordClient(settings.DISCORD_TOKEN)
+    return _get_discord_client_for_token(settings.DISCORD_TOKEN)
+
+
+def get_async_discord_client() -> AsyncDiscordClient:
+    """
+    Get a new async client for the running event loop.
+
+    The client shares its cached members and rate limits with ``get_discord_client()``, so clients
+    made for short-lived event loops still know how long to wait. It must be closed once it is done with.
+    """
+    return AsyncDiscordClient(settings.DISCORD_TOKEN, shared_with=get_discord_client())
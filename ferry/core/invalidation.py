@@ -0,0 +1,201 @@
+"""
+A bus that tells every worker process when cached data has changed.
+
+Each process keeps a generation number for each namespace of cached data, such as ``"pub"``,
+which goes up whenever that data changes in any process. A cache remembers the generation
+that an entry was built at, and drops the entry once the generation has moved on, or it can
+subscribe to be told straight away.
+
+Changes are announced with ``bump_cache_versions``, which models do on save and delete once
+they are registered with ``invalidate_on_change``. On Postgres, the change is sent to every
+process with NOTIFY as the transaction commits, and a thread in each process LISTENs for it.
+Otherwise, the thread polls a table of versions. The version of each namespace is also kept in
+the shared Django cache, so that entries stored there can be checked by any process.
+
+The thread is started by the ASGI and WSGI applications and the job worker. A process without
+it, such as a management command, only sees its own changes.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import uuid
+from collections import defaultdict
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Any
+
+from django.core.cache import caches
+from django.db import DatabaseError, connection, models, transaction
+from django.db.models.signals import post_delete, post_save
+
+from ferry.core.models import CacheVersion
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "ferry_invalidation"
+POLL_INTERVAL = 0.5
+LISTEN_TIMEOUT = 5.0
+SHARED_CACHE_ALIAS = "default"
+
+
+class InvalidationBus:
+    def __init__(self, *, poll_interval: float = POLL_INTERVAL) -> None:
+        self.id = uuid.uuid4().hex
+        self._poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._generations: defaultdict[str, int] = defaultdict(int)
+        self._callbacks: defaultdict[str, list[Callable[[], None]]] = defaultdict(list)
+        self._versions: dict[str, uuid.UUID] | None = None
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def get_generation(self, namespace: str) -> int:
+        return self._generations[namespace]
+
+    def subscribe(self, namespace: str, callback: Callable[[], None]) -> None:
+        """Call a function whenever the data in a namespace changes."""
+        with self._lock:
+            self._callbacks[namespace].append(callback)
+
+    def invalidate(self, *namespaces: str) -> None:
+        """Mark the data in the namespaces as changed in this process."""
+        with self._lock:
+            for namespace in namespaces:
+                self._generations[namespace] += 1
+            callbacks = [callback for namespace in namespaces for callback in self._callbacks[namespace]]
+
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:  # noqa: BLE001
+                logger.exception("Cache invalidation callback failed")
+
+    def invalidate_all(self) -> None:
+        self.invalidate(*{*self._generations, *self._callbacks})
+
+    def start(self) -> None:
+        """Start listening for changes made by other processes."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="ferry-invalidation-bus", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        self._stopped.set()
+        if thread is not None:
+            thread.join()
+
+    def _run(self) -> None:
+        try:
+            if connection.vendor == "postgresql":
+                self._listen()
+            else:
+                while not self._stopped.wait(self._poll_interval):
+                    self.poll()
+        finally:
+            connection.close()
+
+    def _listen(self) -> None:
+        import psycopg
+
+        settings_dict = connection.settings_dict
+        while not self._stopped.is_set():
+            try:
+                with psycopg.connect(
+                    dbname=settings_dict["NAME"],
+                    user=settings_dict["USER"],
+                    password=settings_dict["PASSWORD"],
+                    host=settings_dict["HOST"],
+                    port=settings_dict["PORT"] or None,
+                    autocommit=True,
+                ) as listener:
+                    listener.execute(f"LISTEN {INVALIDATION_CHANNEL}")
+                    # Anything could have changed whilst nothing was listening.
+                    self.invalidate_all()
+                    while not self._stopped.is_set():
+                        for notify in listener.notifies(timeout=LISTEN_TIMEOUT):
+                            sender, _, namespace = notify.payload.partition(":")
+                            # Changes made by this process were applied when they committed.
+                            if sender != self.id:
+                                self.invalidate(namespace)
+            except psycopg.Error:
+                logger.exception("Lost the connection listening for cache invalidations, reconnecting")
+                self._stopped.wait(self._poll_interval)
+
+    def poll(self) -> None:
+        """Check the version table for namespaces that have changed since it was last checked."""
+        try:
+            versions = dict(CacheVersion.objects.values_list("namespace", "version"))
+        except DatabaseError:
+            logger.exception("Failed to poll cache versions")
+            connection.close()
+            return
+
+        previous, self._versions = self._versions, versions
+        if previous is None:
+            return
+        if changed := [namespace for namespace, version in versions.items() if previous.get(namespace) != version]:
+            self.invalidate(*changed)
+
+
+@lru_cache
+def get_invalidation_bus() -> InvalidationBus:
+    return InvalidationBus()
+
+
+def get_shared_version_key(namespace: str) -> str:
+    return f"ferry:version:{namespace}"
+
+
+def _bump_shared_versions(*namespaces: str) -> None:
+    try:
+        caches[SHARED_CACHE_ALIAS].set_many(
+            {get_shared_version_key(namespace): uuid.uuid4().hex for namespace in namespaces},
+            timeout=None,
+        )
+    except Exception:  # noqa: BLE001
+        logger.exception("Failed to bump shared cache versions")
+
+
+def bump_cache_versions(*namespaces: str) -> None:
+    """Tell every process that the data in the namespaces has changed, once the current transaction commits."""
+    bus = get_invalidation_bus()
+
+    def apply() -> None:
+        bus.invalidate(*namespaces)
+        _bump_shared_versions(*namespaces)
+
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            for namespace in namespaces:
+                cursor.execute("SELECT pg_notify(%s, %s)", [INVALIDATION_CHANNEL, f"{bus.id}:{namespace}"])
+    else:
+        CacheVersion.objects.bulk_create(
+            [CacheVersion(namespace=namespace) for namespace in namespaces],
+            update_conflicts=True,
+            unique_fields=["namespace"],
+            update_fields=["version"],
+        )
+    # Apply the change to this process straight away, so nothing cached later in the transaction
+    # outlives it, and again on commit, in case the old data was cached again in the meantime.
+    apply()
+    transaction.on_commit(apply)
+
+
+def invalidate_on_change(namespace: str, *models_: type[models.Model]) -> None:
+    """Bump the version of a namespace whenever one of the models is saved or deleted."""
+
+    def receiver(sender: type[models.Model], **kwargs: Any) -> None:
+        if not kwargs.get("raw"):
+            bump_cache_versions(namespace)
+
+    for model in models_:
+        dispatch_uid = f"invalidate_{namespace}_{model._meta.label}"
+        post_save.connect(receiver, sender=model, weak=False, dispatch_uid=f"{dispatch_uid}_save")
+        post_delete.connect(receiver, sender=model, weak=False, dispatch_uid=f"{dispatch_uid}_delete")
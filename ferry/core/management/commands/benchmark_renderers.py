@@ -0,0 +1,58 @@
+import uuid
+from decimal import Decimal
+from timeit import Timer
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+from ferry.core.api.renderers import FastJSONRenderer, MessagePackRenderer
+
+RENDERERS: list[type[BaseRenderer]] = [JSONRenderer, FastJSONRenderer, MessagePackRenderer]
+
+
+def make_page(rows: int) -> dict[str, Any]:
+    """A page shaped like a people list, with the UUIDs and decimals that DRF has to coerce."""
+    now = timezone.now().isoformat()
+    return {
+        "count": rows,
+        "next": None,
+        "previous": None,
+        "results": [
+            {
+                "id": uuid.uuid4(),
+                "display_name": f"Person {i}",
+                "discord_id": 100000000000000000 + i,
+                "discord_verification": "verified",
+                "current_score": Decimal(i) / 4,
+                "autopub": i % 2 == 0,
+                "ferry_sequence": "",
+                "created_by": {"id": uuid.uuid4(), "display_name": "Someone"},
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(rows)
+        ],
+    }
+
+
+class Command(BaseCommand):
+    help = "Compare how long each API renderer takes to render a page of results."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--rows", type=int, default=100, help="The number of results on the page.")
+        parser.add_argument("--number", type=int, default=200, help="The number of times to render the page.")
+
+    def handle(self, *args: Any, rows: int, number: int, **options: Any) -> None:
+        page = make_page(rows)
+
+        baseline = None
+        for renderer_class in RENDERERS:
+            renderer = renderer_class()
+            size = len(renderer.render(page))
+            seconds = min(Timer(lambda: renderer.render(page)).repeat(repeat=5, number=number)) / number  # noqa: B023
+            baseline = baseline or seconds
+            self.stdout.write(
+                f"{renderer_class.__name__:<20} {seconds * 1_000_000:10.1f}us {baseline / seconds:6.2f}x {size:8} bytes"
+            )
@@ -0,0 +1,13 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from ferry.core.api.schema import build_api_schema, get_code_version
+
+
+class Command(BaseCommand):
+    help = "Generate the OpenAPI schema for this version of the code, so that workers do not have to."
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        build_api_schema()
+        self.stdout.write(self.style.SUCCESS(f"Built the API schema for code version {get_code_version()[:12]}."))
@@ -0,0 +1,28 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from ferry.core.startup import profile_startup
+
+
+class Command(BaseCommand):
+    help = "Report how long ferry takes to start, and which imports it spends that time on."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--limit", type=int, default=20, help="The number of packages and modules to list.")
+
+    def handle(self, *args: Any, limit: int, **options: Any) -> None:
+        profile = profile_startup()
+
+        self.stdout.write(f"Django setup: {profile.setup_seconds * 1000:.1f}ms")
+        self.stdout.write(f"URLconf: {profile.urls_seconds * 1000:.1f}ms")
+
+        self.stdout.write(self.style.MIGRATE_HEADING("\nSlowest packages, including their submodules:"))
+        package_times = sorted(profile.get_package_times().items(), key=lambda item: item[1], reverse=True)
+        for package, package_us in package_times[:limit]:
+            self.stdout.write(f"  {package_us / 1000:8.1f}ms  {package}")
+
+        self.stdout.write(self.style.MIGRATE_HEADING("\nSlowest modules, including what they import:"))
+        imports = sorted(profile.imports, key=lambda import_time: import_time.cumulative_us, reverse=True)
+        for import_time in imports[:limit]:
+            self.stdout.write(f"  {import_time.cumulative_us / 1000:8.1f}ms  {import_time.module}")
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:33
+
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="CacheVersion",
+            fields=[
+                ("namespace", models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ("version", models.UUIDField(default=uuid.uuid4)),
+            ],
+        ),
+    ]
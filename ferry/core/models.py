@@ -0,0 +1,30 @@
+import uuid
+from typing import Any
+
+from django.db import models, router, transaction
+
+
+class AtomicSaveModel(models.Model):
+    """
+    A model that is saved in a transaction, which includes its ``post_save`` receivers.
+
+    Receivers that record the save, such as the change log, then commit or roll back with it.
+    """
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            super().save(*args, **kwargs)
+
+
+class CacheVersion(models.Model):
+    """The version of a namespace of cached data, which workers poll for changes when Postgres is not available."""
+
+    namespace = models.CharField(max_length=100, primary_key=True)
+    version = models.UUIDField(default=uuid.uuid4)
+
+    def __str__(self) -> str:
+        return f"{self.namespace} at {self.version}"
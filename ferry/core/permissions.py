@@ -65,3 +65,8 @@ rules.add_perm("pub.create_event", rules.is_superuser)
 rules.add_perm("pub.edit_event", rules.is_superuser)
 rules.add_perm("pub.delete_event", rules.is_superuser)
 rules.add_perm("pub.record_attendance", rules.is_superuser)
+
+# Activity
+
+rules.add_perm("activity.manage_webhooks", rules.is_superuser)
+rules.add_perm("activity.view_changes", rules.is_superuser)
@@ -17,8 +17,11 @@ ALLOWED_HOSTS: list[str] = []
 
 INSTALLED_APPS = [
     "ferry.accounts",
+    "ferry.activity",
+    "ferry.core",
     "ferry.court",
     "ferry.dashboard",
+    "ferry.jobs",
     "ferry.pub",
     "drf_spectacular",
     "rest_framework",
@@ -76,6 +79,18 @@ STATICFILES_DIRS = (os.path.join(BASE_DIR, "static"),)
 WSGI_APPLICATION = "ferry.core.wsgi.application"
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# Shared by the workers on a host, behind the in-process tier of ferry.core.cache.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR / "../cache",
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    }
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -145,11 +160,12 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",
     ],
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        "ferry.core.api.renderers.FastJSONRenderer",
+        "ferry.core.api.renderers.MessagePackRenderer",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     # Pagination
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
+    "DEFAULT_PAGINATION_CLASS": "ferry.core.api.pagination.OptionalCountPagination",
     "PAGE_SIZE": 100,
 }
 
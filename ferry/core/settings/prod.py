@@ -24,6 +24,7 @@ DATABASES = {
 
 MEDIA_ROOT = "/app/media/"
 STATIC_ROOT = "/app/static/"
+CACHES["default"]["LOCATION"] = "/app/cache/"  # noqa: F405
 
 DISCORD_GUILD = os.environ["DISCORD_GUILD"]
 DISCORD_TOKEN = os.environ["DISCORD_TOKEN"]
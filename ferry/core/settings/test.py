@@ -17,5 +17,11 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
 DISCORD_GUILD = 1234
 DISCORD_TOKEN = "not-a-token"  # noqa: S105
@@ -0,0 +1,73 @@
+"""
+Profiling how long ferry takes to start.
+
+Startup is timed in a fresh interpreter with Python's ``-X importtime``, so that modules that
+are already imported in this process are counted, and is split into setting up Django, which
+loads the settings, apps and models, and loading the URLconf, which imports the views.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import NamedTuple
+
+from django.conf import settings
+
+IMPORT_TIME_RE = re.compile(r"^import time:\s+(?P<self>\d+) \|\s+(?P<cumulative>\d+) \|(?P<indent>\s+)(?P<module>\S+)$")
+
+STARTUP_SCRIPT = """
+import time
+import django
+started_at = time.perf_counter()
+django.setup()
+set_up_at = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(set_up_at - started_at, time.perf_counter() - set_up_at)
+"""
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+class StartupProfile(NamedTuple):
+    setup_seconds: float
+    urls_seconds: float
+    imports: list[ImportTime]
+
+    def get_package_times(self) -> dict[str, int]:
+        """The time spent importing each top level package and its submodules, in microseconds."""
+        package_times: defaultdict[str, int] = defaultdict(int)
+        for import_time in self.imports:
+            package_times[import_time.module.partition(".")[0]] += import_time.self_us
+        return dict(package_times)
+
+
+def parse_import_times(output: str) -> list[ImportTime]:
+    """Parse the output of ``python -X importtime``."""
+    return [
+        ImportTime(match["module"], int(match["self"]), int(match["cumulative"]))
+        for line in output.splitlines()
+        if (match := IMPORT_TIME_RE.match(line))
+    ]
+
+
+def profile_startup() -> StartupProfile:
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT],
+        env={**os.environ, "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE},
+        cwd=Path(settings.BASE_DIR).parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    setup_seconds, urls_seconds = (float(value) for value in result.stdout.split()[-2:])
+    return StartupProfile(setup_seconds, urls_seconds, parse_import_times(result.stderr))
@@ -0,0 +1,182 @@
+from http import HTTPStatus
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse_lazy
+
+from ferry.accounts.factories import PersonFactory
+from ferry.accounts.models import User
+from ferry.conftest import APITest
+from ferry.core.api.batch import MAX_BATCH_REQUESTS, UnresolvedReferenceError, resolve_references
+from ferry.court.models import Accusation
+
+
+class TestResolveReferences:
+    responses = [{"status": 200, "headers": {}, "body": {"id": "abc", "count": 3, "results": [{"id": "def"}]}}]
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            pytest.param("/api/v2/people/{{0.id}}/", "/api/v2/people/abc/", id="in-path"),
+            pytest.param("{{ 0.count }}", 3, id="whole-value"),
+            pytest.param({"ids": ["{{0.results.0.id}}"]}, {"ids": ["def"]}, id="nested"),
+            pytest.param(None, None, id="none"),
+        ],
+    )
+    def test_resolve(self, value: Any, expected: Any) -> None:
+        assert resolve_references(value, self.responses) == expected
+
+    @pytest.mark.parametrize("value", ["{{1.id}}", "{{0.bees}}", "{{0.results.1.id}}"])
+    def test_unresolved(self, value: str) -> None:
+        with pytest.raises(UnresolvedReferenceError):
+            resolve_references(value, self.responses)
+
+
+@pytest.mark.django_db
+class TestBatchEndpoint(APITest):
+    url = reverse_lazy("api-2.0.0:batch")
+
+    def _post(self, client: Client, user: User, payload: dict[str, Any]) -> Any:
+        return client.post(self.url, payload, content_type="application/json", headers=self.get_headers(user))
+
+    def test_post_unauthenticated(self, client: Client) -> None:
+        resp = client.post(self.url, {"requests": []}, content_type="application/json")
+        assert resp.status_code == HTTPStatus.UNAUTHORIZED
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            pytest.param({"requests": []}, id="empty"),
+            pytest.param({"requests": [{"method": "GET", "path": "/admin/"}]}, id="not-api"),
+            pytest.param(
+                {"requests": [{"method": "GET", "path": "/api/v2/people/"}] * (MAX_BATCH_REQUESTS + 1)}, id="too-many"
+            ),
+        ],
+    )
+    def test_post_bad_payload(self, client: Client, user_with_person: User, payload: dict[str, Any]) -> None:
+        resp = self._post(client, user_with_person, payload)
+        assert resp.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_post(self, client: Client, user_with_person: User) -> None:
+        # Arrange
+        suspect = PersonFactory(discord_id=12345)
+        headers = self.get_headers(user_with_person)
+        payload = {
+            "requests": [
+                {"method": "POST", "path": "/api/v2/people/lookup/?fields=id", "body": {"discord_ids": [12345]}},
+                {
+                    "method": "POST",
+                    "path": "/api/v2/court/accusations/",
+                    "body": {"quote": "bees", "suspect": "{{0.12345.id}}"},
+                },
+                {"method": "GET", "path": "/api/v2/court/accusations/{{1.id}}/?fields=id,suspect&expand="},
+            ],
+        }
+
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            resp = client.post(self.url, payload, content_type="application/json", headers=headers)
+
+        # Assert
+        assert resp.status_code == HTTPStatus.OK
+        data = resp.json()
+        assert data["rolled_back"] is False
+        assert [response["status"] for response in data["responses"]] == [200, 201, 200]
+        accusation = Accusation.objects.get()
+        assert accusation.suspect == suspect
+        assert data["responses"][2]["body"] == {"id": str(accusation.id), "suspect": str(suspect.id)}
+        # The batch is authenticated once, rather than for each request in it.
+        assert sum("apitoken" in query["sql"] for query in queries.captured_queries) == 1
+
+    @pytest.mark.parametrize(("atomic", "accusation_count"), [(False, 1), (True, 0)])
+    def test_post_failure(
+        self,
+        client: Client,
+        user_with_person: User,
+        atomic: bool,  # noqa: FBT001
+        accusation_count: int,
+    ) -> None:
+        # Arrange
+        suspect = PersonFactory()
+        payload = {
+            "atomic": atomic,
+            "requests": [
+                {
+                    "method": "POST",
+                    "path": "/api/v2/court/accusations/",
+                    "body": {"quote": "bees", "suspect": str(suspect.id)},
+                },
+                {"method": "POST", "path": "/api/v2/court/accusations/", "body": {"quote": "bees"}},
+                {"method": "GET", "path": "/api/v2/court/accusations/{{0.id}}/"},
+            ],
+        }
+
+        # Act
+        resp = self._post(client, user_with_person, payload)
+
+        # Assert
+        assert resp.status_code == HTTPStatus.OK
+        data = resp.json()
+        assert data["rolled_back"] is atomic
+        assert [response["status"] for response in data["responses"]] == ([201, 400] if atomic else [201, 400, 200])
+        assert data["responses"][1]["body"] == {"suspect": ["This field is required."]}
+        assert Accusation.objects.count() == accusation_count
+
+    @pytest.mark.parametrize(
+        ("path", "status"),
+        [
+            pytest.param("/api/v2/bees/", HTTPStatus.NOT_FOUND, id="not-found"),
+            pytest.param("/api/v2/batch/", HTTPStatus.BAD_REQUEST, id="batch"),
+            pytest.param("/api/v2/people/{{3.id}}/", HTTPStatus.BAD_REQUEST, id="unresolved-reference"),
+        ],
+    )
+    def test_post_bad_request(self, client: Client, user_with_person: User, path: str, status: HTTPStatus) -> None:
+        resp = self._post(client, user_with_person, {"requests": [{"method": "GET", "path": path}]})
+
+        assert resp.status_code == HTTPStatus.OK
+        assert resp.json()["responses"][0]["status"] == status
+
+    def test_post_headers(self, client: Client, user_with_person: User) -> None:
+        resp = self._post(
+            client,
+            user_with_person,
+            {"requests": [{"method": "GET", "path": "/api/v2/people/", "headers": {"Accept": "application/bees"}}]},
+        )
+
+        assert resp.json()["responses"][0]["status"] == HTTPStatus.NOT_ACCEPTABLE
+
+    @pytest.mark.parametrize(("atomic", "statuses"), [(False, [201, 500, 200]), (True, [201, 500])])
+    def test_post_server_error(
+        self,
+        client: Client,
+        user_with_person: User,
+        atomic: bool,  # noqa: FBT001
+        statuses: list[int],
+    ) -> None:
+        suspect = PersonFactory()
+        payload = {
+            "atomic": atomic,
+            "requests": [
+                {
+                    "method": "POST",
+                    "path": "/api/v2/court/accusations/",
+                    "body": {"quote": "bees", "suspect": str(suspect.id)},
+                },
+                {"method": "GET", "path": "/api/v2/people/"},
+                {"method": "GET", "path": "/api/v2/court/accusations/{{0.id}}/"},
+            ],
+        }
+
+        with patch("ferry.accounts.api.views.PersonViewset.get_queryset", side_effect=RuntimeError):
+            resp = self._post(client, user_with_person, payload)
+
+        assert resp.status_code == HTTPStatus.OK
+        data = resp.json()
+        assert data["rolled_back"] is atomic
+        assert [response["status"] for response in data["responses"]] == statuses
+        assert data["responses"][1]["body"] == {"detail": "A server error occurred."}
+        assert Accusation.objects.count() == (0 if atomic else 1)
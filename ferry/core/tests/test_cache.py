@@ -0,0 +1,176 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from django.core.cache import cache
+
+from ferry.core.cache import CacheStats, TwoTierCache, memoize
+from ferry.core.invalidation import bump_cache_versions, get_shared_version_key
+from ferry.pub.factories import PubEventFactory, PubEventRSVPFactory
+from ferry.pub.models import PubEvent
+from ferry.pub.repository import get_attendee_count_for_pub_event, get_attendee_list_for_pub_event
+
+
+class TestTwoTierCache:
+    def test_value_is_computed_once(self) -> None:
+        two_tier_cache = TwoTierCache()
+        func = Mock(return_value=42)
+
+        assert two_tier_cache.get_or_set("answer", func, namespaces=["pub"]) == 42
+        assert two_tier_cache.get_or_set("answer", func, namespaces=["pub"]) == 42
+
+        func.assert_called_once_with()
+        assert two_tier_cache.get_stats() == CacheStats(
+            local_hits=1, shared_hits=0, misses=1, evictions=0, expirations=0, invalidations=0
+        )
+
+    def test_shared_tier_is_used_by_other_processes(self) -> None:
+        func = Mock(return_value=42)
+        TwoTierCache().get_or_set("answer", func, namespaces=["pub"])
+
+        other_process_cache = TwoTierCache()
+        assert other_process_cache.get_or_set("answer", func, namespaces=["pub"]) == 42
+
+        func.assert_called_once_with()
+        assert other_process_cache.get_stats().shared_hits == 1
+
+    @pytest.mark.django_db
+    def test_changes_to_a_namespace_invalidate_both_tiers(self) -> None:
+        two_tier_cache = TwoTierCache()
+        other_process_cache = TwoTierCache()
+        two_tier_cache.get_or_set("answer", Mock(return_value=42), namespaces=["pub", "people"])
+        other_process_cache.get_or_set("answer", Mock(return_value=42), namespaces=["pub", "people"])
+
+        bump_cache_versions("people")
+
+        assert two_tier_cache.get_or_set("answer", Mock(return_value=43), namespaces=["pub", "people"]) == 43
+        assert two_tier_cache.get_stats().invalidations == 2
+        assert other_process_cache.get_or_set("answer", Mock(return_value=44), namespaces=["pub", "people"]) == 43
+
+    @pytest.mark.django_db
+    def test_changes_to_other_namespaces_are_ignored(self) -> None:
+        two_tier_cache = TwoTierCache()
+        func = Mock(return_value=42)
+        two_tier_cache.get_or_set("answer", func, namespaces=["pub"])
+
+        bump_cache_versions("court")
+
+        assert two_tier_cache.get_or_set("answer", func, namespaces=["pub"]) == 42
+        func.assert_called_once_with()
+
+    def test_missing_shared_version_does_not_match_old_values(self) -> None:
+        TwoTierCache().get_or_set("answer", Mock(return_value=42), namespaces=["pub"])
+        cache.delete(get_shared_version_key("pub"))
+
+        assert TwoTierCache().get_or_set("answer", Mock(return_value=43), namespaces=["pub"]) == 43
+
+    def test_least_recently_used_value_is_evicted(self) -> None:
+        two_tier_cache = TwoTierCache(max_entries=2)
+        two_tier_cache.get_or_set("a", Mock(return_value=1), namespaces=["pub"])
+        two_tier_cache.get_or_set("b", Mock(return_value=2), namespaces=["pub"])
+        two_tier_cache.get_or_set("a", Mock(), namespaces=["pub"])
+
+        two_tier_cache.get_or_set("c", Mock(return_value=3), namespaces=["pub"])
+
+        stats = two_tier_cache.get_stats()
+        assert stats.evictions == 1
+        assert two_tier_cache.get_or_set("a", Mock(), namespaces=["pub"]) == 1
+        assert two_tier_cache.get_stats().local_hits == stats.local_hits + 1
+        # The evicted value is still in the shared tier.
+        assert two_tier_cache.get_or_set("b", Mock(), namespaces=["pub"]) == 2
+        assert two_tier_cache.get_stats().shared_hits == 1
+
+    def test_local_values_expire(self) -> None:
+        two_tier_cache = TwoTierCache(local_ttl=10)
+        with patch("ferry.core.cache.monotonic", return_value=0) as monotonic:
+            two_tier_cache.get_or_set("answer", Mock(return_value=42), namespaces=["pub"])
+            monotonic.return_value = 11
+
+            assert two_tier_cache.get_or_set("answer", Mock(), namespaces=["pub"]) == 42
+
+        stats = two_tier_cache.get_stats()
+        assert stats.expirations == 1
+        assert stats.shared_hits == 1
+
+    def test_delete(self) -> None:
+        two_tier_cache = TwoTierCache()
+        two_tier_cache.get_or_set("answer", Mock(return_value=42), namespaces=["pub"])
+
+        two_tier_cache.delete("answer")
+
+        assert TwoTierCache().get_or_set("answer", Mock(return_value=43), namespaces=["pub"]) == 43
+        assert two_tier_cache.get_or_set("answer", Mock(return_value=44), namespaces=["pub"]) == 43
+
+    def test_hit_rate(self) -> None:
+        assert CacheStats(1, 2, 1, 0, 0, 0).hit_rate == 0.75
+        assert CacheStats(0, 0, 0, 0, 0, 0).hit_rate == 0.0
+
+
+def add(a: int, *, b: int = 0) -> int:
+    return a + b
+
+
+class TestMemoize:
+    def test_arguments_are_part_of_the_key(self) -> None:
+        func = Mock(side_effect=add)
+        memoized = memoize(namespaces=["pub"])(add)
+        memoized.func = func
+
+        assert memoized(1, b=2) == 3
+        assert memoized(1, b=2) == 3
+        assert memoized(2, b=2) == 4
+
+        assert func.call_count == 2
+
+    def test_invalidate(self) -> None:
+        func = Mock(side_effect=add)
+        memoized = memoize(namespaces=["pub"])(add)
+        memoized.func = func
+        memoized(1)
+        memoized(2)
+
+        memoized.invalidate(1)
+        memoized(1)
+        memoized(2)
+
+        assert func.call_count == 3
+
+    @pytest.mark.django_db
+    def test_invalidate_all(self) -> None:
+        func = Mock(side_effect=add)
+        memoized = memoize(namespaces=["pub"])(add)
+        memoized.func = func
+        memoized(1)
+
+        memoized.invalidate_all()
+        memoized(1)
+
+        assert func.call_count == 2
+
+
+@pytest.mark.django_db
+class TestMemoizedRepositoryFunctions:
+    def test_attendees_follow_responses(self) -> None:
+        pub_event: PubEvent = PubEventFactory()  # type: ignore[assignment]
+        assert get_attendee_list_for_pub_event(pub_event) == []
+        assert get_attendee_count_for_pub_event(pub_event) == 0
+
+        rsvp = PubEventRSVPFactory(pub_event=pub_event, is_attending=True)
+
+        assert get_attendee_list_for_pub_event(pub_event) == [rsvp.person]
+        assert get_attendee_count_for_pub_event(pub_event) == 1
+
+    def test_attendees_follow_people(self) -> None:
+        rsvp = PubEventRSVPFactory(is_attending=True)
+        get_attendee_list_for_pub_event(rsvp.pub_event)
+
+        rsvp.person.display_name = "Renamed"
+        rsvp.person.save()
+
+        assert get_attendee_list_for_pub_event(rsvp.pub_event)[0].display_name == "Renamed"
+
+    def test_cached_attendees_do_not_query(self, django_assert_num_queries: Mock) -> None:
+        rsvp = PubEventRSVPFactory(is_attending=True)
+        get_attendee_list_for_pub_event(rsvp.pub_event)
+
+        with django_assert_num_queries(0):
+            assert get_attendee_list_for_pub_event(rsvp.pub_event) == [rsvp.person]
@@ -0,0 +1,121 @@
+from http import HTTPStatus
+from typing import Any
+
+import pytest
+from django.db.models import QuerySet
+from django.test import Client
+from django.urls import reverse_lazy
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from ferry.accounts.api.serializers import PersonLinkSerializer, PersonSerializer
+from ferry.accounts.factories import PersonFactory
+from ferry.accounts.models import Person, User
+from ferry.conftest import APITest
+from ferry.core.api.compiled import UncompilableSerializerError, compile_serializer
+from ferry.core.api.fieldsets import FieldSelection
+from ferry.court.api.serializers import AccusationSerializer, ConsequenceReadSerializer
+from ferry.court.factories import AccusationFactory, ConsequenceFactory
+from ferry.court.models import Accusation, Consequence
+from ferry.pub.api.serializers import PubEventRSVPSerializer, PubEventSerializer
+from ferry.pub.factories import PubEventRSVPFactory
+from ferry.pub.models import PubEventRSVP
+
+
+def assert_equivalent(
+    serializer_class: type[serializers.ModelSerializer],
+    queryset: QuerySet[Any],
+    field_selection: FieldSelection | None = None,
+) -> None:
+    compiled = compile_serializer(serializer_class, field_selection)
+
+    expected = serializer_class(queryset, many=True, context={"field_selection": field_selection}).data
+    actual = compiled.build_many(compiled.get_rows(queryset))
+
+    assert actual == expected
+    assert JSONRenderer().render(actual) == JSONRenderer().render(expected)
+
+
+@pytest.mark.django_db
+class TestCompiledSerializer:
+    def test_person_link(self) -> None:
+        PersonFactory.create_batch(3)
+
+        assert_equivalent(PersonLinkSerializer, Person.objects.order_by("id"))
+
+    def test_accusation(self) -> None:
+        AccusationFactory.create_batch(3)
+        AccusationFactory.create_batch(2, ratification=None)
+
+        assert_equivalent(AccusationSerializer, Accusation.objects.order_by("created_at"))
+
+    @pytest.mark.parametrize(
+        "field_selection",
+        [
+            pytest.param(FieldSelection(fields=frozenset({"id", "suspect"})), id="fields"),
+            pytest.param(FieldSelection(expand=frozenset({"suspect"})), id="expand"),
+        ],
+    )
+    def test_accusation_field_selection(self, field_selection: FieldSelection) -> None:
+        AccusationFactory()
+        AccusationFactory(ratification=None)
+
+        assert_equivalent(AccusationSerializer, Accusation.objects.order_by("created_at"), field_selection)
+
+    def test_consequence(self) -> None:
+        ConsequenceFactory.create_batch(2)
+        ConsequenceFactory(is_enabled=False)
+
+        assert_equivalent(ConsequenceReadSerializer, Consequence.objects.order_by("created_at"))
+
+    def test_primary_key_relation(self) -> None:
+        PubEventRSVPFactory.create_batch(3)
+
+        assert_equivalent(PubEventRSVPSerializer, PubEventRSVP.objects.order_by("created_at"))
+
+    def test_rows_are_read_in_one_query(self, django_assert_num_queries: Any) -> None:
+        AccusationFactory.create_batch(5)
+        compiled = compile_serializer(AccusationSerializer)
+
+        with django_assert_num_queries(1):
+            compiled.build_many(compiled.get_rows(Accusation.objects.all()))
+
+    @pytest.mark.parametrize(
+        "serializer_class",
+        [
+            pytest.param(PersonSerializer, id="method-field"),
+            pytest.param(PubEventSerializer, id="to-representation"),
+        ],
+    )
+    def test_uncompilable(self, serializer_class: type[serializers.ModelSerializer]) -> None:
+        with pytest.raises(UncompilableSerializerError):
+            compile_serializer(serializer_class)
+
+
+@pytest.mark.django_db
+class TestCompiledListEndpoint(APITest):
+    url = reverse_lazy("api-2.0.0:accusations-list")
+
+    def test_matches_retrieve(self, client: Client, admin_user: User) -> None:
+        accusation = AccusationFactory()
+        headers = self.get_headers(admin_user)
+
+        resp = client.get(self.url, headers=headers)
+
+        assert resp.status_code == HTTPStatus.OK
+        detail_resp = client.get(reverse_lazy("api-2.0.0:accusations-detail", args=[accusation.id]), headers=headers)
+        assert resp.json()["results"] == [detail_resp.json()]
+
+    def test_filters_and_ordering_are_applied(self, client: Client, admin_user: User) -> None:
+        suspect = PersonFactory()
+        first, second = AccusationFactory.create_batch(2, suspect=suspect)
+        AccusationFactory()
+
+        resp = client.get(
+            self.url, {"suspect": str(suspect.id), "ordering": "-created_at"}, headers=self.get_headers(admin_user)
+        )
+
+        assert resp.status_code == HTTPStatus.OK
+        data = resp.json()
+        assert data["count"] == 2
+        assert [item["id"] for item in data["results"]] == [str(second.id), str(first.id)]
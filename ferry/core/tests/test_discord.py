@@ -0,0 +1,284 @@
+import asyncio
+import json
+import threading
+from collections.abc import Awaitable, Callable, Iterator
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, TypeVar
+
+import httpx
+import pytest
+import requests
+
+from ferry.core.discord import (
+    AsyncDiscordClient,
+    DiscordClient,
+    DiscordRateLimitedError,
+    NoSuchGuildMemberError,
+)
+
+T = TypeVar("T")
+
+
+class FakeDiscord:
+    """A local HTTP server that replays queued responses, pretending to be the Discord API."""
+
+    def __init__(self) -> None:
+        self.responses: list[tuple[int, dict[str, str], Any]] = []
+        self.requests: list[tuple[str, str, dict[str, str]]] = []
+
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:  # noqa: N802
+                fake.requests.append(("GET", self.path, dict(self.headers)))
+                status, headers, body = fake.responses.pop(0)
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/api/v10"
+
+    def respond(self, status: int, body: Any, headers: dict[str, str] | None = None) -> None:
+        self.responses.append((status, headers or {}, body))
+
+
+@pytest.fixture
+def fake_discord() -> Iterator[FakeDiscord]:
+    fake = FakeDiscord()
+    thread = threading.Thread(target=fake.server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    yield fake
+    fake.server.shutdown()
+    fake.server.server_close()
+
+
+class TestDiscordClient:
+    @pytest.fixture
+    def sleeps(self) -> list[float]:
+        return []
+
+    @pytest.fixture
+    def client(self, fake_discord: FakeDiscord, sleeps: list[float]) -> DiscordClient:
+        return DiscordClient("bees", base_url=fake_discord.url, sleep=sleeps.append)
+
+    def test_get_guild_member(self, client: DiscordClient, fake_discord: FakeDiscord) -> None:
+        fake_discord.respond(HTTPStatus.OK, {"nick": "bees"})
+
+        assert client.get_guild_member_by_id(1, 2) == {"nick": "bees"}
+
+        method, path, headers = fake_discord.requests[0]
+        assert (method, path) == ("GET", "/api/v10/guilds/1/members/2")
+        assert headers["Authorization"] == "Bot bees"
+
+    def test_get_guild_member_is_cached(self, client: DiscordClient, fake_discord: FakeDiscord) -> None:
+        fake_discord.respond(HTTPStatus.OK, {"nick": "bees"})
+
+        client.get_guild_member_by_id(1, 2)
+        assert client.get_guild_member_by_id(1, 2) == {"nick": "bees"}
+
+        assert len(fake_discord.requests) == 1
+
+    def test_missing_guild_member_is_cached(self, client: DiscordClient, fake_discord: FakeDiscord) -> None:
+        fake_discord.respond(HTTPStatus.NOT_FOUND, {"message": "Unknown Member"})
+
+        for _ in range(2):
+            with pytest.raises(NoSuchGuildMemberError):
+                client.get_guild_member_by_id(1, 2)
+
+        assert len(fake_discord.requests) == 1
+
+    def test_cache_expires(self, fake_discord: FakeDiscord) -> None:
+        client = DiscordClient("bees", base_url=fake_discord.url, member_cache_ttl=0)
+        fake_discord.respond(HTTPStatus.OK, {"nick": "bees"})
+        fake_discord.respond(HTTPStatus.OK, {"nick": "wasps"})
+
+        client.get_guild_member_by_id(1, 2)
+        assert client.get_guild_member_by_id(1, 2) == {"nick": "wasps"}
+
+    def test_iter_guild_members(self, client: DiscordClient, fake_discord: FakeDiscord) -> None:
+        fake_discord.respond(HTTPStatus.OK, [{"user": {"id": "1"}}, {"user": {"id": "2"}}])
+        fake_discord.respond(HTTPStatus.OK, [{"user": {"id": "3"}}])
+
+        members = list(client.iter_guild_members(1, page_size=2))
+
+        assert [member["user"]["id"] for member in members] == ["1", "2", "3"]
+        assert [path for _, path, _ in fake_discord.requests] == [
+            "/api/v10/guilds/1/members?limit=2&after=0",
+            "/api/v10/guilds/1/members?limit=2&after=2",
+        ]
+        assert client.get_cached_guild_member_by_id(1, 3) is None
+
+    def test_server_error(self, client: DiscordClient, fake_discord: FakeDiscord) -> None:
+        fake_discord.respond(HTTPStatus.INTERNAL_SERVER_ERROR, {})
+
+        with pytest.raises(requests.HTTPError):
+            client.get_guild_member_by_id(1, 2)
+
+    def test_retries_after_rate_limit(
+        self, client: DiscordClient, fake_discord: FakeDiscord, sleeps: list[float]
+    ) -> None:
+        fake_discord.respond(
+            HTTPStatus.TOO_MANY_REQUESTS,
+            {"message": "You are being rate limited.", "retry_after": 0.5, "global": False},
+            {"X-RateLimit-Bucket": "abc", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "0.5"},
+        )
+        fake_discord.respond(HTTPStatus.OK, {"nick": "bees"})
+
+        assert client.get_guild_member_by_id(1, 2) == {"nick": "bees"}
+
+        assert len(fake_discord.requests) == 2
+        assert len(sleeps) == 1
+        assert 0 < sleeps[0] <= 0.5
+
+    def test_waits_for_exhausted_bucket(
+        self, client: DiscordClient, fake_discord: FakeDiscord, sleeps: list[float]
+    ) -> None:
+        fake_discord.respond(
+            HTTPStatus.OK,
+            {"nick": "bees"},
+            {"X-RateLimit-Bucket": "abc", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "1"},
+        )
+        fake_discord.respond(HTTPStatus.OK, {"nick": "wasps"})
+
+        client.get_guild_member_by_id(1, 2)
+        assert sleeps == []
+
+        # A different member in the same guild shares the bucket.
+        client.get_guild_member_by_id(1, 3)
+        assert len(sleeps) == 1
+        assert 0 < sleeps[0] <= 1
+
+    def test_gives_up_when_rate_limited(self, fake_discord: FakeDiscord) -> None:
+        client = DiscordClient("bees", base_url=fake_discord.url, max_rate_limit_wait=1, sleep=lambda _: None)
+        fake_discord.respond(
+            HTTPStatus.TOO_MANY_REQUESTS,
+            {"message": "You are being rate limited.", "retry_after": 60, "global": True},
+            {"X-RateLimit-Global": "true", "Retry-After": "60"},
+        )
+
+        with pytest.raises(DiscordRateLimitedError):
+            client.get_guild_member_by_id(1, 2)
+
+
+class TestAsyncDiscordClient:
+    def _run(self, fake_discord: FakeDiscord, coro: Callable[[AsyncDiscordClient], Awaitable[T]], **kwargs: Any) -> T:
+        async def run() -> T:
+            async with AsyncDiscordClient("bees", base_url=fake_discord.url, sleep=self._sleep, **kwargs) as client:
+                return await coro(client)
+
+        self.sleeps: list[float] = []
+        return asyncio.run(run())
+
+    async def _sleep(self, delay: float) -> None:
+        self.sleeps.append(delay)
+
+    def test_get_guild_member(self, fake_discord: FakeDiscord) -> None:
+        fake_discord.respond(HTTPStatus.OK, {"nick": "bees"})
+
+        async def get_member_twice(client: AsyncDiscordClient) -> dict[str, Any]:
+            await client.get_guild_member_by_id(1, 2)
+            return await client.get_guild_member_by_id(1, 2)
+
+        assert self._run(fake_discord, get_member_twice) == {"nick": "bees"}
+
+        method, path, headers = fake_discord.requests[0]
+        assert (method, path) == ("GET", "/api/v10/guilds/1/members/2")
+        assert headers["Authorization"] == "Bot bees"
+        assert len(fake_discord.requests) == 1
+
+    def test_missing_guild_member(self, fake_discord: FakeDiscord) -> None:
+        fake_discord.respond(HTTPStatus.NOT_FOUND, {"message": "Unknown Member"})
+
+        with pytest.raises(NoSuchGuildMemberError):
+            self._run(fake_discord, lambda client: client.get_guild_member_by_id(1, 2))
+
+    def test_server_error(self, fake_discord: FakeDiscord) -> None:
+        fake_discord.respond(HTTPStatus.INTERNAL_SERVER_ERROR, {})
+
+        with pytest.raises(httpx.HTTPStatusError):
+            self._run(fake_discord, lambda client: client.get_guild_member_by_id(1, 2))
+
+    def test_get_guild_members_by_ids(self, fake_discord: FakeDiscord) -> None:
+        fake_discord.respond(HTTPStatus.OK, {"nick": "bees"})
+        fake_discord.respond(HTTPStatus.NOT_FOUND, {"message": "Unknown Member"})
+
+        members = self._run(fake_discord, lambda client: client.get_guild_members_by_ids(1, [2, 3, 2]))
+
+        # The fake server answers in order, so we can't know which member was found.
+        assert sorted(members) == [2, 3]
+        assert sorted(members.values(), key=bool) == [None, {"nick": "bees"}]
+        assert len(fake_discord.requests) == 2
+
+    def test_retries_after_rate_limit(self, fake_discord: FakeDiscord) -> None:
+        fake_discord.respond(
+            HTTPStatus.TOO_MANY_REQUESTS,
+            {"message": "You are being rate limited.", "retry_after": 0.5, "global": False},
+        )
+        fake_discord.respond(HTTPStatus.OK, {"nick": "bees"})
+
+        assert self._run(fake_discord, lambda client: client.get_guild_member_by_id(1, 2)) == {"nick": "bees"}
+        assert len(self.sleeps) == 1
+
+    def test_concurrent_requests_reserve_from_bucket(self, fake_discord: FakeDiscord) -> None:
+        rate_limit = {"X-RateLimit-Bucket": "abc", "X-RateLimit-Limit": "2", "X-RateLimit-Reset-After": "1"}
+        fake_discord.respond(HTTPStatus.OK, {"nick": "bees"}, {**rate_limit, "X-RateLimit-Remaining": "1"})
+        for _ in range(3):
+            fake_discord.respond(HTTPStatus.OK, {"nick": "wasps"})
+
+        async def get_members(client: AsyncDiscordClient) -> dict[int, dict[str, Any] | None]:
+            await client.get_guild_member_by_id(1, 2)
+            return await client.get_guild_members_by_ids(1, [3, 4, 5])
+
+        self._run(fake_discord, get_members)
+
+        # Only one request was left in the bucket, so the other two wait for it to reset.
+        assert len(self.sleeps) == 2
+        assert len(fake_discord.requests) == 4
+
+    def test_concurrent_requests_wait_for_later_windows(self, fake_discord: FakeDiscord) -> None:
+        rate_limit = {"X-RateLimit-Bucket": "abc", "X-RateLimit-Limit": "2", "X-RateLimit-Reset-After": "1"}
+        fake_discord.respond(HTTPStatus.OK, {"nick": "bees"}, {**rate_limit, "X-RateLimit-Remaining": "0"})
+        for _ in range(5):
+            fake_discord.respond(HTTPStatus.OK, {"nick": "wasps"})
+
+        async def get_members(client: AsyncDiscordClient) -> dict[int, dict[str, Any] | None]:
+            await client.get_guild_member_by_id(1, 2)
+            return await client.get_guild_members_by_ids(1, [3, 4, 5, 6, 7])
+
+        self._run(fake_discord, get_members)
+
+        # Two requests fit in each window, so the waits are spread over the next three resets.
+        assert sorted(self.sleeps) == pytest.approx([1, 1, 2, 2, 3], abs=0.1)
+        assert len(fake_discord.requests) == 6
+
+    def test_shares_rate_limits_with_sync_client(self, fake_discord: FakeDiscord) -> None:
+        sync_client = DiscordClient("bees", base_url=fake_discord.url)
+        fake_discord.respond(
+            HTTPStatus.OK,
+            {"nick": "bees"},
+            {"X-RateLimit-Bucket": "abc", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "1"},
+        )
+        fake_discord.respond(HTTPStatus.OK, {"nick": "wasps"})
+        sync_client.get_guild_member_by_id(1, 2)
+
+        members = self._run(
+            fake_discord, lambda client: client.get_guild_members_by_ids(1, [2, 3]), shared_with=sync_client
+        )
+
+        # The first member was cached by the sync client, and the bucket it used up is waited for.
+        assert members == {2: {"nick": "bees"}, 3: {"nick": "wasps"}}
+        assert len(fake_discord.requests) == 2
+        assert len(self.sleeps) == 1
+        assert 0 < self.sleeps[0] <= 1
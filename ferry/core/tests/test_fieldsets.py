@@ -0,0 +1,29 @@
+import pytest
+from django.http import QueryDict
+
+from ferry.core.api.fieldsets import FieldSelection
+
+
+class TestFieldSelection:
+    @pytest.mark.parametrize(
+        ("query_string", "expected"),
+        [
+            pytest.param("", FieldSelection(), id="nothing"),
+            pytest.param("fields=id,discord_id", FieldSelection(fields=frozenset({"id", "discord_id"})), id="fields"),
+            pytest.param("fields=id&fields=+quote,", FieldSelection(fields=frozenset({"id", "quote"})), id="repeated"),
+            pytest.param("expand=", FieldSelection(expand=frozenset()), id="expand-nothing"),
+            pytest.param("expand=suspect", FieldSelection(expand=frozenset({"suspect"})), id="expand"),
+        ],
+    )
+    def test_from_query_params(self, query_string: str, expected: FieldSelection) -> None:
+        assert FieldSelection.from_query_params(QueryDict(query_string)) == expected
+
+    def test_includes(self) -> None:
+        assert FieldSelection().includes("current_score")
+        assert FieldSelection(fields=frozenset({"id", "ferry_sequence"})).includes("current_score", "ferry_sequence")
+        assert not FieldSelection(fields=frozenset({"id"})).includes("current_score", "ferry_sequence")
+
+    def test_expands(self) -> None:
+        assert FieldSelection().expands("suspect")
+        assert FieldSelection(expand=frozenset({"suspect"})).expands("suspect")
+        assert not FieldSelection(expand=frozenset()).expands("suspect")
@@ -0,0 +1,97 @@
+from unittest.mock import Mock
+
+import pytest
+from django.core.cache import cache
+
+from ferry.accounts.factories import PersonFactory
+from ferry.core.invalidation import InvalidationBus, bump_cache_versions, get_invalidation_bus, get_shared_version_key
+from ferry.core.models import CacheVersion
+from ferry.pub.factories import PubEventRSVPFactory
+from ferry.pub.models import PubEventRSVPMethod
+from ferry.pub.repository import toggle_rsvp_for_pub_event
+
+
+class TestInvalidationBus:
+    def test_invalidate(self) -> None:
+        bus = InvalidationBus()
+        callback = Mock()
+        bus.subscribe("pub", callback)
+
+        bus.invalidate("pub", "court")
+
+        assert bus.get_generation("pub") == 1
+        assert bus.get_generation("court") == 1
+        assert bus.get_generation("people") == 0
+        callback.assert_called_once_with()
+
+    def test_failing_callback_does_not_stop_others(self) -> None:
+        bus = InvalidationBus()
+        callback = Mock()
+        bus.subscribe("pub", Mock(side_effect=ValueError))
+        bus.subscribe("pub", callback)
+
+        bus.invalidate("pub")
+
+        callback.assert_called_once_with()
+
+    @pytest.mark.django_db
+    def test_poll_sees_versions_bumped_by_other_processes(self) -> None:
+        bus = InvalidationBus()
+        bus.poll()
+        assert bus.get_generation("pub") == 0
+
+        CacheVersion.objects.create(namespace="pub")
+        bus.poll()
+        assert bus.get_generation("pub") == 1
+
+        bus.poll()
+        assert bus.get_generation("pub") == 1
+
+        CacheVersion.objects.filter(namespace="pub").delete()
+        CacheVersion.objects.create(namespace="pub")
+        bus.poll()
+        assert bus.get_generation("pub") == 2
+
+
+@pytest.mark.django_db
+class TestBumpCacheVersions:
+    def test_bump_is_applied_locally_now_and_on_commit(self, django_capture_on_commit_callbacks: Mock) -> None:
+        bus = get_invalidation_bus()
+        generation = bus.get_generation("pub")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            bump_cache_versions("pub")
+            assert bus.get_generation("pub") == generation + 1
+
+        assert bus.get_generation("pub") == generation + 2
+
+    def test_bump_changes_shared_version(self, django_capture_on_commit_callbacks: Mock) -> None:
+        key = get_shared_version_key("pub")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            bump_cache_versions("pub")
+            version = cache.get(key)
+            assert version is not None
+
+        assert cache.get(key) not in {None, version}
+
+    def test_bump_changes_version(self) -> None:
+        bump_cache_versions("pub")
+        version = CacheVersion.objects.get(namespace="pub").version
+
+        bump_cache_versions("pub")
+
+        assert CacheVersion.objects.get(namespace="pub").version != version
+
+    def test_model_changes_bump_their_namespace(self) -> None:
+        PersonFactory()
+
+        assert set(CacheVersion.objects.values_list("namespace", flat=True)) == {"people"}
+
+    def test_bulk_rsvp_toggle_bumps_pub(self) -> None:
+        rsvp = PubEventRSVPFactory(method=PubEventRSVPMethod.WEB)
+        CacheVersion.objects.all().delete()
+
+        toggle_rsvp_for_pub_event(rsvp.pub_event, rsvp.person)
+
+        assert CacheVersion.objects.filter(namespace="pub").exists()
@@ -0,0 +1,98 @@
+from http import HTTPStatus
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse_lazy
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from ferry.accounts.factories import PersonFactory
+from ferry.accounts.models import Person, User
+from ferry.conftest import APITest
+from ferry.core.api.pagination import CountMode, OptionalCountPagination, estimate_count
+
+
+@pytest.mark.django_db
+class TestOptionalCountPagination:
+    def _paginate(self, query_string: str, view: object = None) -> dict:
+        paginator = OptionalCountPagination()
+        request = Request(APIRequestFactory().get(f"/api/v2/people/?{query_string}"))
+        page = paginator.paginate_queryset(Person.objects.order_by("display_name"), request, view)
+        assert page is not None
+        return paginator.get_paginated_response([person.display_name for person in page]).data
+
+    @pytest.fixture(autouse=True)
+    def people(self) -> None:
+        for name in "abc":
+            PersonFactory(display_name=name)
+
+    def test_exact(self) -> None:
+        assert self._paginate("limit=2") == {
+            "count": 3,
+            "next": "http://testserver/api/v2/people/?limit=2&offset=2",
+            "previous": None,
+            "results": ["a", "b"],
+        }
+
+    @pytest.mark.parametrize(
+        ("query_string", "has_more", "results"),
+        [
+            pytest.param("limit=2", True, ["a", "b"], id="more"),
+            pytest.param("limit=3", False, ["a", "b", "c"], id="exactly-the-end"),
+            pytest.param("limit=2&offset=2", False, ["c"], id="last-page"),
+        ],
+    )
+    def test_none(self, query_string: str, has_more: bool, results: list[str]) -> None:  # noqa: FBT001
+        with CaptureQueriesContext(connection) as queries:
+            data = self._paginate(f"{query_string}&count=none")
+
+        assert len(queries.captured_queries) == 1
+        assert "count" not in data
+        assert data["has_more"] is has_more
+        assert (data["next"] is not None) is has_more
+        assert data["results"] == results
+
+    def test_mode_from_view(self) -> None:
+        data = self._paginate("limit=2", SimpleNamespace(pagination_count_mode=CountMode.NONE))
+
+        assert data["has_more"] is True
+        assert "count" not in data
+
+    def test_estimated_without_postgres(self) -> None:
+        assert estimate_count(Person.objects.all()) is None
+
+        data = self._paginate("limit=2&count=estimated")
+
+        assert data["count"] == 3
+        assert data["count_is_estimated"] is False
+        assert data["has_more"] is True
+
+    @pytest.mark.parametrize(("estimate", "count", "is_estimated"), [(5000, 5000, True), (10, 3, False)])
+    def test_estimated(self, estimate: int, count: int, is_estimated: bool) -> None:  # noqa: FBT001
+        with patch("ferry.core.api.pagination.estimate_count", return_value=estimate):
+            data = self._paginate("limit=2&count=estimated")
+
+        assert data["count"] == count
+        assert data["count_is_estimated"] is is_estimated
+
+
+@pytest.mark.django_db
+class TestPeopleListCount(APITest):
+    url = reverse_lazy("api-2.0.0:people-list")
+
+    def test_get_without_count(self, client: Client, admin_user: User) -> None:
+        headers = self.get_headers(admin_user)
+        PersonFactory.create_batch(size=3)
+
+        with CaptureQueriesContext(connection) as queries:
+            resp = client.get(self.url, {"count": "none", "limit": 2}, headers=headers)
+
+        assert resp.status_code == HTTPStatus.OK
+        data = resp.json()
+        assert data["has_more"] is True
+        assert len(data["results"]) == 2
+        assert not any("COUNT(*)" in query["sql"] for query in queries.captured_queries)
@@ -0,0 +1,101 @@
+import datetime
+import uuid
+from decimal import Decimal
+from http import HTTPStatus
+from io import StringIO
+from typing import Any
+
+import msgpack
+import pytest
+from django.core.management import call_command
+from django.test import Client
+from django.urls import reverse_lazy
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+from ferry.accounts.factories import PersonFactory
+from ferry.accounts.models import User
+from ferry.conftest import APITest
+from ferry.core.api.renderers import FastJSONRenderer, MessagePackRenderer
+
+
+class TestFastJSONRenderer:
+    @pytest.mark.parametrize(
+        "data",
+        [
+            pytest.param({"id": uuid.UUID(int=1), "nested": [{"id": uuid.UUID(int=2)}]}, id="uuid"),
+            pytest.param({"score": Decimal("1.25"), "count": 3, "ok": True, "none": None}, id="decimal"),
+            pytest.param(
+                {
+                    "at": datetime.datetime(2025, 1, 1, 12, 30, 15, 123456, tzinfo=datetime.UTC),
+                    "on": datetime.date(2025, 1, 1),
+                },
+                id="datetime",
+            ),
+            pytest.param({"detail": gettext_lazy("Not found.")}, id="lazy-string"),
+            pytest.param({"text": "\u00fcn\u00efcode \u2028 and \u2029"}, id="line-terminators"),
+            pytest.param({1: "int keys", "items": (1, 2)}, id="int-keys-and-tuples"),
+            pytest.param([], id="empty-list"),
+        ],
+    )
+    def test_matches_json_renderer(self, data: Any) -> None:
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_none(self) -> None:
+        assert FastJSONRenderer().render(None) == b""
+
+    def test_indent(self) -> None:
+        data = {"id": uuid.UUID(int=1)}
+
+        content = FastJSONRenderer().render(data, "application/json; indent=4")
+
+        assert content == JSONRenderer().render(data, "application/json; indent=4")
+        assert b"\n    " in content
+
+
+class TestMessagePackRenderer:
+    def test_render(self) -> None:
+        data = {"id": uuid.UUID(int=1), "score": Decimal("1.25"), "results": [1, "two", None]}
+
+        content = MessagePackRenderer().render(data)
+
+        assert msgpack.unpackb(content) == {"id": str(uuid.UUID(int=1)), "score": 1.25, "results": [1, "two", None]}
+
+    def test_none(self) -> None:
+        assert MessagePackRenderer().render(None) == b""
+
+
+@pytest.mark.django_db
+class TestRendererNegotiation(APITest):
+    url = reverse_lazy("api-2.0.0:people-list")
+
+    def test_json_by_default(self, client: Client, admin_user: User) -> None:
+        person = PersonFactory()
+
+        resp = client.get(self.url, headers=self.get_headers(admin_user))
+
+        assert resp.status_code == HTTPStatus.OK
+        assert resp.headers["Content-Type"] == "application/json"
+        assert str(person.id) in {item["id"] for item in resp.json()["results"]}
+
+    def test_msgpack(self, client: Client, admin_user: User) -> None:
+        headers = self.get_headers(admin_user)
+        PersonFactory()
+
+        resp = client.get(self.url, headers={**headers, "Accept": "application/msgpack"})
+
+        assert resp.status_code == HTTPStatus.OK
+        assert resp.headers["Content-Type"] == "application/msgpack"
+        assert msgpack.unpackb(resp.content) == client.get(self.url, headers=headers).json()
+
+
+def test_benchmark_renderers() -> None:
+    stdout = StringIO()
+
+    call_command("benchmark_renderers", "--rows=5", "--number=1", stdout=stdout)
+
+    assert [line.split()[0] for line in stdout.getvalue().splitlines()] == [
+        "JSONRenderer",
+        "FastJSONRenderer",
+        "MessagePackRenderer",
+    ]
@@ -0,0 +1,64 @@
+import json
+from collections.abc import Iterator
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.test import Client
+from django.urls import reverse_lazy
+
+from ferry.core.api.schema import get_api_schema
+
+
+@pytest.fixture(autouse=True)
+def clear_api_schema() -> Iterator[None]:
+    get_api_schema.cache_clear()
+    yield
+    get_api_schema.cache_clear()
+
+
+class TestAPISchema:
+    def test_built_schema_is_reused(self) -> None:
+        call_command("build_api_schema", stdout=StringIO())
+
+        with patch("ferry.core.api.schema.build_api_schema") as build:
+            assert get_api_schema()["json"].content.startswith(b"{")
+
+        build.assert_not_called()
+
+    def test_schema_is_built_if_missing(self) -> None:
+        schema = get_api_schema()
+
+        assert json.loads(schema["json"].content)["info"]["title"] == "Ferry API"
+        assert schema["yaml"].content.startswith(b"openapi:")
+
+
+@pytest.mark.django_db
+class TestAPISchemaView:
+    url = reverse_lazy("api-v2-schema")
+
+    def test_get_yaml(self, client: Client) -> None:
+        resp = client.get(self.url)
+
+        assert resp.status_code == 200
+        assert resp.headers["Content-Type"] == "application/vnd.oai.openapi; charset=utf-8"
+        assert resp.headers["ETag"] == get_api_schema()["yaml"].etag
+        assert resp.headers["Cache-Control"] == "no-cache"
+        assert resp.content == get_api_schema()["yaml"].content
+
+    def test_get_json(self, client: Client) -> None:
+        resp = client.get(self.url, {"format": "json"})
+
+        assert resp.status_code == 200
+        assert resp.headers["Content-Type"] == "application/vnd.oai.openapi+json"
+        assert resp.headers["ETag"] == get_api_schema()["json"].etag
+        assert "/api/v2/people/" in resp.json()["paths"]
+
+    def test_not_modified(self, client: Client) -> None:
+        resp = client.get(self.url)
+
+        resp = client.get(self.url, headers={"If-None-Match": resp.headers["ETag"]})
+
+        assert resp.status_code == 304
+        assert resp.content == b""
@@ -0,0 +1,40 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from ferry.core.startup import ImportTime, StartupProfile, parse_import_times
+
+IMPORT_TIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       264 |        264 |   _io
+import time:       120 |        120 |     django.utils.version
+import time:       500 |        620 |   django
+some other output
+"""
+
+
+def test_parse_import_times() -> None:
+    assert parse_import_times(IMPORT_TIME_OUTPUT) == [
+        ImportTime("_io", 264, 264),
+        ImportTime("django.utils.version", 120, 120),
+        ImportTime("django", 500, 620),
+    ]
+
+
+def test_get_package_times() -> None:
+    profile = StartupProfile(0.1, 0.1, parse_import_times(IMPORT_TIME_OUTPUT))
+
+    assert profile.get_package_times() == {"_io": 264, "django": 620}
+
+
+def test_startup_profile() -> None:
+    stdout = StringIO()
+
+    call_command("startup_profile", limit=500, stdout=stdout)
+
+    output = stdout.getvalue()
+    assert "Django setup:" in output
+    assert "  django.urls\n" in output
+    # These are only loaded once they are needed.
+    assert "authlib" not in output
+    assert "httpx" not in output
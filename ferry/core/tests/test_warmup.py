@@ -0,0 +1,78 @@
+import threading
+from collections.abc import Iterator
+from unittest.mock import Mock, patch
+
+import pytest
+from django.test import Client
+from django.urls import reverse_lazy
+
+from ferry.core import warmup
+from ferry.core.cache import get_cache
+from ferry.core.warmup import is_warmed_up, start_warm_up, warm_up
+from ferry.dashboard.repository import get_scoreboard
+
+
+@pytest.fixture(autouse=True)
+def not_warmed_up() -> Iterator[None]:
+    warmup._warmed_up.clear()
+    yield
+    warmup._warmed_up.clear()
+
+
+@pytest.mark.django_db
+class TestWarmUp:
+    def test_warm_up(self) -> None:
+        warm_up()
+
+        assert is_warmed_up()
+        get_scoreboard()
+        assert get_cache().get_stats().local_hits == 1
+
+    def test_failing_step_does_not_stop_others(self) -> None:
+        step = Mock()
+        with patch.object(warmup, "WARM_UP_STEPS", [("broken", Mock(side_effect=ValueError)), ("working", step)]):
+            warm_up()
+
+        step.assert_called_once_with()
+        assert is_warmed_up()
+
+    def test_start_warm_up_in_background(self) -> None:
+        started = threading.Event()
+        finish = threading.Event()
+
+        def slow_step() -> None:
+            started.set()
+            finish.wait(timeout=5)
+
+        start_warm_up.cache_clear()
+        with patch.object(warmup, "WARM_UP_STEPS", [("slow", slow_step)]):
+            thread = start_warm_up()
+            assert start_warm_up() is thread
+            assert started.wait(timeout=5)
+            assert not is_warmed_up()
+
+            finish.set()
+            thread.join(timeout=5)
+
+        assert is_warmed_up()
+        start_warm_up.cache_clear()
+
+
+@pytest.mark.django_db
+class TestReadyView:
+    url = reverse_lazy("health-ready")
+
+    def test_warming_up(self, client: Client) -> None:
+        resp = client.get(self.url)
+
+        assert resp.status_code == 503
+        assert resp.json() == {"status": "warming_up"}
+
+    def test_ready(self, client: Client) -> None:
+        with patch.object(warmup, "WARM_UP_STEPS", []):
+            warm_up()
+
+        resp = client.get(self.url)
+
+        assert resp.status_code == 200
+        assert resp.json() == {"status": "ready"}
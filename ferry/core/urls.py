@@ -20,9 +20,11 @@ from django.contrib import admin
 from django.contrib.staticfiles.urls import staticfiles_urlpatterns
 from django.urls import include, path
 from django.views.generic import TemplateView
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+from drf_spectacular.views import SpectacularSwaggerView
 
 from ferry.core.api.router import urls as api_urls
+from ferry.core.api.schema import CachedSpectacularAPIView
+from ferry.core.views import ready
 
 urlpatterns = []
 
@@ -32,9 +34,10 @@ urlpatterns = [
     path("ferries/", include("ferry.court.urls", namespace="court")),
     path("pub/", include("ferry.pub.urls", namespace="pub")),
     path("admin/", admin.site.urls),
+    path("health/ready/", ready, name="health-ready"),
     path("api/", TemplateView.as_view(template_name="api_index.html")),
     # API v2
-    path("api/v2/schema/", SpectacularAPIView.as_view(), name="api-v2-schema"),
+    path("api/v2/schema/", CachedSpectacularAPIView.as_view(), name="api-v2-schema"),
     path("api/v2/docs/", SpectacularSwaggerView.as_view(url_name="api-v2-schema"), name="api-v2-docs"),
     path("api/v2/", include((api_urls, "api-2.0.0"), namespace="api")),
 ]
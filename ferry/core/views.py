@@ -0,0 +1,10 @@
+from django.http import HttpRequest, JsonResponse
+
+from ferry.core.warmup import is_warmed_up
+
+
+def ready(request: HttpRequest) -> JsonResponse:
+    """Whether this worker has warmed up and is ready to serve requests."""
+    if not is_warmed_up():
+        return JsonResponse({"status": "warming_up"}, status=503)
+    return JsonResponse({"status": "ready"})
@@ -0,0 +1,98 @@
+"""
+Warming up a worker before it serves requests.
+
+Without this, the first requests to each new worker would pay to resolve the URL patterns,
+compile templates, build serializer fields and fill the caches. ``start_warm_up`` does that
+work in the background as the worker starts, so that the worker can answer health checks
+straight away, and the worker only reports itself as ready once it has finished.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable
+from functools import lru_cache
+from pathlib import Path
+from time import monotonic
+
+from django.conf import settings
+from django.db import connections
+from django.template.loader import get_template
+from django.urls import get_resolver
+
+logger = logging.getLogger(__name__)
+
+_warmed_up = threading.Event()
+
+
+def is_warmed_up() -> bool:
+    return _warmed_up.is_set()
+
+
+def _load_urls() -> None:
+    # Building the reverse lookup imports every view and populates the resolver.
+    _ = get_resolver().reverse_dict
+
+
+def _compile_templates() -> None:
+    template_dir = Path(settings.BASE_DIR) / "templates"
+    for path in sorted(template_dir.rglob("*.html")):
+        get_template(path.relative_to(template_dir).as_posix())
+
+
+def _build_serializers() -> None:
+    from ferry.core.api.router import router
+
+    for _, viewset, _ in router.registry:
+        if serializer_class := getattr(viewset, "serializer_class", None):
+            _ = serializer_class().fields
+
+
+def _fill_caches() -> None:
+    from ferry.core.api.schema import get_api_schema
+    from ferry.dashboard.repository import get_scoreboard
+    from ferry.pub.repository import get_attendee_count_for_pub_event, get_next_pub_event
+
+    get_api_schema()
+    get_scoreboard()
+    if next_pub_event := get_next_pub_event():
+        get_attendee_count_for_pub_event(next_pub_event)
+
+
+WARM_UP_STEPS: list[tuple[str, Callable[[], None]]] = [
+    ("URLs", _load_urls),
+    ("templates", _compile_templates),
+    ("serializers", _build_serializers),
+    ("caches", _fill_caches),
+]
+
+
+def warm_up() -> None:
+    """
+    Do the work that would otherwise slow down the first requests to a new worker.
+
+    A step that fails is logged and skipped, as the worker can still serve requests without it.
+    """
+    started_at = monotonic()
+    for name, step in WARM_UP_STEPS:
+        step_started_at = monotonic()
+        try:
+            step()
+        except Exception:  # noqa: BLE001
+            logger.exception("Failed to warm up %s", name)
+        else:
+            logger.debug("Warmed up %s in %.3fs", name, monotonic() - step_started_at)
+
+    # Requests are served from other threads, which open their own connections.
+    connections.close_all()
+    _warmed_up.set()
+    logger.info("Warmed up in %.3fs", monotonic() - started_at)
+
+
+@lru_cache
+def start_warm_up() -> threading.Thread:
+    """Warm up in a background thread, unless that has already been started."""
+    thread = threading.Thread(target=warm_up, name="ferry-warm-up", daemon=True)
+    thread.start()
+    return thread
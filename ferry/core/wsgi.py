@@ -14,3 +14,11 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "ferry.core.settings.prod")
 
 application = get_wsgi_application()
+
+from ferry.core.invalidation import get_invalidation_bus  # noqa: E402
+from ferry.core.warmup import start_warm_up  # noqa: E402
+
+# Each worker process needs to hear about changes made by the others.
+get_invalidation_bus().start()
+# Requests can be served whilst warming up, but /health/ready/ reports 503 until it has finished.
+start_warm_up()
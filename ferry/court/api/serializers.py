@@ -5,6 +5,8 @@ from rest_framework import exceptions, serializers
 
 from ferry.accounts.api.serializers import PersonLinkSerializer
 from ferry.accounts.models import Person
+from ferry.core.api.fieldsets import SparseFieldsetSerializerMixin
+from ferry.core.api.lookup import LookupSerializer, lookup_keys_field
 from ferry.court.models import Accusation, Consequence, Ratification
 
 
@@ -38,9 +40,12 @@ class ConsequenceSerializer(serializers.ModelSerializer[Consequence]):
         return value
 
 
-class ConsequenceReadSerializer(ConsequenceSerializer):
+class ConsequenceReadSerializer(SparseFieldsetSerializerMixin, ConsequenceSerializer):
     created_by = PersonLinkSerializer(read_only=True)
 
+    class Meta(ConsequenceSerializer.Meta):
+        expandable_fields = ("created_by",)
+
 
 class ConsequenceLinkSerializer(serializers.ModelSerializer[Consequence]):
     class Meta:
@@ -120,10 +125,15 @@ class AccusationCreateSerializer(serializers.ModelSerializer[Accusation]):
         return super().validate(data)
 
 
-class AccusationSerializer(AccusationCreateSerializer):
+class AccusationSerializer(SparseFieldsetSerializerMixin, AccusationCreateSerializer):
     suspect = PersonLinkSerializer(read_only=True)
     ratification = RatificationSerializer(read_only=True)
     created_by = PersonLinkSerializer(read_only=True)
 
     class Meta(AccusationCreateSerializer.Meta):
         fields = AccusationCreateSerializer.Meta.fields + ("ratification",)
+        expandable_fields = ("suspect", "created_by", "ratification")
+
+
+class AccusationLookupSerializer(LookupSerializer):
+    ids = lookup_keys_field(serializers.UUIDField())
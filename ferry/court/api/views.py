@@ -8,6 +8,9 @@ from rest_framework.decorators import action
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from ferry.core.api.compiled import CompiledListModelMixin, compile_serializer
+from ferry.core.api.fieldsets import FIELD_SELECTION_PARAMETERS, SparseFieldsetMixin
+from ferry.core.api.lookup import get_lookup_results, lookup_response_schema
 from ferry.court.models import (
     Accusation,
     AccusationQuerySet,
@@ -18,6 +21,7 @@ from ferry.court.models import (
 
 from .serializers import (
     AccusationCreateSerializer,
+    AccusationLookupSerializer,
     AccusationSerializer,
     ConsequenceReadSerializer,
     ConsequenceSerializer,
@@ -53,14 +57,14 @@ class ConsequenceObjectPermission(permissions.BasePermission):
 
 
 @extend_schema_view(
-    list=extend_schema(tags=["Ferry - Consequences"]),
-    retrieve=extend_schema(tags=["Ferry - Consequences"]),
+    list=extend_schema(tags=["Ferry - Consequences"], parameters=FIELD_SELECTION_PARAMETERS),
+    retrieve=extend_schema(tags=["Ferry - Consequences"], parameters=FIELD_SELECTION_PARAMETERS),
     update=extend_schema(tags=["Ferry - Consequences"]),
     partial_update=extend_schema(tags=["Ferry - Consequences"]),
     create=extend_schema(tags=["Ferry - Consequences"]),
     destroy=extend_schema(tags=["Ferry - Consequences"]),
 )
-class ConsequenceViewset(viewsets.ModelViewSet):
+class ConsequenceViewset(CompiledListModelMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     filter_backends = [filters.OrderingFilter, DjangoFilterBackend]
     permission_classes = [permissions.IsAuthenticated, ConsequenceObjectPermission]
     ordering_fields = ("created_at", "updated_at")
@@ -132,14 +136,14 @@ class RatificationObjectPermission(permissions.BasePermission):
 
 
 @extend_schema_view(
-    list=extend_schema(tags=["Ferry - Accusations"]),
-    retrieve=extend_schema(tags=["Ferry - Accusations"]),
+    list=extend_schema(tags=["Ferry - Accusations"], parameters=FIELD_SELECTION_PARAMETERS),
+    retrieve=extend_schema(tags=["Ferry - Accusations"], parameters=FIELD_SELECTION_PARAMETERS),
     update=extend_schema(tags=["Ferry - Accusations"]),
     partial_update=extend_schema(tags=["Ferry - Accusations"]),
     create=extend_schema(tags=["Ferry - Accusations"]),
     destroy=extend_schema(tags=["Ferry - Accusations"]),
 )
-class AccusationViewset(viewsets.ModelViewSet):
+class AccusationViewset(CompiledListModelMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     filter_backends = [filters.OrderingFilter, DjangoFilterBackend]
     permission_classes = [permissions.IsAuthenticated, AccusationObjectPermission]
     ordering_fields = ("created_at", "updated_at")
@@ -157,6 +161,24 @@ class AccusationViewset(viewsets.ModelViewSet):
         response_serializer = AccusationSerializer(accusation)
         return Response(response_serializer.data, status=HTTPStatus.CREATED)
 
+    @extend_schema(
+        tags=["Ferry - Accusations"],
+        parameters=FIELD_SELECTION_PARAMETERS,
+        request=AccusationLookupSerializer,
+        responses={200: lookup_response_schema("Accusation")},
+        description="Look up many accusations at once by their IDs.",
+    )
+    @action(detail=False, methods=["POST"], permission_classes=[permissions.IsAuthenticated])
+    def lookup(self, request: Request) -> Response:
+        serializer = AccusationLookupSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        _, keys = serializer.lookup
+
+        compiled = compile_serializer(AccusationSerializer, self.get_field_selection())
+        rows = compiled.get_rows(self.get_queryset().filter(id__in=keys), "id")
+        found = {row["id"]: row for row in rows}
+        return Response(get_lookup_results(keys, found, compiled.build_many))
+
     @extend_schema(tags=["Ferry - Ratifications"])
     @action(
         detail=True, methods=["GET"], permission_classes=[permissions.IsAuthenticated, RatificationObjectPermission]
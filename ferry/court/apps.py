@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class CourtConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "ferry.court"
+
+    def ready(self) -> None:
+        from ferry.core.invalidation import invalidate_on_change
+        from ferry.court import signals  # noqa: F401
+        from ferry.court.models import Accusation, Consequence, Ratification
+
+        invalidate_on_change("court", Accusation, Ratification, Consequence)
@@ -9,6 +9,8 @@ from django.db import models
 from django.db.models import Case, F, Value, When
 from django.utils import timezone
 
+from ferry.core.models import AtomicSaveModel
+
 if TYPE_CHECKING:
     from ferry.accounts.models import User
 
@@ -29,7 +31,7 @@ class ConsequenceQuerySet(models.QuerySet):
 ConsequenceManager = models.Manager.from_queryset(ConsequenceQuerySet)
 
 
-class Consequence(models.Model):
+class Consequence(AtomicSaveModel):
     id = models.UUIDField(verbose_name="ID", primary_key=True, default=uuid.uuid4, editable=False)
     content = models.CharField(max_length=255, unique=True)
     is_enabled = models.BooleanField(default=True)
@@ -55,7 +57,7 @@ class AccusationQuerySet(models.QuerySet):
 AccusationManager = models.Manager.from_queryset(AccusationQuerySet)
 
 
-class Accusation(models.Model):
+class Accusation(AtomicSaveModel):
     id = models.UUIDField(verbose_name="ID", primary_key=True, default=uuid.uuid4, editable=False)
     quote = models.TextField(
         help_text="A quote to use as evidence of the alleged crime", max_length=500, blank=False, null=False
@@ -114,7 +116,7 @@ class RatificationQuerySet(models.QuerySet):
 RatificationManager = models.Manager.from_queryset(RatificationQuerySet)
 
 
-class Ratification(models.Model):
+class Ratification(AtomicSaveModel):
     id = models.UUIDField(verbose_name="ID", primary_key=True, default=uuid.uuid4, editable=False)
     accusation = models.OneToOneField(Accusation, on_delete=models.CASCADE, related_name="ratification")
     consequence = models.ForeignKey(Consequence, on_delete=models.PROTECT, related_name="ratifications")
@@ -0,0 +1,26 @@
+from typing import Any
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from ferry.activity.models import ActivityType
+from ferry.activity.repository import publish_activity
+from ferry.court.api.serializers import AccusationSerializer, RatificationSerializer
+from ferry.court.models import Accusation, Ratification
+
+
+@receiver(post_save, sender=Accusation)
+def publish_accusation_created(sender: type[Accusation], instance: Accusation, *, created: bool, **kwargs: Any) -> None:
+    if created:
+        publish_activity(ActivityType.ACCUSATION_CREATED, AccusationSerializer(instance).data)
+
+
+@receiver(post_save, sender=Ratification)
+def publish_ratification_created(
+    sender: type[Ratification], instance: Ratification, *, created: bool, **kwargs: Any
+) -> None:
+    if created:
+        publish_activity(
+            ActivityType.RATIFICATION_CREATED,
+            {"accusation": instance.accusation_id, **RatificationSerializer(instance).data},
+        )
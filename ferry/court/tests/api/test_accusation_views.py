@@ -3,7 +3,9 @@ from typing import Any
 from uuid import UUID
 
 import pytest
+from django.db import connection
 from django.test import Client
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse_lazy
 
 from ferry.accounts.factories import PersonFactory
@@ -44,6 +46,84 @@ class TestAccusationListEndpoint(APITest):
         actual_results = [item["id"] for item in data["results"]]
         assert sorted(actual_results) == sorted(expected_ids)
 
+    def test_get_expand(self, client: Client, admin_user: User) -> None:
+        # Arrange
+        headers = self.get_headers(admin_user)
+        ratified = AccusationFactory()
+        unratified = AccusationFactory(ratification=None)
+
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            resp = client.get(self.url, {"expand": "suspect", "ordering": "created_at"}, headers=headers)
+
+        # Assert
+        assert resp.status_code == HTTPStatus.OK
+        results = resp.json()["results"]
+        assert [item["ratification"] for item in results] == [str(ratified.ratification.id), None]
+        assert [item["created_by"] for item in results] == [str(ratified.created_by.id), str(unratified.created_by.id)]
+        assert results[0]["suspect"] == {"id": str(ratified.suspect.id), "display_name": ratified.suspect.display_name}
+        assert not any("court_consequence" in query["sql"] for query in queries.captured_queries)
+
+    def test_get_fields(self, client: Client, admin_user: User) -> None:
+        # Arrange
+        headers = self.get_headers(admin_user)
+        accusation = AccusationFactory()
+
+        # Act
+        resp = client.get(self.url, {"fields": "id,quote"}, headers=headers)
+
+        # Assert
+        assert resp.status_code == HTTPStatus.OK
+        assert resp.json()["results"] == [{"id": str(accusation.id), "quote": accusation.quote}]
+
+
+@pytest.mark.django_db
+class TestAccusationLookupEndpoint(APITest):
+    url = reverse_lazy("api-2.0.0:accusations-lookup")
+
+    def test_post_unauthenticated(self, client: Client) -> None:
+        resp = client.post(self.url, {"ids": []}, content_type="application/json")
+        assert resp.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_post_bad_payload(self, client: Client, user_with_person: User) -> None:
+        resp = client.post(
+            self.url, {"ids": ["bees"]}, content_type="application/json", headers=self.get_headers(user_with_person)
+        )
+        assert resp.status_code == HTTPStatus.BAD_REQUEST
+        assert resp.json() == {"ids": {"0": ["Must be a valid UUID."]}}
+
+    def test_post(self, client: Client, user_with_person: User) -> None:
+        # Arrange
+        headers = self.get_headers(user_with_person)
+        accusation = AccusationFactory()
+        missing_id = str(UUID(int=0))
+
+        # Act
+        resp = client.post(
+            self.url, {"ids": [missing_id, str(accusation.id)]}, content_type="application/json", headers=headers
+        )
+
+        # Assert
+        assert resp.status_code == HTTPStatus.OK
+        detail = client.get(reverse_lazy("api-2.0.0:accusations-detail", args=[accusation.id]), headers=headers)
+        assert resp.json() == {missing_id: None, str(accusation.id): detail.json()}
+
+    def test_post_fields(self, client: Client, user_with_person: User) -> None:
+        # Arrange
+        accusation = AccusationFactory()
+
+        # Act
+        resp = client.post(
+            f"{self.url}?fields=quote",
+            {"ids": [str(accusation.id)]},
+            content_type="application/json",
+            headers=self.get_headers(user_with_person),
+        )
+
+        # Assert
+        assert resp.status_code == HTTPStatus.OK
+        assert resp.json() == {str(accusation.id): {"quote": accusation.quote}}
+
 
 @pytest.mark.django_db
 class TestAccusationCreateEndpoint(APITest):
@@ -341,6 +421,25 @@ class TestAccusationDetailEndpoint(APITest):
             "display_name": accusation.ratification.created_by.display_name,
         }
 
+    def test_get_fields_and_expand(self, client: Client, admin_user: User) -> None:
+        # Arrange
+        accusation = AccusationFactory()
+
+        # Act
+        resp = client.get(
+            self._get_url(accusation.id),
+            {"fields": "id,suspect,ratification", "expand": ""},
+            headers=self.get_headers(admin_user),
+        )
+
+        # Assert
+        assert resp.status_code == HTTPStatus.OK
+        assert resp.json() == {
+            "id": str(accusation.id),
+            "suspect": str(accusation.suspect.id),
+            "ratification": str(accusation.ratification.id),
+        }
+
 
 @pytest.mark.django_db
 class TestAccusationUpdateEndpoint(APITest):
@@ -0,0 +1,17 @@
+from django.db import models
+from django.db.models.functions import DenseRank
+
+from ferry.accounts.models import Person
+from ferry.core.cache import memoize
+
+
+@memoize(namespaces=["people", "court"])
+def get_scoreboard() -> list[Person]:
+    """Everyone who has been ferried, ranked by their current score."""
+    qs = Person.objects.with_current_score()
+    qs = qs.with_num_ratified_accusations()
+    qs = qs.annotate(rank=models.Window(expression=DenseRank(), order_by=models.F("current_score").desc()))
+    qs = qs.filter(models.Q(current_score__gt=0) | models.Q(num_ratified_accusations__gt=0))
+
+    qs = qs.order_by("rank", "-current_score", "-num_ratified_accusations")
+    return list(qs)
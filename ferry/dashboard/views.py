@@ -2,27 +2,21 @@ from typing import Any
 
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.db import models
-from django.db.models.functions import DenseRank
 from django.views.generic import ListView
 
-from ferry.accounts.models import Person, PersonQuerySet
+from ferry.accounts.models import Person
 from ferry.core.mixins import BreadcrumbsMixin
 from ferry.court.models import Accusation
+from ferry.dashboard.repository import get_scoreboard
 
 
 class ScoreboardView(LoginRequiredMixin, BreadcrumbsMixin, ListView):
     template_name = "dashboard/scoreboard.html"
 
-    def get_queryset(self) -> PersonQuerySet:
+    def get_queryset(self) -> list[Person]:  # type: ignore[override]
         assert self.request.user.is_authenticated
-        qs = Person.objects.for_user(self.request.user)
-        qs = qs.with_current_score()
-        qs = qs.with_num_ratified_accusations()
-        qs = qs.annotate(rank=models.Window(expression=DenseRank(), order_by=models.F("current_score").desc()))
-        qs = qs.filter(models.Q(current_score__gt=0) | models.Q(num_ratified_accusations__gt=0))
-
-        qs = qs.order_by("rank", "-current_score", "-num_ratified_accusations")
-        return qs
+        # All users can read all people, so everyone shares the same scoreboard.
+        return get_scoreboard()
 
 
 class RecentAccusationsView(LoginRequiredMixin, BreadcrumbsMixin, ListView):
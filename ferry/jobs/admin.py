@@ -0,0 +1,12 @@
+from django.contrib import admin
+
+from ferry.jobs.models import Job
+
+
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("task", "status", "priority", "attempts", "run_after", "created_at")
+    list_filter = ("status", "task")
+    readonly_fields = ("id", "claimed_at", "claimed_by", "last_error", "created_at", "updated_at")
+
+
+admin.site.register(Job, JobAdmin)
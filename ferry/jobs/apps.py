@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class JobsConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "ferry.jobs"
+
+    def ready(self) -> None:
+        # Register the tasks defined in each app's tasks module.
+        autodiscover_modules("tasks")
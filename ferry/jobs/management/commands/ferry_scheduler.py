@@ -0,0 +1,36 @@
+import os
+import socket
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from ferry.jobs.schedule import SCHEDULER_LEASE, release_lease, run_schedule
+
+
+class Command(BaseCommand):
+    help = "Queue jobs for periodic tasks when they are due."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=30,
+            help="The number of seconds between checking for due tasks.",
+        )
+        parser.add_argument("--once", action="store_true", help="Check for due tasks once and then stop.")
+
+    def handle(self, *args: Any, interval: float, once: bool, **options: Any) -> None:
+        holder = f"{socket.gethostname()}:{os.getpid()}"
+
+        try:
+            while True:
+                for task_name in run_schedule(holder=holder):
+                    self.stdout.write(f"Queued {task_name}.")
+                if once:
+                    break
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            release_lease(SCHEDULER_LEASE, holder=holder)
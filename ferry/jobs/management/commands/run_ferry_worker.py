@@ -0,0 +1,65 @@
+import os
+import socket
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from ferry.core.invalidation import get_invalidation_bus
+from ferry.jobs.queue import work
+from ferry.jobs.schedule import SCHEDULER_LEASE, release_lease, run_schedule
+
+SCHEDULE_INTERVAL = 30
+
+
+class Command(BaseCommand):
+    help = "Run background jobs from the job queue."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=20, help="The maximum number of jobs to claim at once.")
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1,
+            help="The number of seconds to wait before checking an empty queue again.",
+        )
+        parser.add_argument("--burst", action="store_true", help="Stop once the queue is empty.")
+        parser.add_argument(
+            "--scheduler",
+            action="store_true",
+            help="Also queue jobs for periodic tasks, if no other scheduler is running.",
+        )
+
+    def handle(
+        self,
+        *args: Any,
+        batch_size: int,
+        poll_interval: float,
+        burst: bool,
+        scheduler: bool,
+        **options: Any,
+    ) -> None:
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.stdout.write(f"Worker {worker_id} started.")
+        next_schedule_at = 0.0
+        if not burst:
+            get_invalidation_bus().start()
+
+        try:
+            while True:
+                if scheduler and time.monotonic() >= next_schedule_at:
+                    run_schedule(holder=worker_id)
+                    next_schedule_at = time.monotonic() + SCHEDULE_INTERVAL
+
+                if work(worker_id=worker_id, batch_size=batch_size):
+                    continue
+                if burst:
+                    break
+                time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if scheduler:
+                release_lease(SCHEDULER_LEASE, holder=worker_id)
+
+        self.stdout.write(f"Worker {worker_id} stopped.")
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:13
+
+import uuid
+
+import django.core.serializers.json
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="Job",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("task", models.CharField(max_length=255)),
+                ("payload", models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                (
+                    "priority",
+                    models.SmallIntegerField(default=0, help_text="Jobs with a higher priority are run first."),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("Q", "Queued"), ("R", "Running"), ("S", "Succeeded"), ("F", "Failed")],
+                        default="Q",
+                        max_length=1,
+                    ),
+                ),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                ("run_after", models.DateTimeField(default=django.utils.timezone.now)),
+                ("claimed_at", models.DateTimeField(blank=True, null=True)),
+                ("claimed_by", models.CharField(blank=True, max_length=255)),
+                ("last_error", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "ordering": ["-priority", "run_after"],
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("status", "Q")), fields=["-priority", "run_after"], name="job_queued_idx"
+                    )
+                ],
+            },
+        ),
+    ]
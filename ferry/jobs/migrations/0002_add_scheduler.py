@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("jobs", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Lease",
+            fields=[
+                ("name", models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ("holder", models.CharField(blank=True, max_length=255)),
+                ("expires_at", models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ScheduleState",
+            fields=[
+                ("task", models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ("last_run_at", models.DateTimeField()),
+            ],
+        ),
+    ]
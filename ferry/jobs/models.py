@@ -0,0 +1,60 @@
+import uuid
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+
+class JobStatus(models.TextChoices):
+    QUEUED = "Q", "Queued"
+    RUNNING = "R", "Running"
+    SUCCEEDED = "S", "Succeeded"
+    FAILED = "F", "Failed"
+
+
+class Job(models.Model):
+    id = models.UUIDField(verbose_name="ID", primary_key=True, default=uuid.uuid4, editable=False)
+    task = models.CharField(max_length=255)
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    priority = models.SmallIntegerField(default=0, help_text="Jobs with a higher priority are run first.")
+    status = models.CharField(max_length=1, choices=JobStatus, default=JobStatus.QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+    claimed_at = models.DateTimeField(blank=True, null=True)
+    claimed_by = models.CharField(max_length=255, blank=True)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True, editable=False)
+
+    class Meta:
+        ordering = ["-priority", "run_after"]
+        indexes = [
+            models.Index(
+                fields=["-priority", "run_after"],
+                condition=models.Q(status=JobStatus.QUEUED),
+                name="job_queued_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.task} ({self.get_status_display()})"
+
+
+class Lease(models.Model):
+    """A lock held by one process at a time, which expires if it is not renewed."""
+
+    name = models.CharField(max_length=100, primary_key=True)
+    holder = models.CharField(max_length=255, blank=True)
+    expires_at = models.DateTimeField()
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class ScheduleState(models.Model):
+    task = models.CharField(max_length=255, primary_key=True)
+    last_run_at = models.DateTimeField()
+
+    def __str__(self) -> str:
+        return self.task
@@ -0,0 +1,199 @@
+"""
+A job queue backed by the database, so that slow work can be moved out of requests without a broker.
+
+Tasks are registered with the ``@task`` decorator in an app's ``tasks`` module and are queued
+with ``enqueue``. Queueing a job inside a transaction means that it only becomes visible to the
+workers, which are run with ``manage.py run_ferry_worker``, once the transaction commits.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+from collections.abc import Callable
+from datetime import timedelta
+from typing import Any
+
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from ferry.jobs.models import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+RETRY_DELAY = timedelta(seconds=30)
+MAX_RETRY_DELAY = timedelta(hours=1)
+STALE_JOB_TIMEOUT = timedelta(minutes=10)
+
+
+class Task:
+    def __init__(self, func: Callable[..., None], *, name: str, max_attempts: int, batched: bool, atomic: bool) -> None:
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+        self.batched = batched
+        self.atomic = atomic
+
+    def __call__(self, *args: Any, **kwargs: Any) -> None:
+        self.func(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"<Task {self.name}>"
+
+    def enqueue(self, *, priority: int = 0, delay: timedelta | None = None, **payload: Any) -> Job:
+        return enqueue(self.name, priority=priority, delay=delay, **payload)
+
+    def run(self, jobs: list[Job]) -> None:
+        with transaction.atomic() if self.atomic else contextlib.nullcontext():
+            if self.batched:
+                self.func([job.payload for job in jobs])
+            else:
+                for job in jobs:
+                    self.func(**job.payload)
+
+
+TASKS: dict[str, Task] = {}
+
+
+def task(
+    *, name: str | None = None, max_attempts: int = 5, batched: bool = False, atomic: bool = True
+) -> Callable[[Callable[..., None]], Task]:
+    """
+    Register a function as a task that can be run by the workers.
+
+    The function is called with the payload of the job as keyword arguments. A batched task is
+    instead called once with a list of the payloads of all the jobs claimed together.
+
+    A task runs in a transaction, so that nothing it changes is kept if it fails. Tasks that wait
+    on the network, such as calls to Discord, should not be ``atomic``, so that they do not hold
+    a transaction and its locks open whilst waiting. They manage their own transactions instead.
+    """
+
+    def decorator(func: Callable[..., None]) -> Task:
+        task_name = name or f"{func.__module__}.{func.__qualname__}"
+        if task_name in TASKS:
+            raise ValueError(f"A task called {task_name} is already registered.")
+        TASKS[task_name] = Task(func, name=task_name, max_attempts=max_attempts, batched=batched, atomic=atomic)
+        return TASKS[task_name]
+
+    return decorator
+
+
+def enqueue(task_name: str, *, priority: int = 0, delay: timedelta | None = None, **payload: Any) -> Job:
+    return Job.objects.create(
+        task=task_name,
+        payload=payload,
+        priority=priority,
+        run_after=timezone.now() + (delay or timedelta()),
+    )
+
+
+def release_stale_jobs(*, timeout: timedelta = STALE_JOB_TIMEOUT) -> int:
+    """
+    Queue jobs again if the worker running them has not finished within the timeout, as it has probably died.
+
+    Jobs that have run out of attempts are failed instead, so that a job that kills its worker is not retried forever.
+
+    :returns: the number of jobs that were released.
+    """
+    stale_jobs = Job.objects.filter(status=JobStatus.RUNNING, claimed_at__lt=timezone.now() - timeout)
+    exhausted_ids = [
+        job_id
+        for job_id, task_name, attempts in stale_jobs.values_list("id", "task", "attempts")
+        if task_name in TASKS and attempts >= TASKS[task_name].max_attempts
+    ]
+    failed = stale_jobs.filter(id__in=exhausted_ids).update(
+        status=JobStatus.FAILED,
+        last_error="The worker running the job did not finish it.",
+    )
+    queued = stale_jobs.exclude(id__in=exhausted_ids).update(
+        status=JobStatus.QUEUED,
+        claimed_at=None,
+        claimed_by="",
+    )
+    return failed + queued
+
+
+def claim_jobs(*, worker_id: str, limit: int) -> list[Job]:
+    """Claim up to ``limit`` jobs that are ready to run, with the highest priority first."""
+    now = timezone.now()
+    ready = Job.objects.filter(status=JobStatus.QUEUED, run_after__lte=now).order_by("-priority", "run_after")
+    claim = {
+        "status": JobStatus.RUNNING,
+        "claimed_at": now,
+        "claimed_by": worker_id,
+        "attempts": models.F("attempts") + 1,
+    }
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            jobs = list(ready.select_for_update(skip_locked=True)[:limit])
+            Job.objects.filter(id__in=[job.id for job in jobs]).update(**claim)
+    else:
+        # Without row locks, claim each job with a conditional update so that only one worker can win it.
+        jobs = [job for job in ready[:limit] if Job.objects.filter(id=job.id, status=JobStatus.QUEUED).update(**claim)]
+
+    for job in jobs:
+        job.status = JobStatus.RUNNING
+        job.claimed_at = now
+        job.claimed_by = worker_id
+        job.attempts += 1
+    return jobs
+
+
+def _get_retry_delay(attempts: int) -> timedelta:
+    return min(RETRY_DELAY * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+
+
+def _finish_jobs(jobs: list[Job]) -> None:
+    Job.objects.filter(id__in=[job.id for job in jobs]).update(status=JobStatus.SUCCEEDED, last_error="")
+    for job in jobs:
+        job.status = JobStatus.SUCCEEDED
+
+
+def _fail_jobs(jobs: list[Job], *, max_attempts: int, error: str) -> None:
+    now = timezone.now()
+    for job in jobs:
+        job.last_error = error
+        if job.attempts < max_attempts:
+            job.status = JobStatus.QUEUED
+            job.run_after = now + _get_retry_delay(job.attempts)
+        else:
+            job.status = JobStatus.FAILED
+    Job.objects.bulk_update(jobs, ["status", "run_after", "last_error"])
+
+
+def run_jobs(jobs: list[Job]) -> None:
+    """Run claimed jobs, retrying those that fail until they run out of attempts."""
+    jobs_by_task: dict[str, list[Job]] = {}
+    for job in jobs:
+        jobs_by_task.setdefault(job.task, []).append(job)
+
+    for task_name, task_jobs in jobs_by_task.items():
+        try:
+            registered_task = TASKS[task_name]
+        except KeyError:
+            _fail_jobs(task_jobs, max_attempts=0, error=f"Unknown task: {task_name}")
+            continue
+
+        # A batched task runs all of its jobs at once, but other tasks are retried job by job.
+        for batch in [task_jobs] if registered_task.batched else [[job] for job in task_jobs]:
+            try:
+                registered_task.run(batch)
+            except Exception as e:  # noqa: BLE001
+                logger.exception("Job for task %s failed", task_name)
+                _fail_jobs(batch, max_attempts=registered_task.max_attempts, error=repr(e))
+            else:
+                _finish_jobs(batch)
+
+
+def work(*, worker_id: str, batch_size: int = 20) -> int:
+    """
+    Claim and run a batch of jobs.
+
+    :returns: the number of jobs that were run.
+    """
+    release_stale_jobs()
+    jobs = claim_jobs(worker_id=worker_id, limit=batch_size)
+    run_jobs(jobs)
+    return len(jobs)
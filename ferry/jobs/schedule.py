@@ -0,0 +1,151 @@
+"""
+A scheduler that queues jobs for tasks that need to run periodically.
+
+Tasks are scheduled with cron-like definitions using the ``@periodic`` decorator. The scheduler
+is run by ``manage.py ferry_scheduler``, or by a worker started with ``--scheduler``. Only the
+scheduler holding the leader lease in the database queues jobs, so running several replicas
+never queues the same job twice.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import date, datetime, time, timedelta
+
+from django.db import models
+from django.utils import timezone
+
+from ferry.jobs.models import Job, JobStatus, Lease, ScheduleState
+from ferry.jobs.queue import Task, enqueue
+
+SCHEDULER_LEASE = "scheduler"
+SCHEDULER_LEASE_DURATION = timedelta(minutes=2)
+
+
+class CronSchedule:
+    """
+    A schedule in the style of a crontab entry: minute, hour, day of month, month and day of week.
+
+    Each field can be ``*``, a number, a range such as ``1-5``, a step such as ``*/15``, or a
+    comma separated list of those. Days of the week run from 0 (Sunday) to 6. Times are in the
+    current time zone.
+    """
+
+    FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 6)]
+
+    def __init__(self, expression: str) -> None:
+        fields = expression.split()
+        if len(fields) != len(self.FIELD_RANGES):
+            raise ValueError(f"Expected 5 fields in cron expression: {expression!r}")
+
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            self._parse_field(field, *bounds) for field, bounds in zip(fields, self.FIELD_RANGES, strict=True)
+        )
+        # As with cron, if both days of the month and week are restricted, either can match.
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def __repr__(self) -> str:
+        return f"<CronSchedule {self.expression}>"
+
+    @staticmethod
+    def _parse_field(field: str, minimum: int, maximum: int) -> frozenset[int]:
+        values: set[int] = set()
+        for part in field.split(","):
+            value_range, _, step = part.partition("/")
+            if value_range == "*":
+                start, end = minimum, maximum
+            elif "-" in value_range:
+                start, end = (int(value) for value in value_range.split("-", 1))
+            else:
+                start = end = int(value_range)
+
+            if not minimum <= start <= end <= maximum:
+                raise ValueError(f"Invalid cron field: {field!r}")
+            values.update(range(start, end + 1, int(step) if step else 1))
+        return frozenset(values)
+
+    def _matches_day(self, day: date) -> bool:
+        if day.month not in self.months:
+            return False
+
+        matches_day = day.day in self.days
+        matches_weekday = day.isoweekday() % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return matches_day and matches_weekday
+        return matches_day or matches_weekday
+
+    def get_next_run(self, after: datetime) -> datetime:
+        """Get the first time after the given time that matches the schedule."""
+        after = timezone.localtime(after).replace(second=0, microsecond=0)
+        # Leap days can be five years apart, allowing for a skipped century.
+        for day_offset in range(366 * 8 + 1):
+            day = after.date() + timedelta(days=day_offset)
+            if not self._matches_day(day):
+                continue
+            for hour in sorted(self.hours):
+                for minute in sorted(self.minutes):
+                    run = timezone.make_aware(datetime.combine(day, time(hour, minute)))
+                    if run > after:
+                        return run
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
+
+
+SCHEDULE: dict[str, CronSchedule] = {}
+
+
+def periodic(expression: str) -> Callable[[Task], Task]:
+    """Run a task on a cron-like schedule. This must be applied to a function already decorated with ``@task``."""
+    schedule = CronSchedule(expression)
+
+    def decorator(task: Task) -> Task:
+        SCHEDULE[task.name] = schedule
+        return task
+
+    return decorator
+
+
+def acquire_lease(name: str, *, holder: str, duration: timedelta) -> bool:
+    """Acquire or renew a lease, if it is not held by anyone else."""
+    now = timezone.now()
+    Lease.objects.get_or_create(name=name, defaults={"expires_at": now})
+    acquired = Lease.objects.filter(models.Q(holder=holder) | models.Q(expires_at__lte=now), name=name).update(
+        holder=holder,
+        expires_at=now + duration,
+    )
+    return bool(acquired)
+
+
+def release_lease(name: str, *, holder: str) -> None:
+    Lease.objects.filter(name=name, holder=holder).update(holder="", expires_at=timezone.now())
+
+
+def run_schedule(*, holder: str) -> list[str]:
+    """
+    Queue jobs for scheduled tasks that are due, if this scheduler is the leader.
+
+    Runs that were missed whilst no scheduler was running are skipped, and a task is not queued
+    again if its last job has not finished yet.
+
+    :returns: the names of the tasks that were queued.
+    """
+    if not acquire_lease(SCHEDULER_LEASE, holder=holder, duration=SCHEDULER_LEASE_DURATION):
+        return []
+
+    now = timezone.now()
+    queued = []
+    for task_name, schedule in SCHEDULE.items():
+        state, created = ScheduleState.objects.get_or_create(task=task_name, defaults={"last_run_at": now})
+        if created or schedule.get_next_run(state.last_run_at) > now:
+            continue
+
+        # Guard against another scheduler that still thinks it is the leader.
+        if not ScheduleState.objects.filter(task=task_name, last_run_at=state.last_run_at).update(last_run_at=now):
+            continue
+
+        unfinished = Job.objects.filter(task=task_name, status__in=[JobStatus.QUEUED, JobStatus.RUNNING])
+        if not unfinished.exists():
+            enqueue(task_name)
+            queued.append(task_name)
+    return queued
@@ -0,0 +1,16 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from ferry.jobs.models import Job, JobStatus
+from ferry.jobs.queue import task
+from ferry.jobs.schedule import periodic
+
+
+@periodic("30 3 * * *")
+@task(name="jobs.prune_jobs")
+def prune_jobs() -> None:
+    """Delete old finished jobs, keeping failed jobs for longer so that they can be investigated."""
+    now = timezone.now()
+    Job.objects.filter(status=JobStatus.SUCCEEDED, updated_at__lt=now - timedelta(days=7)).delete()
+    Job.objects.filter(status=JobStatus.FAILED, updated_at__lt=now - timedelta(days=30)).delete()
@@ -0,0 +1,177 @@
+from collections.abc import Iterator
+from datetime import timedelta
+from typing import Any
+
+import pytest
+import time_machine
+from django.core.management import call_command
+from django.utils import timezone
+
+from ferry.jobs.models import Job, JobStatus
+from ferry.jobs.queue import TASKS, Task, claim_jobs, enqueue, release_stale_jobs, run_jobs, task, work
+
+
+@pytest.fixture
+def calls() -> Iterator[list[Any]]:
+    calls: list[Any] = []
+    task_names = set(TASKS)
+    yield calls
+    for name in set(TASKS) - task_names:
+        del TASKS[name]
+
+
+@pytest.fixture
+def record(calls: list[Any]) -> Task:
+    @task(name="tests.record", max_attempts=2)
+    def record(value: int) -> None:
+        calls.append(value)
+
+    return record
+
+
+@pytest.fixture
+def explode(calls: list[Any]) -> Task:
+    @task(name="tests.explode", max_attempts=2)
+    def explode() -> None:
+        calls.append("boom")
+        raise RuntimeError("boom")
+
+    return explode
+
+
+@pytest.mark.django_db
+class TestJobQueue:
+    def test_task_name_must_be_unique(self, record: Task) -> None:
+        with pytest.raises(ValueError, match="already registered"):
+            task(name="tests.record")(lambda: None)
+
+    def test_enqueue(self, record: Task) -> None:
+        job = record.enqueue(priority=3, value=1)
+
+        assert job.task == "tests.record"
+        assert job.payload == {"value": 1}
+        assert job.priority == 3
+        assert job.status == JobStatus.QUEUED
+
+    def test_claim_jobs_by_priority(self, record: Task) -> None:
+        low = record.enqueue(value=1)
+        high = record.enqueue(priority=10, value=2)
+        record.enqueue(delay=timedelta(minutes=5), value=3)
+
+        jobs = claim_jobs(worker_id="worker", limit=10)
+
+        assert [job.id for job in jobs] == [high.id, low.id]
+        assert claim_jobs(worker_id="worker", limit=10) == []
+        low.refresh_from_db()
+        assert low.status == JobStatus.RUNNING
+        assert low.claimed_by == "worker"
+        assert low.attempts == 1
+
+    def test_claim_jobs_limit(self, record: Task) -> None:
+        for value in range(3):
+            record.enqueue(value=value)
+
+        assert len(claim_jobs(worker_id="worker", limit=2)) == 2
+        assert len(claim_jobs(worker_id="worker", limit=2)) == 1
+
+    def test_work(self, record: Task, calls: list[Any]) -> None:
+        job = record.enqueue(value=1)
+
+        assert work(worker_id="worker") == 1
+
+        assert calls == [1]
+        job.refresh_from_db()
+        assert job.status == JobStatus.SUCCEEDED
+
+    def test_retry(self, explode: Task, calls: list[Any]) -> None:
+        job = explode.enqueue()
+
+        work(worker_id="worker")
+
+        job.refresh_from_db()
+        assert job.status == JobStatus.QUEUED
+        assert job.last_error == "RuntimeError('boom')"
+        assert job.run_after > timezone.now()
+
+        with time_machine.travel(job.run_after + timedelta(seconds=1)):
+            work(worker_id="worker")
+
+        job.refresh_from_db()
+        assert job.status == JobStatus.FAILED
+        assert calls == ["boom", "boom"]
+
+    def test_failure_does_not_affect_other_jobs(self, record: Task, explode: Task, calls: list[Any]) -> None:
+        explode.enqueue()
+        job = record.enqueue(value=1)
+
+        work(worker_id="worker")
+
+        job.refresh_from_db()
+        assert job.status == JobStatus.SUCCEEDED
+
+    def test_unknown_task(self) -> None:
+        job = enqueue("tests.unknown")
+
+        work(worker_id="worker")
+
+        job.refresh_from_db()
+        assert job.status == JobStatus.FAILED
+        assert job.last_error == "Unknown task: tests.unknown"
+
+    def test_batched_task(self, calls: list[Any]) -> None:
+        @task(name="tests.batched", batched=True)
+        def batched(payloads: list[dict[str, Any]]) -> None:
+            calls.append(payloads)
+
+        for value in range(3):
+            batched.enqueue(value=value)
+
+        run_jobs(claim_jobs(worker_id="worker", limit=10))
+
+        assert calls == [[{"value": 0}, {"value": 1}, {"value": 2}]]
+        assert set(Job.objects.values_list("status", flat=True)) == {JobStatus.SUCCEEDED}
+
+    def test_release_stale_jobs(self, record: Task) -> None:
+        job = record.enqueue(value=1)
+        claim_jobs(worker_id="worker", limit=1)
+
+        assert release_stale_jobs() == 0
+        with time_machine.travel(timezone.now() + timedelta(hours=1)):
+            assert release_stale_jobs() == 1
+
+        job.refresh_from_db()
+        assert job.status == JobStatus.QUEUED
+        assert job.claimed_by == ""
+
+    def test_release_stale_jobs_out_of_attempts(self, record: Task) -> None:
+        job = record.enqueue(value=1)
+        Job.objects.filter(id=job.id).update(attempts=1)
+        claim_jobs(worker_id="worker", limit=1)
+
+        with time_machine.travel(timezone.now() + timedelta(hours=1)):
+            assert release_stale_jobs() == 1
+
+        job.refresh_from_db()
+        assert job.status == JobStatus.FAILED
+        assert job.last_error == "The worker running the job did not finish it."
+
+    @pytest.mark.parametrize(("atomic", "kept"), [(True, False), (False, True)])
+    def test_atomic_task(self, calls: list[Any], atomic: bool, kept: bool) -> None:  # noqa: FBT001
+        @task(name="tests.partial", max_attempts=1, atomic=atomic)
+        def partial() -> None:
+            enqueue("tests.created_by_partial")
+            raise RuntimeError("boom")
+
+        partial.enqueue()
+
+        work(worker_id="worker")
+
+        assert Job.objects.filter(task="tests.created_by_partial").exists() is kept
+
+    def test_run_ferry_worker(self, record: Task, calls: list[Any]) -> None:
+        for value in range(3):
+            record.enqueue(value=value)
+
+        call_command("run_ferry_worker", "--burst", "--batch-size=2")
+
+        assert calls == [0, 1, 2]
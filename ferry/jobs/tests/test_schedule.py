@@ -0,0 +1,120 @@
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+
+import pytest
+import time_machine
+from django.core.management import call_command
+from django.utils import timezone
+
+from ferry.jobs.models import Job, JobStatus
+from ferry.jobs.queue import TASKS, task
+from ferry.jobs.schedule import SCHEDULE, CronSchedule, acquire_lease, periodic, release_lease, run_schedule
+
+
+def local(*args: int) -> datetime:
+    return timezone.make_aware(datetime(*args))  # noqa: DTZ001
+
+
+class TestCronSchedule:
+    @pytest.mark.parametrize(
+        ("expression", "after", "expected"),
+        [
+            pytest.param("* * * * *", local(2025, 1, 1, 12, 0), local(2025, 1, 1, 12, 1), id="every-minute"),
+            pytest.param("*/10 * * * *", local(2025, 1, 1, 12, 5), local(2025, 1, 1, 12, 10), id="step"),
+            pytest.param("15 * * * *", local(2025, 1, 1, 12, 15), local(2025, 1, 1, 13, 15), id="hourly"),
+            pytest.param("0 4 * * *", local(2025, 1, 1, 12, 0), local(2025, 1, 2, 4, 0), id="daily"),
+            pytest.param("0 0 1 9 *", local(2025, 9, 1, 0, 0), local(2026, 9, 1, 0, 0), id="yearly"),
+            pytest.param("0 9 * * 1-5", local(2025, 1, 3, 10, 0), local(2025, 1, 6, 9, 0), id="weekdays"),
+            pytest.param("0 0 13 * 5", local(2025, 1, 1, 0, 0), local(2025, 1, 3, 0, 0), id="day-or-weekday"),
+            pytest.param("0 0 29 2 *", local(2025, 1, 1, 0, 0), local(2028, 2, 29, 0, 0), id="leap-day"),
+            pytest.param("0,30 8 * * *", local(2025, 1, 1, 8, 10), local(2025, 1, 1, 8, 30), id="list"),
+        ],
+    )
+    def test_get_next_run(self, expression: str, after: datetime, expected: datetime) -> None:
+        assert CronSchedule(expression).get_next_run(after) == expected
+
+    @pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "* * 0 * *", "5-1 * * * *", "a * * * *"])
+    def test_invalid(self, expression: str) -> None:
+        with pytest.raises(ValueError):  # noqa: PT011
+            CronSchedule(expression)
+
+    def test_never_matches(self) -> None:
+        with pytest.raises(ValueError, match="never matches"):
+            CronSchedule("0 0 31 2 *").get_next_run(local(2025, 1, 1, 0, 0))
+
+
+@pytest.mark.django_db
+class TestLease:
+    def test_acquire(self) -> None:
+        assert acquire_lease("bees", holder="a", duration=timedelta(minutes=1))
+        assert acquire_lease("bees", holder="a", duration=timedelta(minutes=1))
+        assert not acquire_lease("bees", holder="b", duration=timedelta(minutes=1))
+
+    def test_acquire_expired(self) -> None:
+        acquire_lease("bees", holder="a", duration=timedelta(minutes=1))
+
+        with time_machine.travel(timezone.now() + timedelta(minutes=2)):
+            assert acquire_lease("bees", holder="b", duration=timedelta(minutes=1))
+
+    def test_release(self) -> None:
+        acquire_lease("bees", holder="a", duration=timedelta(minutes=1))
+
+        release_lease("bees", holder="a")
+
+        assert acquire_lease("bees", holder="b", duration=timedelta(minutes=1))
+
+
+@pytest.mark.django_db
+class TestRunSchedule:
+    @pytest.fixture(autouse=True)
+    def schedule(self) -> Iterator[None]:
+        tasks, schedule = dict(TASKS), dict(SCHEDULE)
+        SCHEDULE.clear()
+
+        periodic("*/10 * * * *")(task(name="tests.periodic")(lambda: None))
+        yield
+
+        TASKS.clear()
+        TASKS.update(tasks)
+        SCHEDULE.clear()
+        SCHEDULE.update(schedule)
+
+    def test_run_schedule(self) -> None:
+        with time_machine.travel(local(2025, 1, 1, 12, 5), tick=False):
+            assert run_schedule(holder="a") == []
+        with time_machine.travel(local(2025, 1, 1, 12, 9), tick=False):
+            assert run_schedule(holder="a") == []
+        with time_machine.travel(local(2025, 1, 1, 12, 10), tick=False):
+            assert run_schedule(holder="a") == ["tests.periodic"]
+            assert run_schedule(holder="a") == []
+
+        assert Job.objects.get().task == "tests.periodic"
+
+    def test_not_leader(self) -> None:
+        with time_machine.travel(local(2025, 1, 1, 12, 5), tick=False):
+            run_schedule(holder="a")
+        with time_machine.travel(local(2025, 1, 1, 12, 9), tick=False):
+            run_schedule(holder="a")
+        with time_machine.travel(local(2025, 1, 1, 12, 10), tick=False):
+            assert run_schedule(holder="b") == []
+
+        assert not Job.objects.exists()
+
+    def test_unfinished_job_is_not_queued_again(self) -> None:
+        with time_machine.travel(local(2025, 1, 1, 12, 5), tick=False):
+            run_schedule(holder="a")
+        with time_machine.travel(local(2025, 1, 1, 12, 10), tick=False):
+            run_schedule(holder="a")
+        Job.objects.update(status=JobStatus.RUNNING)
+        with time_machine.travel(local(2025, 1, 1, 12, 20), tick=False):
+            assert run_schedule(holder="a") == []
+
+        assert Job.objects.count() == 1
+
+    def test_ferry_scheduler(self) -> None:
+        with time_machine.travel(local(2025, 1, 1, 12, 5), tick=False):
+            call_command("ferry_scheduler", "--once")
+        with time_machine.travel(local(2025, 1, 1, 12, 10), tick=False):
+            call_command("ferry_scheduler", "--once")
+
+        assert Job.objects.get().task == "tests.periodic"
@@ -2,10 +2,13 @@ from typing import Any
 
 from django import forms
 from django.contrib import admin
+from django.forms import BaseFormSet
 from django.http import HttpRequest
 from emoji_picker.widgets import EmojiPickerTextInputAdmin
 
 from ferry.pub.models import Pub, PubEvent, PubEventBooking, PubEventExtraInfo, PubEventRSVP, PubTable
+from ferry.pub.repository import invalidate_pub_event_snapshot
+from ferry.pub.tasks import queue_rebuild_attendance_rollups
 
 
 class PubAdminForm(forms.ModelForm):
@@ -66,6 +69,19 @@ class PubEventAdmin(admin.ModelAdmin):
         PubEventExtraInfoAdmin,
     )
 
+    def save_related(
+        self,
+        request: HttpRequest,
+        form: forms.ModelForm,
+        formsets: list[BaseFormSet],
+        change: bool,  # noqa: FBT001
+    ) -> None:
+        super().save_related(request, form, formsets, change)
+        invalidate_pub_event_snapshot(form.instance)
+
+        # Admins can change anything about an event, so rebuild rather than work out what changed.
+        queue_rebuild_attendance_rollups()
+
 
 admin.site.register(Pub, PubAdmin)
 admin.site.register(PubTable, PubTableAdmin)
@@ -1,10 +1,24 @@
+from typing import Any
+
 from rest_framework import serializers
 from rest_framework.utils.serializer_helpers import ReturnDict
 
-from ferry.accounts.api.serializers import PersonLinkWithDiscordIdSerializer
+from ferry.accounts.api.serializers import PersonLinkSerializer, PersonLinkWithDiscordIdSerializer
 from ferry.accounts.models import Person
-from ferry.pub.models import Pub, PubEvent, PubTable
-from ferry.pub.repository import get_attendees_for_pub_event
+from ferry.pub.models import (
+    PersonAttendanceRollup,
+    Pub,
+    PubAttendanceRollup,
+    PubEvent,
+    PubEventRSVP,
+    PubTable,
+    TermAttendanceRollup,
+)
+from ferry.pub.repository import (
+    get_attendee_count_for_pub_event,
+    get_attendee_list_for_pub_event,
+    get_pub_event_snapshot,
+)
 
 
 class PubSerializer(serializers.ModelSerializer):
@@ -47,8 +61,14 @@ class PubEventSerializer(serializers.ModelSerializer):
             "updated_at",
         )
 
+    def to_representation(self, instance: PubEvent) -> Any:
+        # Past events are frozen, so serve the stored snapshot if the view allows it.
+        if self.context.get("use_snapshots") and (snapshot := get_pub_event_snapshot(instance)):
+            return snapshot.data["event"]
+        return super().to_representation(instance)
+
     def get_attendees(self, pub_event: PubEvent) -> ReturnDict:
-        attendees = get_attendees_for_pub_event(pub_event)
+        attendees = get_attendee_list_for_pub_event(pub_event)
         serializer = PersonLinkWithDiscordIdSerializer(read_only=True, many=True, instance=attendees)
         return serializer.data
 
@@ -71,7 +91,7 @@ class PublicPubEventSerializer(serializers.ModelSerializer):
         )
 
     def get_attendee_count(self, event: PubEvent) -> int:
-        return get_attendees_for_pub_event(event).count()
+        return get_attendee_count_for_pub_event(event)
 
 
 class PubEventAddRemoveAttendeeSerializer(serializers.Serializer):
@@ -80,3 +100,47 @@ class PubEventAddRemoveAttendeeSerializer(serializers.Serializer):
 
 class PubEventTableSerializer(serializers.Serializer):
     table_number = serializers.IntegerField(max_value=1000, min_value=1, required=True)
+
+
+class PubEventRSVPSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PubEventRSVP
+        fields = ("id", "person", "is_attending", "method", "created_at", "updated_at")
+
+
+class PubEventAttendanceMinimalSerializer(serializers.Serializer):
+    rsvp = PubEventRSVPSerializer(allow_null=True, read_only=True)
+    attendee_count = serializers.IntegerField(read_only=True)
+
+
+class PubEventTableMinimalSerializer(serializers.Serializer):
+    table = PubTableSerializer(read_only=True)
+    attendee_count = serializers.IntegerField(read_only=True)
+
+
+class PersonAttendanceRollupSerializer(serializers.ModelSerializer):
+    person = PersonLinkSerializer(read_only=True)
+
+    class Meta:
+        model = PersonAttendanceRollup
+        fields = ("person", "attended_count", "current_streak", "longest_streak", "last_attended_at")
+
+
+class PubAttendanceRollupSerializer(serializers.ModelSerializer):
+    pub = PubLinkSerializer(read_only=True)
+
+    class Meta:
+        model = PubAttendanceRollup
+        fields = ("pub", "event_count", "attendance_count")
+
+
+class TermAttendanceRollupSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TermAttendanceRollup
+        fields = ("name", "term_start", "event_count", "attendance_count", "attendee_count")
+
+
+class PubStatsSerializer(serializers.Serializer):
+    people = PersonAttendanceRollupSerializer(many=True, read_only=True)
+    pubs = PubAttendanceRollupSerializer(many=True, read_only=True)
+    terms = TermAttendanceRollupSerializer(many=True, read_only=True)
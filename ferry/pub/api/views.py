@@ -1,21 +1,96 @@
 from typing import Any
 
+from django.db import models, transaction
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import quote_etag
 from django_filters.rest_framework import DjangoFilterBackend
-from drf_spectacular.utils import extend_schema, extend_schema_view
-from rest_framework import mixins, permissions, viewsets
+from drf_spectacular.utils import OpenApiParameter, PolymorphicProxySerializer, extend_schema, extend_schema_view
+from rest_framework import mixins, permissions, serializers, viewsets
 from rest_framework.decorators import action
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from ferry.accounts.models import Person
 from ferry.pub.api.serializers import (
+    PersonAttendanceRollupSerializer,
     PubEventAddRemoveAttendeeSerializer,
+    PubEventAttendanceMinimalSerializer,
     PubEventSerializer,
+    PubEventTableMinimalSerializer,
     PubEventTableSerializer,
     PublicPubEventSerializer,
     PubSerializer,
+    PubStatsSerializer,
 )
-from ferry.pub.models import Pub, PubEvent, PubEventQuerySet, PubEventRSVP, PubEventRSVPMethod, PubQuerySet, PubTable
+from ferry.pub.models import (
+    PersonAttendanceRollup,
+    Pub,
+    PubAttendanceRollup,
+    PubEvent,
+    PubEventQuerySet,
+    PubEventRSVP,
+    PubEventRSVPMethod,
+    PubQuerySet,
+    PubTable,
+    TermAttendanceRollup,
+)
+from ferry.pub.repository import (
+    get_attendee_count_for_pub_event,
+    get_next_pub_event,
+    get_pub_event_snapshot,
+    invalidate_pub_event_snapshot,
+    publish_attendance_changed,
+)
+from ferry.pub.rollups import refresh_attendance_rollups_for_pub_event
+from ferry.pub.tasks import create_autopub_rsvps, queue_rebuild_attendance_rollups
+
+# Past events are only changed by admins, or by changes to the people and pubs in them, which replace the
+# snapshot and so the ETag.
+PAST_PUB_EVENT_MAX_AGE = 60 * 60 * 24
+
+MINIMAL_RESPONSE_PARAMETERS = [
+    OpenApiParameter(
+        "response",
+        str,
+        enum=["full", "minimal"],
+        description=(
+            "Set to `minimal` to only return the changed resource and the attendee count. "
+            "Equivalent to sending `Prefer: return=minimal`."
+        ),
+    ),
+]
+
+ATTENDANCE_RESPONSE_SERIALIZER = PolymorphicProxySerializer(
+    component_name="PubEventAttendanceResponse",
+    serializers=[PubEventSerializer, PubEventAttendanceMinimalSerializer],
+    resource_type_field_name=None,
+)
+TABLE_RESPONSE_SERIALIZER = PolymorphicProxySerializer(
+    component_name="PubEventTableResponse",
+    serializers=[PubEventSerializer, PubEventTableMinimalSerializer],
+    resource_type_field_name=None,
+)
+
+
+def wants_minimal_response(request: Request) -> bool:
+    """Whether the client asked for a minimal response, via query parameter or RFC 7240 Prefer header."""
+    if request.query_params.get("response") == "minimal":
+        return True
+
+    preferences = request.headers.get("Prefer", "").split(",")
+    return any(pref.split(";")[0].strip().lower() == "return=minimal" for pref in preferences)
+
+
+def minimal_response(data: Any) -> Response:
+    response = Response(data, headers={"Preference-Applied": "return=minimal"})
+    patch_vary_headers(response, ["Prefer"])
+    return response
+
+
+def full_response(data: Any) -> Response:
+    """The full response to a request that could have asked for a minimal one, so varies on Prefer like it."""
+    response = Response(data)
+    patch_vary_headers(response, ["Prefer"])
+    return response
 
 
 @extend_schema_view(
@@ -80,20 +155,48 @@ class PubEventViewset(
 
     def get_queryset(self) -> PubEventQuerySet:
         assert self.request.user.is_authenticated
-        return PubEvent.objects.for_user(self.request.user)
+        return PubEvent.objects.for_user(self.request.user).select_related("snapshot")
+
+    def get_serializer_context(self) -> dict[str, Any]:
+        return {
+            **super().get_serializer_context(),
+            "use_snapshots": self.action in ("list", "retrieve"),
+        }
+
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        pub_event: PubEvent = self.get_object()
+        snapshot = get_pub_event_snapshot(pub_event)
+        if snapshot is None:
+            serializer = self.get_serializer(pub_event)
+            return Response(serializer.data)
+
+        etag = quote_etag(str(snapshot.id))
+        if not_modified := get_conditional_response(request, etag=etag):
+            return not_modified  # type: ignore[return-value]
+
+        response = Response(snapshot.data["event"], headers={"ETag": etag})
+        patch_cache_control(response, private=True, max_age=PAST_PUB_EVENT_MAX_AGE)
+        return response
+
+    def perform_update(self, serializer: PubEventSerializer) -> None:  # type: ignore[override]
+        assert serializer.instance
+        was_past = serializer.instance.is_past
+        pub_event = serializer.save()
+        invalidate_pub_event_snapshot(pub_event)
+
+        # Moving a past event can affect the streaks of everyone.
+        if was_past or pub_event.is_past:
+            queue_rebuild_attendance_rollups()
 
     def perform_create(self, serializer: PubEventSerializer) -> None:  # type: ignore[override]
         pub_event = serializer.save()
-        rsvps = [
-            PubEventRSVP(person=person, pub_event=pub_event, is_attending=True, method=PubEventRSVPMethod.AUTO)
-            for person in Person.objects.filter(autopub=True)
-        ]
-        PubEventRSVP.objects.bulk_create(rsvps)
+        create_autopub_rsvps.enqueue(priority=10, pub_event_id=pub_event.id)
 
     @extend_schema(
         tags=["Pub - Event Attendance"],
         request=PubEventAddRemoveAttendeeSerializer,
-        responses={200: PubEventSerializer},
+        responses={200: ATTENDANCE_RESPONSE_SERIALIZER},
+        parameters=MINIMAL_RESPONSE_PARAMETERS,
         description="Add a person to a pub event.",
     )
     @action(url_path="attendees/add", detail=True, methods=["POST"])
@@ -104,19 +207,31 @@ class PubEventViewset(
         attendee_info.is_valid(raise_exception=True)
 
         # Ensure the RSVP exists, if adding make method as discord.
-        PubEventRSVP.objects.get_or_create(
-            pub_event=pub_event,
-            person=attendee_info.validated_data["person"],
-            defaults={"is_attending": True, "method": PubEventRSVPMethod.DISCORD},
-        )
+        with transaction.atomic():
+            rsvp, created = PubEventRSVP.objects.get_or_create(
+                pub_event=pub_event,
+                person=attendee_info.validated_data["person"],
+                defaults={"is_attending": True, "method": PubEventRSVPMethod.DISCORD},
+            )
+            if created:
+                invalidate_pub_event_snapshot(pub_event)
+                refresh_attendance_rollups_for_pub_event(pub_event, person_ids=[rsvp.person_id])
+                publish_attendance_changed(pub_event)
+
+        if wants_minimal_response(request):
+            minimal_serializer = PubEventAttendanceMinimalSerializer(
+                instance={"rsvp": rsvp, "attendee_count": get_attendee_count_for_pub_event(pub_event)}
+            )
+            return minimal_response(minimal_serializer.data)
 
         serializer = PubEventSerializer(instance=pub_event)
-        return Response(serializer.data)
+        return full_response(serializer.data)
 
     @extend_schema(
         tags=["Pub - Event Attendance"],
         request=PubEventAddRemoveAttendeeSerializer,
-        responses={200: PubEventSerializer},
+        responses={200: ATTENDANCE_RESPONSE_SERIALIZER},
+        parameters=MINIMAL_RESPONSE_PARAMETERS,
         description="Remove a person from a pub event.",
     )
     @action(url_path="attendees/remove", detail=True, methods=["POST"])
@@ -130,17 +245,34 @@ class PubEventViewset(
         rsvp_qs = PubEventRSVP.objects.filter(
             pub_event=pub_event, person=attendee_info.validated_data["person"], method=PubEventRSVPMethod.DISCORD
         )
-        rsvp_qs.delete()
+        with transaction.atomic():
+            deleted, _ = rsvp_qs.delete()
+            if deleted:
+                invalidate_pub_event_snapshot(pub_event)
+                refresh_attendance_rollups_for_pub_event(
+                    pub_event, person_ids=[attendee_info.validated_data["person"].id]
+                )
+                publish_attendance_changed(pub_event)
 
         # Note: the bot checks if the user is still present, i.e if they have opted in via
         # another method
+        if wants_minimal_response(request):
+            remaining_rsvp = PubEventRSVP.objects.filter(
+                pub_event=pub_event, person=attendee_info.validated_data["person"]
+            ).first()
+            minimal_serializer = PubEventAttendanceMinimalSerializer(
+                instance={"rsvp": remaining_rsvp, "attendee_count": get_attendee_count_for_pub_event(pub_event)}
+            )
+            return minimal_response(minimal_serializer.data)
+
         serializer = PubEventSerializer(instance=pub_event)
-        return Response(serializer.data)
+        return full_response(serializer.data)
 
     @extend_schema(
         tags=["Pub - Event Attendance"],
         request=PubEventTableSerializer,
-        responses={200: PubEventSerializer},
+        responses={200: TABLE_RESPONSE_SERIALIZER},
+        parameters=MINIMAL_RESPONSE_PARAMETERS,
         description="Update the table number for a pub event.",
     )
     @action(detail=True, methods=["POST"])
@@ -157,9 +289,16 @@ class PubEventViewset(
 
         pub_event.table = table
         pub_event.save()
+        invalidate_pub_event_snapshot(pub_event)
+
+        if wants_minimal_response(request):
+            minimal_serializer = PubEventTableMinimalSerializer(
+                instance={"table": table, "attendee_count": get_attendee_count_for_pub_event(pub_event)}
+            )
+            return minimal_response(minimal_serializer.data)
 
         serializer = PubEventSerializer(instance=pub_event)
-        return Response(serializer.data)
+        return full_response(serializer.data)
 
     @extend_schema(
         tags=["Pub - Next Pub"],
@@ -168,8 +307,52 @@ class PubEventViewset(
     )
     @action(detail=False, methods=["GET"], permission_classes=[permissions.AllowAny])
     def next(self, request: Request) -> Response:
-        if next_pub := PubEvent.objects.get_next():
+        if next_pub := get_next_pub_event():
             serializer = PublicPubEventSerializer(instance=next_pub)
             return Response(serializer.data)
         else:
             return Response(status=204)
+
+
+class PubStatsViewset(viewsets.GenericViewSet):
+    serializer_class = PubStatsSerializer
+    # The summary only includes the people who have attended the most, the rest are listed by ``people``.
+    summary_people_limit = 20
+
+    def get_queryset(self) -> models.QuerySet[PersonAttendanceRollup]:
+        return PersonAttendanceRollup.objects.select_related("person").order_by(
+            "-attended_count", "person__display_name"
+        )
+
+    def get_serializer_class(self) -> type[serializers.BaseSerializer]:
+        if self.action == "people":
+            return PersonAttendanceRollupSerializer
+        return PubStatsSerializer
+
+    @extend_schema(
+        tags=["Pub - Stats"],
+        description=(
+            "Get attendance statistics for past pub events, broken down by pub and term, with the people who have "
+            "attended the most."
+        ),
+    )
+    def list(self, request: Request) -> Response:
+        serializer = self.get_serializer(
+            instance={
+                "people": self.get_queryset()[: self.summary_people_limit],
+                "pubs": PubAttendanceRollup.objects.select_related("pub").order_by("-attendance_count", "pub__name"),
+                "terms": TermAttendanceRollup.objects.all(),
+            }
+        )
+        return Response(serializer.data)
+
+    @extend_schema(
+        tags=["Pub - Stats"],
+        responses={200: PersonAttendanceRollupSerializer(many=True)},
+        description="List the attendance statistics of everyone who has attended a past pub event.",
+    )
+    @action(detail=False, methods=["GET"])
+    def people(self, request: Request) -> Response:
+        page = self.paginate_queryset(self.get_queryset())
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
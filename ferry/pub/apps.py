@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class PubConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "ferry.pub"
+
+    def ready(self) -> None:
+        from ferry.core.invalidation import invalidate_on_change
+        from ferry.pub import signals  # noqa: F401
+        from ferry.pub.models import Pub, PubEvent, PubEventRSVP, PubTable
+
+        invalidate_on_change("pub", Pub, PubTable, PubEvent, PubEventRSVP)
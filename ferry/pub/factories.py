@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+import factory
+from django.utils import timezone
+
+from ferry.accounts.factories import PersonFactory
+
+from .models import Pub, PubEvent, PubEventRSVP, PubEventRSVPMethod
+
+
+class PubFactory(factory.django.DjangoModelFactory[Pub]):
+    name = factory.Sequence(lambda n: f"The Pub {n}")
+    emoji = "🍺"
+    map_url = "https://example.com/map"
+
+    class Meta:
+        model = Pub
+
+
+class PubEventFactory(factory.django.DjangoModelFactory[PubEvent]):
+    timestamp = factory.LazyFunction(lambda: timezone.now() + timedelta(days=1))
+    pub = factory.SubFactory(PubFactory)
+    created_by = factory.SubFactory(PersonFactory)
+
+    class Meta:
+        model = PubEvent
+
+
+class PubEventRSVPFactory(factory.django.DjangoModelFactory[PubEventRSVP]):
+    person = factory.SubFactory(PersonFactory)
+    pub_event = factory.SubFactory(PubEventFactory)
+    is_attending = True
+    method = PubEventRSVPMethod.DISCORD
+
+    class Meta:
+        model = PubEventRSVP
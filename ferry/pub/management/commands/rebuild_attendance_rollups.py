@@ -0,0 +1,13 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from ferry.pub.rollups import rebuild_attendance_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild the pub attendance statistics from all RSVPs."
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        rebuild_attendance_rollups()
+        self.stdout.write(self.style.SUCCESS("Rebuilt attendance rollups."))
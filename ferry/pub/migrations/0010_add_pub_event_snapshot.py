@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:55
+
+import uuid
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("pub", "0009_add_extra_info_model"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PubEventSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("data", models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "pub_event",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="snapshot", to="pub.pubevent"
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:59
+
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0007_add_autopub_toggle"),
+        ("pub", "0010_add_pub_event_snapshot"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TermAttendanceRollup",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("term_start", models.DateField(unique=True)),
+                ("event_count", models.PositiveIntegerField(default=0)),
+                ("attendance_count", models.PositiveIntegerField(default=0)),
+                ("attendee_count", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "ordering": ("-term_start",),
+            },
+        ),
+        migrations.CreateModel(
+            name="PersonAttendanceRollup",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("attended_count", models.PositiveIntegerField(default=0)),
+                ("current_streak", models.PositiveIntegerField(default=0)),
+                ("longest_streak", models.PositiveIntegerField(default=0)),
+                ("last_attended_at", models.DateTimeField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "person",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="attendance_rollup",
+                        to="accounts.person",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="PubAttendanceRollup",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("event_count", models.PositiveIntegerField(default=0)),
+                ("attendance_count", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "pub",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="attendance_rollup", to="pub.pub"
+                    ),
+                ),
+            ],
+        ),
+    ]
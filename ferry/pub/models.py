@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import uuid
-from datetime import datetime
+from datetime import UTC, date, datetime, time
 
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.utils import timezone
 
 from ferry.accounts.models import User
+from ferry.core.models import AtomicSaveModel
 
 
 class PubQuerySet(models.QuerySet):
@@ -53,21 +55,32 @@ class PubTable(models.Model):
         return f"Table {self.number} @ {self.pub}"
 
 
-class PubEventQuerySet(models.QuerySet):
+class PubEventQuerySet(models.QuerySet["PubEvent"]):
     def for_user(self, user: User) -> PubEventQuerySet:
         return self.all()
 
     def get_next(self, *, timestamp: datetime | None = None) -> PubEvent | None:
         if timestamp is None:
             timestamp = timezone.now()
-        upcoming_pubs = PubEvent.objects.filter(timestamp__gte=timestamp).order_by("timestamp")
+        upcoming_pubs = self.filter(timestamp__gte=timestamp).order_by("timestamp")
         return upcoming_pubs.first()
 
+    def past(self) -> PubEventQuerySet:
+        """Events that happened before today, matching PubEvent.is_past."""
+        return self.filter(timestamp__lt=_start_of_today())
+
+    def not_past(self) -> PubEventQuerySet:
+        return self.filter(timestamp__gte=_start_of_today())
+
+
+def _start_of_today() -> datetime:
+    return datetime.combine(timezone.now().date(), time.min, tzinfo=UTC)
+
 
 PubEventManager = models.Manager.from_queryset(PubEventQuerySet)
 
 
-class PubEvent(models.Model):
+class PubEvent(AtomicSaveModel):
     id = models.UUIDField(verbose_name="ID", primary_key=True, default=uuid.uuid4, editable=False)
 
     timestamp = models.DateTimeField("Timestamp of Event")
@@ -101,7 +114,7 @@ class PubEventRSVPMethod(models.TextChoices):
     WEB = "W", "Web"
 
 
-class PubEventRSVP(models.Model):
+class PubEventRSVP(AtomicSaveModel):
     id = models.UUIDField(verbose_name="ID", primary_key=True, default=uuid.uuid4, editable=False)
 
     person = models.ForeignKey("accounts.Person", on_delete=models.PROTECT, related_name="pub_event_rsvps")
@@ -164,3 +177,75 @@ class PubEventExtraInfo(models.Model):
     @property
     def formatted_info(self) -> str:
         return self.info["content"]
+
+
+class PubEventSnapshot(models.Model):
+    """A frozen representation of a past pub event, so that it does not need to be recomputed."""
+
+    id = models.UUIDField(verbose_name="ID", primary_key=True, default=uuid.uuid4, editable=False)
+    pub_event = models.OneToOneField(PubEvent, on_delete=models.CASCADE, related_name="snapshot")
+
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+
+    created_at = models.DateTimeField(auto_now_add=True, editable=False)
+
+    def __str__(self) -> str:
+        return f"Snapshot of {self.pub_event}"
+
+
+class PersonAttendanceRollup(models.Model):
+    id = models.UUIDField(verbose_name="ID", primary_key=True, default=uuid.uuid4, editable=False)
+    person = models.OneToOneField("accounts.Person", on_delete=models.CASCADE, related_name="attendance_rollup")
+
+    attended_count = models.PositiveIntegerField(default=0)
+    current_streak = models.PositiveIntegerField(default=0)
+    longest_streak = models.PositiveIntegerField(default=0)
+    last_attended_at = models.DateTimeField(blank=True, null=True)
+
+    updated_at = models.DateTimeField(auto_now=True, editable=False)
+
+    def __str__(self) -> str:
+        return f"Attendance of {self.person}"
+
+
+class PubAttendanceRollup(models.Model):
+    id = models.UUIDField(verbose_name="ID", primary_key=True, default=uuid.uuid4, editable=False)
+    pub = models.OneToOneField(Pub, on_delete=models.CASCADE, related_name="attendance_rollup")
+
+    event_count = models.PositiveIntegerField(default=0)
+    attendance_count = models.PositiveIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True, editable=False)
+
+    def __str__(self) -> str:
+        return f"Attendance at {self.pub}"
+
+
+TERM_NAMES = {1: "Spring", 4: "Summer", 9: "Autumn"}
+
+
+class TermAttendanceRollup(models.Model):
+    id = models.UUIDField(verbose_name="ID", primary_key=True, default=uuid.uuid4, editable=False)
+    term_start = models.DateField(unique=True)
+
+    event_count = models.PositiveIntegerField(default=0)
+    attendance_count = models.PositiveIntegerField(default=0)
+    attendee_count = models.PositiveIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True, editable=False)
+
+    class Meta:
+        ordering = ("-term_start",)
+
+    def __str__(self) -> str:
+        return f"Attendance in {self.name}"
+
+    @property
+    def name(self) -> str:
+        return f"{TERM_NAMES[self.term_start.month]} {self.term_start.year}"
+
+    @staticmethod
+    def get_term_start(timestamp: datetime) -> date:
+        local_date = timezone.localtime(timestamp).date()
+        month = max(month for month in TERM_NAMES if month <= local_date.month)
+        return date(local_date.year, month, 1)
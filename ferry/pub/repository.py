@@ -1,11 +1,25 @@
+from functools import partial
 from typing import Any
 
-from django.db import models
+from django.db import connections, models, router, transaction
 from django.db.models.functions import Lower
+from django.utils import timezone
 
 from ferry.accounts.models import Person, PersonQuerySet
+from ferry.activity.changes import record_changes
+from ferry.activity.models import ActivityType, ChangeAction, ChangeObjectType
+from ferry.activity.repository import publish_activity
+from ferry.core.cache import memoize
+from ferry.core.invalidation import bump_cache_versions
 from ferry.pub.forms import PubEventBookingForm
-from ferry.pub.models import PubEvent, PubEventQuerySet, PubEventRSVP
+from ferry.pub.models import (
+    PubEvent,
+    PubEventBooking,
+    PubEventQuerySet,
+    PubEventRSVP,
+    PubEventRSVPMethod,
+    PubEventSnapshot,
+)
 
 
 def get_attendees_for_pub_event(pub_event: PubEvent) -> PersonQuerySet:
@@ -13,6 +27,31 @@ def get_attendees_for_pub_event(pub_event: PubEvent) -> PersonQuerySet:
     return Person.objects.filter(id__in=person_ids).order_by(Lower("display_name"))
 
 
+@memoize(namespaces=["pub", "people"])
+def get_attendee_list_for_pub_event(pub_event: PubEvent) -> list[Person]:
+    """The attendees of a pub event, cached until responses or people change."""
+    return list(get_attendees_for_pub_event(pub_event))
+
+
+@memoize(namespaces=["pub"])
+def get_attendee_count_for_pub_event(pub_event: PubEvent) -> int:
+    return pub_event.pub_event_rsvps.filter(is_attending=True).count()
+
+
+@memoize(namespaces=["pub"])
+def _get_next_pub_event() -> PubEvent | None:
+    return PubEvent.objects.select_related("pub", "table__pub").get_next()
+
+
+def get_next_pub_event() -> PubEvent | None:
+    """The next pub event, cached until pub events change or it starts."""
+    pub_event = _get_next_pub_event()
+    if pub_event is not None and pub_event.timestamp < timezone.now():
+        _get_next_pub_event.invalidate()
+        pub_event = _get_next_pub_event()
+    return pub_event
+
+
 def annotate_attendee_count(pub_event_qs: PubEventQuerySet) -> PubEventQuerySet:
     sub_qs = (
         PubEventRSVP.objects.filter(pub_event_id=models.OuterRef("id"), is_attending=True)
@@ -25,3 +64,146 @@ def annotate_attendee_count(pub_event_qs: PubEventQuerySet) -> PubEventQuerySet:
 
 def get_pub_booking_form(pub_event: PubEvent, *, data: Any | None = None) -> PubEventBookingForm:
     return PubEventBookingForm(data=data, pub_event=pub_event)
+
+
+def toggle_rsvp_for_pub_event(pub_event: PubEvent, person: Person) -> PubEventRSVP | None:
+    """
+    Toggle the web response of a person to a pub event, returning the new RSVP.
+
+    AutoPub responses become a web opt-out, web responses are flipped and a web response
+    is created if the person has not responded. Discord and manual responses are not changed.
+
+    The transition is a single upsert that returns the row it wrote, so it is atomic without a
+    prior lookup. If anything changed, the new attendees are published once it is committed.
+    """
+    meta = PubEventRSVP._meta
+    connection = connections[router.db_for_write(PubEventRSVP)]
+    qn = connection.ops.quote_name
+    now = timezone.now()
+    new_rsvp = PubEventRSVP(
+        pub_event=pub_event,
+        person=person,
+        is_attending=True,
+        method=PubEventRSVPMethod.WEB,
+        created_at=now,
+        updated_at=now,
+    )
+
+    table = qn(meta.db_table)
+    # None of the fields set a db_column, so their attribute names are their column names.
+    columns = ", ".join(qn(field.attname) for field in meta.concrete_fields)
+    placeholders = ", ".join(["%s"] * len(meta.concrete_fields))
+    unique_columns = ", ".join(qn(name) for name in ("person_id", "pub_event_id"))
+    sql = (
+        f"INSERT INTO {table} ({columns}) VALUES ({placeholders}) "  # noqa: S608
+        f"ON CONFLICT ({unique_columns}) DO UPDATE SET "
+        f"is_attending = CASE WHEN {table}.method = %s THEN %s ELSE NOT {table}.is_attending END, "
+        f"method = EXCLUDED.method, updated_at = EXCLUDED.updated_at "
+        f"WHERE {table}.method IN (%s, %s) "
+        f"RETURNING {columns}"
+    )
+    params = [
+        *(field.get_db_prep_save(getattr(new_rsvp, field.attname), connection) for field in meta.concrete_fields),
+        PubEventRSVPMethod.AUTO,
+        False,
+        PubEventRSVPMethod.AUTO,
+        PubEventRSVPMethod.WEB,
+    ]
+
+    with transaction.atomic(using=connection.alias, savepoint=False):
+        # Raw querysets map the returned row back to an RSVP, converting the values like any other query.
+        rsvp = next(iter(PubEventRSVP.objects.db_manager(connection.alias).raw(sql, params)), None)
+        if rsvp is None:
+            # The person has responded via a method that cannot be changed from the web.
+            return PubEventRSVP.objects.filter(pub_event=pub_event, person=person).first()
+
+        action = ChangeAction.CREATED if rsvp.id == new_rsvp.id else ChangeAction.UPDATED
+        record_changes(ChangeObjectType.PUB_EVENT_RSVP, action, [rsvp.id], parent_id=pub_event.id)
+        bump_cache_versions("pub")
+        transaction.on_commit(partial(publish_attendance_changed, pub_event), using=connection.alias, robust=True)
+        return rsvp
+
+
+def get_pub_event_snapshot(pub_event: PubEvent) -> PubEventSnapshot | None:
+    """
+    Get the snapshot of a past pub event, or None if it does not have one.
+
+    Snapshots are made in the background once events are past, rather than when they are read,
+    so events that have not happened yet or are waiting for a snapshot are served as they are.
+    """
+    if not pub_event.is_past:
+        return None
+
+    try:
+        return pub_event.snapshot
+    except PubEventSnapshot.DoesNotExist:
+        return None
+
+
+def create_pub_event_snapshot(pub_event: PubEvent) -> PubEventSnapshot:
+    """Freeze a past pub event, unless it has been frozen already."""
+    from ferry.pub.api.serializers import PubEventSerializer
+
+    try:
+        booking: PubEventBooking | None = pub_event.booking
+    except PubEventBooking.DoesNotExist:
+        booking = None
+
+    data = {
+        "event": PubEventSerializer(instance=pub_event).data,
+        "booking": {"table_size": booking.table_size, "created_by": str(booking.created_by)} if booking else None,
+    }
+    snapshot, _ = PubEventSnapshot.objects.get_or_create(pub_event=pub_event, defaults={"data": data})
+    return snapshot
+
+
+def discard_pub_event_snapshots(pub_event_qs: PubEventQuerySet) -> None:
+    """Discard the snapshots of pub events after something in them changed, and make them again in the background."""
+    from ferry.pub.tasks import queue_create_pub_event_snapshots
+
+    deleted, _ = PubEventSnapshot.objects.filter(pub_event__in=pub_event_qs).delete()
+    if deleted:
+        queue_create_pub_event_snapshots()
+
+
+def invalidate_pub_event_snapshot(pub_event: PubEvent) -> None:
+    """Discard the snapshot of a pub event after a change, and mark the event as modified."""
+    discard_pub_event_snapshots(PubEvent.objects.filter(id=pub_event.id))
+    # Updated in bulk so that only updated_at is written, which does not send signals to record the change.
+    if PubEvent.objects.filter(id=pub_event.id).update(updated_at=timezone.now()):
+        record_changes(ChangeObjectType.PUB_EVENT, ChangeAction.UPDATED, [pub_event.id])
+    bump_cache_versions("pub")
+
+
+def publish_attendance_changed(pub_event: PubEvent) -> list[Person]:
+    """Let subscribers know the attendees of a pub event after they have changed, returning the attendees."""
+    attendees = get_attendee_list_for_pub_event(pub_event)
+    publish_activity(
+        ActivityType.PUB_EVENT_ATTENDANCE_CHANGED,
+        {
+            "id": pub_event.id,
+            "attendees": [
+                {"id": person.id, "display_name": person.display_name, "discord_id": person.discord_id}
+                for person in attendees
+            ],
+        },
+    )
+    return attendees
+
+
+def get_pub_event_history_version() -> str:
+    """
+    A key that changes whenever the list of past pub events, or their attendance, changes.
+
+    The pubs and tables of the events are shown with them, so renaming them changes the key too.
+    """
+    history = PubEvent.objects.past().aggregate(
+        count=models.Count("id"),
+        event_modified=models.Max("updated_at"),
+        pub_modified=models.Max("pub__updated_at"),
+        table_modified=models.Max("table__updated_at"),
+        table_pub_modified=models.Max("table__pub__updated_at"),
+    )
+    count = history.pop("count")
+    last_modified = max((modified.timestamp() for modified in history.values() if modified), default=0)
+    return f"{count}-{last_modified}"
@@ -0,0 +1,181 @@
+"""
+Attendance statistics, rolled up so that they do not need to be computed from every RSVP.
+
+Only events that have happened are counted. The rollups for a person, pub and term are
+refreshed when attendance at a past event changes. Streaks change for everyone as events
+happen, so the rollups should also be rebuilt daily with ``manage.py rebuild_attendance_rollups``.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Collection, Iterable, Sequence
+from datetime import date, datetime, time
+from uuid import UUID
+
+from django.db import models, transaction
+from django.utils import timezone
+
+from ferry.pub.models import (
+    TERM_NAMES,
+    PersonAttendanceRollup,
+    PubAttendanceRollup,
+    PubEvent,
+    PubEventRSVP,
+    TermAttendanceRollup,
+)
+
+
+def _calculate_streaks(event_ids: Iterable[UUID], attended_event_ids: Collection[UUID]) -> tuple[int, int]:
+    """Calculate the current and longest streaks of consecutive events attended, given events in order."""
+    current = longest = 0
+    for event_id in event_ids:
+        if event_id in attended_event_ids:
+            current += 1
+            longest = max(longest, current)
+        else:
+            current = 0
+    return current, longest
+
+
+def _get_term_bounds(term_start: date) -> tuple[datetime, datetime]:
+    later_months = [month for month in TERM_NAMES if month > term_start.month]
+    term_end = date(term_start.year, later_months[0], 1) if later_months else date(term_start.year + 1, 1, 1)
+    return (
+        timezone.make_aware(datetime.combine(term_start, time.min)),
+        timezone.make_aware(datetime.combine(term_end, time.min)),
+    )
+
+
+def _build_person_rollups(person_ids: Collection[UUID] | None = None) -> list[PersonAttendanceRollup]:
+    events = list(PubEvent.objects.past().order_by("timestamp").values_list("id", "timestamp"))
+    event_ids = [event_id for event_id, _ in events]
+    timestamps = dict(events)
+
+    rsvps = PubEventRSVP.objects.filter(is_attending=True, pub_event__in=PubEvent.objects.past())
+    if person_ids is not None:
+        rsvps = rsvps.filter(person_id__in=person_ids)
+
+    attended: dict[UUID, set[UUID]] = defaultdict(set)
+    for person_id, pub_event_id in rsvps.values_list("person_id", "pub_event_id"):
+        attended[person_id].add(pub_event_id)
+
+    rollups = []
+    for person_id in attended.keys() if person_ids is None else person_ids:
+        attended_event_ids = attended[person_id]
+        current_streak, longest_streak = _calculate_streaks(event_ids, attended_event_ids)
+        rollups.append(
+            PersonAttendanceRollup(
+                person_id=person_id,
+                attended_count=len(attended_event_ids),
+                current_streak=current_streak,
+                longest_streak=longest_streak,
+                last_attended_at=max((timestamps[event_id] for event_id in attended_event_ids), default=None),
+            )
+        )
+    return rollups
+
+
+def _build_pub_rollups(pub_ids: Collection[UUID] | None = None) -> list[PubAttendanceRollup]:
+    events = PubEvent.objects.past()
+    if pub_ids is not None:
+        events = events.filter(pub_id__in=pub_ids)
+
+    totals = (
+        events.order_by()
+        .values("pub_id")
+        .annotate(
+            event_count=models.Count("id", distinct=True),
+            attendance_count=models.Count("pub_event_rsvps", filter=models.Q(pub_event_rsvps__is_attending=True)),
+        )
+    )
+    rollups = {row["pub_id"]: PubAttendanceRollup(**row) for row in totals}
+    for pub_id in pub_ids or []:
+        rollups.setdefault(pub_id, PubAttendanceRollup(pub_id=pub_id))
+    return list(rollups.values())
+
+
+def _build_term_rollups(term_starts: Collection[date] | None = None) -> list[TermAttendanceRollup]:
+    events = PubEvent.objects.past()
+    if term_starts is not None:
+        term_filter = models.Q()
+        for term_start in term_starts:
+            start, end = _get_term_bounds(term_start)
+            term_filter |= models.Q(timestamp__gte=start, timestamp__lt=end)
+        events = events.filter(term_filter)
+
+    rollups = {term_start: TermAttendanceRollup(term_start=term_start) for term_start in term_starts or []}
+    event_terms: dict[UUID, date] = {}
+    for event_id, timestamp in events.values_list("id", "timestamp"):
+        term_start = TermAttendanceRollup.get_term_start(timestamp)
+        rollup = rollups.setdefault(term_start, TermAttendanceRollup(term_start=term_start))
+        rollup.event_count += 1
+        event_terms[event_id] = term_start
+
+    attendees: dict[date, set[UUID]] = defaultdict(set)
+    rsvps = PubEventRSVP.objects.filter(is_attending=True, pub_event__in=events)
+    for person_id, pub_event_id in rsvps.values_list("person_id", "pub_event_id"):
+        term_start = event_terms[pub_event_id]
+        rollups[term_start].attendance_count += 1
+        attendees[term_start].add(person_id)
+
+    for term_start, rollup in rollups.items():
+        rollup.attendee_count = len(attendees[term_start])
+    return list(rollups.values())
+
+
+def _save_rollups(
+    model: type[models.Model], rollups: Sequence[models.Model], *, unique_field: str, update_fields: list[str]
+) -> None:
+    model._default_manager.bulk_create(
+        rollups,
+        update_conflicts=True,
+        unique_fields=[unique_field],
+        update_fields=[*update_fields, "updated_at"],
+    )
+
+
+PERSON_ROLLUP_FIELDS = ["attended_count", "current_streak", "longest_streak", "last_attended_at"]
+PUB_ROLLUP_FIELDS = ["event_count", "attendance_count"]
+TERM_ROLLUP_FIELDS = ["event_count", "attendance_count", "attendee_count"]
+
+
+def refresh_attendance_rollups_for_pub_event(pub_event: PubEvent, *, person_ids: Collection[UUID]) -> None:
+    """Refresh the rollups affected by a change in attendance of the given people at a pub event."""
+    if not pub_event.is_past:
+        return
+
+    with transaction.atomic():
+        _save_rollups(
+            PersonAttendanceRollup,
+            _build_person_rollups(person_ids),
+            unique_field="person",
+            update_fields=PERSON_ROLLUP_FIELDS,
+        )
+        _save_rollups(
+            PubAttendanceRollup,
+            _build_pub_rollups([pub_event.pub_id]),
+            unique_field="pub",
+            update_fields=PUB_ROLLUP_FIELDS,
+        )
+        _save_rollups(
+            TermAttendanceRollup,
+            _build_term_rollups([TermAttendanceRollup.get_term_start(pub_event.timestamp)]),
+            unique_field="term_start",
+            update_fields=TERM_ROLLUP_FIELDS,
+        )
+
+
+def rebuild_attendance_rollups() -> None:
+    """Rebuild all attendance rollups from the RSVPs."""
+    person_rollups = _build_person_rollups()
+    pub_rollups = _build_pub_rollups()
+    term_rollups = _build_term_rollups()
+
+    with transaction.atomic():
+        PersonAttendanceRollup.objects.all().delete()
+        PersonAttendanceRollup.objects.bulk_create(person_rollups)
+        PubAttendanceRollup.objects.all().delete()
+        PubAttendanceRollup.objects.bulk_create(pub_rollups)
+        TermAttendanceRollup.objects.all().delete()
+        TermAttendanceRollup.objects.bulk_create(term_rollups)
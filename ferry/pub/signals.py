@@ -0,0 +1,38 @@
+from typing import Any
+
+from django.db import models
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from ferry.accounts.models import Person
+from ferry.pub.models import Pub, PubEvent, PubTable
+from ferry.pub.repository import discard_pub_event_snapshots
+
+# The fields of people that are frozen in pub event snapshots.
+SNAPSHOT_PERSON_FIELDS = {"display_name", "discord_id"}
+
+
+@receiver(post_save, sender=Person)
+def discard_snapshots_with_person(
+    sender: type[Person], instance: Person, *, created: bool, update_fields: frozenset[str] | None, **kwargs: Any
+) -> None:
+    if created or kwargs.get("raw") or (update_fields is not None and update_fields.isdisjoint(SNAPSHOT_PERSON_FIELDS)):
+        return
+    discard_pub_event_snapshots(
+        PubEvent.objects.filter(
+            models.Q(pub_event_rsvps__person=instance, pub_event_rsvps__is_attending=True)
+            | models.Q(booking__created_by=instance)
+        )
+    )
+
+
+@receiver(post_save, sender=Pub)
+def discard_snapshots_with_pub(sender: type[Pub], instance: Pub, *, created: bool, **kwargs: Any) -> None:
+    if not created and not kwargs.get("raw"):
+        discard_pub_event_snapshots(PubEvent.objects.filter(models.Q(pub=instance) | models.Q(table__pub=instance)))
+
+
+@receiver(post_save, sender=PubTable)
+def discard_snapshots_with_table(sender: type[PubTable], instance: PubTable, *, created: bool, **kwargs: Any) -> None:
+    if not created and not kwargs.get("raw"):
+        discard_pub_event_snapshots(PubEvent.objects.filter(table=instance))
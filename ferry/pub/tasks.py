@@ -0,0 +1,67 @@
+from uuid import UUID
+
+from ferry.accounts.models import Person
+from ferry.activity.changes import record_changes
+from ferry.activity.models import ChangeAction, ChangeObjectType
+from ferry.core.invalidation import bump_cache_versions
+from ferry.jobs.models import Job, JobStatus
+from ferry.jobs.queue import Task, task
+from ferry.jobs.schedule import periodic
+from ferry.pub.models import PubEvent, PubEventRSVP, PubEventRSVPMethod
+from ferry.pub.repository import create_pub_event_snapshot, publish_attendance_changed
+from ferry.pub.rollups import rebuild_attendance_rollups
+
+
+@task(name="pub.create_autopub_rsvps")
+def create_autopub_rsvps(pub_event_id: UUID) -> None:
+    """RSVP everyone who has AutoPub enabled to a pub event, unless they have already responded."""
+    pub_event = PubEvent.objects.filter(id=pub_event_id).first()
+    if pub_event is None:
+        return
+
+    rsvps = [
+        PubEventRSVP(person=person, pub_event=pub_event, is_attending=True, method=PubEventRSVPMethod.AUTO)
+        for person in Person.objects.filter(autopub=True)
+    ]
+    if not rsvps:
+        return
+
+    PubEventRSVP.objects.bulk_create(rsvps, ignore_conflicts=True)
+    # Conflicting RSVPs are skipped without telling us which, but the IDs are made here, so only the
+    # created RSVPs have them. RSVPs made by an earlier attempt of this job are not recorded again.
+    created_ids = list(PubEventRSVP.objects.filter(id__in=[rsvp.id for rsvp in rsvps]).values_list("id", flat=True))
+    if created_ids:
+        record_changes(ChangeObjectType.PUB_EVENT_RSVP, ChangeAction.CREATED, created_ids, parent_id=pub_event.id)
+        bump_cache_versions("pub")
+        publish_attendance_changed(pub_event)
+
+
+@periodic("0 4 * * *")
+@task(name="pub.rebuild_attendance_rollups")
+def rebuild_attendance_rollups_task() -> None:
+    # Streaks change for everyone as events happen, so the rollups are rebuilt daily.
+    rebuild_attendance_rollups()
+
+
+@periodic("5 0 * * *")
+@task(name="pub.create_pub_event_snapshots")
+def create_pub_event_snapshots() -> None:
+    """Freeze the pub events that have become past, and those whose snapshots were discarded after a change."""
+    pub_event_qs = PubEvent.objects.past().filter(snapshot__isnull=True).select_related("table", "booking__created_by")
+    for pub_event in pub_event_qs:
+        create_pub_event_snapshot(pub_event)
+
+
+def _enqueue_unless_queued(task: Task) -> None:
+    if not Job.objects.filter(task=task.name, status=JobStatus.QUEUED).exists():
+        task.enqueue()
+
+
+def queue_rebuild_attendance_rollups() -> None:
+    """Rebuild the attendance rollups in the background, unless a rebuild is already waiting to run."""
+    _enqueue_unless_queued(rebuild_attendance_rollups_task)
+
+
+def queue_create_pub_event_snapshots() -> None:
+    """Make the missing snapshots of past pub events in the background, unless that is already waiting to run."""
+    _enqueue_unless_queued(create_pub_event_snapshots)
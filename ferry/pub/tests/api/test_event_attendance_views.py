@@ -0,0 +1,166 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import Client
+from django.urls import reverse_lazy
+from django.utils.cache import has_vary_header
+
+from ferry.accounts.factories import PersonFactory
+from ferry.accounts.models import User
+from ferry.activity.models import Activity, ActivityType
+from ferry.conftest import APITest
+from ferry.pub.factories import PubEventFactory, PubEventRSVPFactory
+from ferry.pub.models import PubEvent, PubEventRSVPMethod
+
+
+@pytest.mark.django_db
+class TestPubEventAttendeeAddEndpoint(APITest):
+    def _get_url(self, pub_event: PubEvent) -> str:
+        return reverse_lazy("api-2.0.0:events-attendee-add", args=[pub_event.id])
+
+    def test_post_unauthenticated(self, client: Client) -> None:
+        pub_event = PubEventFactory()
+        resp = client.post(self._get_url(pub_event))
+        assert resp.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_post_full_response(self, client: Client, admin_user: User) -> None:
+        # Arrange
+        pub_event = PubEventFactory()
+        person = PersonFactory()
+
+        # Act
+        resp = client.post(
+            self._get_url(pub_event),
+            data={"person": str(person.id)},
+            content_type="application/json",
+            headers=self.get_headers(admin_user),
+        )
+
+        # Assert
+        assert resp.status_code == HTTPStatus.OK
+        data = resp.json()
+        assert data["id"] == str(pub_event.id)
+        assert [attendee["id"] for attendee in data["attendees"]] == [str(person.id)]
+        assert "Preference-Applied" not in resp.headers
+        assert has_vary_header(resp, "Prefer")
+        activity = Activity.objects.get()
+        assert activity.type == ActivityType.PUB_EVENT_ATTENDANCE_CHANGED
+        assert [attendee["id"] for attendee in activity.data["attendees"]] == [str(person.id)]
+
+    def test_post_already_attending(self, client: Client, admin_user: User) -> None:
+        rsvp = PubEventRSVPFactory()
+
+        resp = client.post(
+            self._get_url(rsvp.pub_event),
+            data={"person": str(rsvp.person.id)},
+            content_type="application/json",
+            headers=self.get_headers(admin_user),
+        )
+
+        assert resp.status_code == HTTPStatus.OK
+        assert not Activity.objects.exists()
+
+    @pytest.mark.parametrize(
+        ("query", "headers"),
+        [
+            pytest.param("?response=minimal", {}, id="query-param"),
+            pytest.param("", {"Prefer": "return=minimal"}, id="prefer-header"),
+            pytest.param("", {"Prefer": "respond-async, return=minimal; foo=bar"}, id="prefer-header-multiple"),
+        ],
+    )
+    def test_post_minimal_response(self, client: Client, admin_user: User, query: str, headers: dict[str, str]) -> None:
+        # Arrange
+        pub_event = PubEventFactory()
+        PubEventRSVPFactory(pub_event=pub_event)
+        person = PersonFactory()
+
+        # Act
+        resp = client.post(
+            f"{self._get_url(pub_event)}{query}",
+            data={"person": str(person.id)},
+            content_type="application/json",
+            headers={**self.get_headers(admin_user), **headers},
+        )
+
+        # Assert
+        assert resp.status_code == HTTPStatus.OK
+        assert resp.headers["Preference-Applied"] == "return=minimal"
+        assert has_vary_header(resp, "Prefer")
+        data = resp.json()
+        assert data.keys() == {"rsvp", "attendee_count"}
+        assert data["attendee_count"] == 2
+        assert data["rsvp"]["person"] == str(person.id)
+        assert data["rsvp"]["is_attending"] is True
+        assert data["rsvp"]["method"] == PubEventRSVPMethod.DISCORD
+
+
+@pytest.mark.django_db
+class TestPubEventAttendeeRemoveEndpoint(APITest):
+    def _get_url(self, pub_event: PubEvent) -> str:
+        return reverse_lazy("api-2.0.0:events-attendee-remove", args=[pub_event.id])
+
+    def test_post_minimal_response(self, client: Client, admin_user: User) -> None:
+        # Arrange
+        rsvp = PubEventRSVPFactory()
+
+        # Act
+        resp = client.post(
+            f"{self._get_url(rsvp.pub_event)}?response=minimal",
+            data={"person": str(rsvp.person.id)},
+            content_type="application/json",
+            headers=self.get_headers(admin_user),
+        )
+
+        # Assert
+        assert resp.status_code == HTTPStatus.OK
+        assert resp.json() == {"rsvp": None, "attendee_count": 0}
+        assert Activity.objects.get().data["attendees"] == []
+
+    def test_post_minimal_response_other_method(self, client: Client, admin_user: User) -> None:
+        # Arrange
+        rsvp = PubEventRSVPFactory(method=PubEventRSVPMethod.WEB)
+
+        # Act
+        resp = client.post(
+            f"{self._get_url(rsvp.pub_event)}?response=minimal",
+            data={"person": str(rsvp.person.id)},
+            content_type="application/json",
+            headers=self.get_headers(admin_user),
+        )
+
+        # Assert
+        assert resp.status_code == HTTPStatus.OK
+        data = resp.json()
+        assert data["attendee_count"] == 1
+        assert data["rsvp"]["id"] == str(rsvp.id)
+        assert data["rsvp"]["method"] == PubEventRSVPMethod.WEB
+        assert not Activity.objects.exists()
+
+
+@pytest.mark.django_db
+class TestPubEventTableEndpoint(APITest):
+    def _get_url(self, pub_event: PubEvent) -> str:
+        return reverse_lazy("api-2.0.0:events-table", args=[pub_event.id])
+
+    def test_post_minimal_response(self, client: Client, admin_user: User) -> None:
+        # Arrange
+        pub_event = PubEventFactory()
+
+        # Act
+        resp = client.post(
+            self._get_url(pub_event),
+            data={"table_number": 12},
+            content_type="application/json",
+            headers={**self.get_headers(admin_user), "Prefer": "return=minimal"},
+        )
+
+        # Assert
+        assert resp.status_code == HTTPStatus.OK
+        data = resp.json()
+        assert data["attendee_count"] == 0
+        assert data["table"]["number"] == 12
+        assert data["table"]["pub"] == {"id": str(pub_event.pub.id), "name": pub_event.pub.name}
+
+        pub_event.refresh_from_db()
+        assert pub_event.table is not None
+        assert pub_event.table.number == 12
@@ -0,0 +1,163 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.test import Client
+from django.urls import reverse_lazy
+from django.utils import timezone
+
+from ferry.accounts.factories import PersonFactory
+from ferry.accounts.models import User
+from ferry.conftest import APITest
+from ferry.jobs.models import Job
+from ferry.jobs.queue import work
+from ferry.pub.factories import PubEventFactory, PubEventRSVPFactory, PubFactory
+from ferry.pub.models import PubEvent, PubEventSnapshot
+from ferry.pub.tasks import create_pub_event_snapshots
+
+
+@pytest.mark.django_db
+class TestPubEventRetrieveEndpoint(APITest):
+    def _get_url(self, pub_event: PubEvent) -> str:
+        return reverse_lazy("api-2.0.0:events-detail", args=[pub_event.id])
+
+    @pytest.fixture
+    def past_pub_event(self) -> PubEvent:
+        return PubEventFactory(timestamp=timezone.now() - timedelta(days=7))  # type: ignore[return-value]
+
+    def test_get_unauthenticated(self, client: Client) -> None:
+        pub_event = PubEventFactory()
+        resp = client.get(self._get_url(pub_event))
+        assert resp.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_get_upcoming_is_not_snapshotted(self, client: Client, admin_user: User) -> None:
+        pub_event = PubEventFactory()
+
+        resp = client.get(self._get_url(pub_event), headers=self.get_headers(admin_user))
+
+        assert resp.status_code == HTTPStatus.OK
+        assert resp.json()["id"] == str(pub_event.id)
+        assert "ETag" not in resp.headers
+        assert not PubEventSnapshot.objects.exists()
+
+    def test_get_past_without_snapshot(self, client: Client, admin_user: User, past_pub_event: PubEvent) -> None:
+        resp = client.get(self._get_url(past_pub_event), headers=self.get_headers(admin_user))
+
+        assert resp.status_code == HTTPStatus.OK
+        assert resp.json()["id"] == str(past_pub_event.id)
+        assert "ETag" not in resp.headers
+        # Reading doesn't write, as snapshots are made in the background.
+        assert not PubEventSnapshot.objects.exists()
+
+    def test_get_past_is_snapshotted(self, client: Client, admin_user: User, past_pub_event: PubEvent) -> None:
+        rsvp = PubEventRSVPFactory(pub_event=past_pub_event)
+        create_pub_event_snapshots()
+
+        resp = client.get(self._get_url(past_pub_event), headers=self.get_headers(admin_user))
+
+        assert resp.status_code == HTTPStatus.OK
+        assert resp.headers["ETag"] == f'"{past_pub_event.snapshot.id}"'
+        assert "max-age=86400" in resp.headers["Cache-Control"]
+        assert [attendee["id"] for attendee in resp.json()["attendees"]] == [str(rsvp.person.id)]
+
+    def test_get_past_matches_full_response(self, client: Client, admin_user: User, past_pub_event: PubEvent) -> None:
+        PubEventRSVPFactory.create_batch(3, pub_event=past_pub_event)
+        headers = self.get_headers(admin_user)
+
+        first = client.get(self._get_url(past_pub_event), headers=headers)
+        create_pub_event_snapshots()
+        second = client.get(self._get_url(past_pub_event), headers=headers)
+
+        assert "ETag" in second.headers
+        assert first.json() == second.json()
+
+    def test_get_past_not_modified(self, client: Client, admin_user: User, past_pub_event: PubEvent) -> None:
+        create_pub_event_snapshots()
+        headers = self.get_headers(admin_user)
+        resp = client.get(self._get_url(past_pub_event), headers=headers)
+
+        resp = client.get(self._get_url(past_pub_event), headers={**headers, "If-None-Match": resp.headers["ETag"]})
+
+        assert resp.status_code == HTTPStatus.NOT_MODIFIED
+
+    def test_attendee_change_invalidates_snapshot(
+        self, client: Client, admin_user: User, past_pub_event: PubEvent
+    ) -> None:
+        rsvp = PubEventRSVPFactory(pub_event=past_pub_event)
+        create_pub_event_snapshots()
+        headers = self.get_headers(admin_user)
+
+        client.post(
+            reverse_lazy("api-2.0.0:events-attendee-remove", args=[past_pub_event.id]),
+            data={"person": str(rsvp.person.id)},
+            content_type="application/json",
+            headers=headers,
+        )
+        resp = client.get(self._get_url(past_pub_event), headers=headers)
+
+        assert resp.json()["attendees"] == []
+
+    def test_renamed_attendee_replaces_snapshot(
+        self, client: Client, admin_user: User, past_pub_event: PubEvent
+    ) -> None:
+        person = PubEventRSVPFactory(pub_event=past_pub_event).person
+        create_pub_event_snapshots()
+        headers = self.get_headers(admin_user)
+        etag = client.get(self._get_url(past_pub_event), headers=headers).headers["ETag"]
+
+        person.display_name = "Bees"
+        person.save()
+        work(worker_id="test")
+        resp = client.get(self._get_url(past_pub_event), headers=headers)
+
+        assert resp.headers["ETag"] != etag
+        assert [attendee["display_name"] for attendee in resp.json()["attendees"]] == ["Bees"]
+
+    def test_pub_change_discards_snapshot(self, past_pub_event: PubEvent) -> None:
+        create_pub_event_snapshots()
+
+        past_pub_event.pub.save()
+
+        assert not PubEventSnapshot.objects.exists()
+        assert Job.objects.get().task == create_pub_event_snapshots.name
+
+    def test_unrelated_person_change_keeps_snapshot(self, past_pub_event: PubEvent) -> None:
+        person = PubEventRSVPFactory(pub_event=past_pub_event).person
+        create_pub_event_snapshots()
+
+        person.save(update_fields=["autopub"])
+        PersonFactory().save()
+
+        assert PubEventSnapshot.objects.exists()
+
+
+@pytest.mark.django_db
+class TestPubEventCreateEndpoint(APITest):
+    url = reverse_lazy("api-2.0.0:events-list")
+
+    def test_post_queues_autopub(self, client: Client, admin_user: User) -> None:
+        # Arrange
+        pub = PubFactory()
+        autopub_person = PersonFactory(autopub=True)
+        creator = PersonFactory(autopub=False)
+
+        # Act
+        resp = client.post(
+            self.url,
+            headers=self.get_headers(admin_user),
+            content_type="application/json",
+            data={
+                "pub": str(pub.id),
+                "timestamp": (timezone.now() + timedelta(days=1)).isoformat(),
+                "created_by": str(creator.id),
+            },
+        )
+
+        # Assert
+        assert resp.status_code == HTTPStatus.CREATED
+        job = Job.objects.get(task="pub.create_autopub_rsvps")
+        assert job.payload == {"pub_event_id": resp.json()["id"]}
+
+        work(worker_id="test")
+        pub_event = PubEvent.objects.get(id=resp.json()["id"])
+        assert [rsvp.person for rsvp in pub_event.pub_event_rsvps.all()] == [autopub_person]
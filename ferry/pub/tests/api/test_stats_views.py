@@ -0,0 +1,113 @@
+from datetime import timedelta
+from http import HTTPStatus
+from unittest.mock import patch
+
+import pytest
+from django.test import Client
+from django.urls import reverse_lazy
+from django.utils import timezone
+
+from ferry.accounts.models import Person, User
+from ferry.conftest import APITest
+from ferry.jobs.models import Job
+from ferry.pub.api.views import PubStatsViewset
+from ferry.pub.factories import PubEventFactory, PubEventRSVPFactory
+from ferry.pub.rollups import rebuild_attendance_rollups
+from ferry.pub.tasks import rebuild_attendance_rollups_task
+
+
+@pytest.mark.django_db
+class TestPubStatsEndpoint(APITest):
+    url = reverse_lazy("api-2.0.0:pub-stats-list")
+
+    def test_get_unauthenticated(self, client: Client) -> None:
+        resp = client.get(self.url)
+        assert resp.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_get_no_results(self, client: Client, admin_user: User) -> None:
+        resp = client.get(self.url, headers=self.get_headers(admin_user))
+        assert resp.status_code == HTTPStatus.OK
+        assert resp.json() == {"people": [], "pubs": [], "terms": []}
+
+    def test_get(self, client: Client, admin_user: User, person: Person) -> None:
+        # Arrange
+        pub_event = PubEventFactory(timestamp=timezone.now() - timedelta(days=7))
+        PubEventRSVPFactory(pub_event=pub_event, person=person)
+        rebuild_attendance_rollups()
+
+        # Act
+        resp = client.get(self.url, headers=self.get_headers(admin_user))
+
+        # Assert
+        assert resp.status_code == HTTPStatus.OK
+        data = resp.json()
+        assert data["people"] == [
+            {
+                "person": {"id": str(person.id), "display_name": person.display_name},
+                "attended_count": 1,
+                "current_streak": 1,
+                "longest_streak": 1,
+                "last_attended_at": data["people"][0]["last_attended_at"],
+            }
+        ]
+        assert data["pubs"] == [
+            {"pub": {"id": str(pub_event.pub.id), "name": pub_event.pub.name}, "event_count": 1, "attendance_count": 1}
+        ]
+        assert len(data["terms"]) == 1
+        assert data["terms"][0]["attendance_count"] == 1
+
+    def test_attendee_add_refreshes_rollups(self, client: Client, admin_user: User, person: Person) -> None:
+        pub_event = PubEventFactory(timestamp=timezone.now() - timedelta(days=7))
+        headers = self.get_headers(admin_user)
+
+        client.post(
+            reverse_lazy("api-2.0.0:events-attendee-add", args=[pub_event.id]),
+            data={"person": str(person.id)},
+            content_type="application/json",
+            headers=headers,
+        )
+        resp = client.get(self.url, headers=headers)
+
+        assert [row["attended_count"] for row in resp.json()["people"]] == [1]
+
+    def test_get_limits_people(self, client: Client, admin_user: User) -> None:
+        pub_event = PubEventFactory(timestamp=timezone.now() - timedelta(days=7))
+        PubEventRSVPFactory.create_batch(3, pub_event=pub_event)
+        rebuild_attendance_rollups()
+
+        with patch.object(PubStatsViewset, "summary_people_limit", 2):
+            resp = client.get(self.url, headers=self.get_headers(admin_user))
+
+        assert len(resp.json()["people"]) == 2
+
+    def test_get_people(self, client: Client, admin_user: User) -> None:
+        pub_event = PubEventFactory(timestamp=timezone.now() - timedelta(days=7))
+        PubEventRSVPFactory.create_batch(3, pub_event=pub_event)
+        rebuild_attendance_rollups()
+
+        resp = client.get(
+            reverse_lazy("api-2.0.0:pub-stats-people"), {"limit": 2}, headers=self.get_headers(admin_user)
+        )
+
+        assert resp.status_code == HTTPStatus.OK
+        data = resp.json()
+        assert data["count"] == 3
+        assert len(data["results"]) == 2
+        assert data["next"] is not None
+
+    def test_moving_past_event_queues_rebuild(self, client: Client, admin_user: User, person: Person) -> None:
+        pub_event = PubEventFactory(timestamp=timezone.now() - timedelta(days=7))
+        PubEventRSVPFactory(pub_event=pub_event, person=person)
+        headers = self.get_headers(admin_user)
+
+        for days in (14, 21):
+            client.patch(
+                reverse_lazy("api-2.0.0:events-detail", args=[pub_event.id]),
+                data={"timestamp": (timezone.now() - timedelta(days=days)).isoformat()},
+                content_type="application/json",
+                headers=headers,
+            )
+
+        # The rebuild is left to a worker, and is only queued once.
+        assert Job.objects.get().task == rebuild_attendance_rollups_task.name
+        assert client.get(self.url, headers=headers).json()["people"] == []
@@ -0,0 +1,210 @@
+from datetime import timedelta
+from typing import Any
+
+import pytest
+import time_machine
+from django.utils import timezone
+from pytest_django import DjangoAssertNumQueries
+
+from ferry.accounts.factories import PersonFactory
+from ferry.accounts.models import Person
+from ferry.activity.models import Activity, ActivityType, Change, ChangeAction
+from ferry.pub.factories import PubEventFactory, PubEventRSVPFactory
+from ferry.pub.models import PubEvent, PubEventRSVP, PubEventRSVPMethod, PubTable
+from ferry.pub.repository import (
+    get_next_pub_event,
+    get_pub_event_history_version,
+    invalidate_pub_event_snapshot,
+    toggle_rsvp_for_pub_event,
+)
+
+
+@pytest.mark.django_db
+class TestToggleRSVPForPubEvent:
+    @pytest.fixture
+    def pub_event(self) -> PubEvent:
+        return PubEventFactory()  # type: ignore[return-value]
+
+    def test_no_rsvp(self, pub_event: PubEvent, person: Person) -> None:
+        rsvp = toggle_rsvp_for_pub_event(pub_event, person)
+
+        assert rsvp is not None
+        assert rsvp.is_attending
+        assert rsvp.method == PubEventRSVPMethod.WEB
+        assert PubEventRSVP.objects.get(pub_event=pub_event, person=person) == rsvp
+
+    @pytest.mark.parametrize(
+        ("method", "is_attending", "expected_is_attending"),
+        [
+            pytest.param(PubEventRSVPMethod.AUTO, True, False, id="autopub-opt-out"),
+            pytest.param(PubEventRSVPMethod.WEB, True, False, id="web-no"),
+            pytest.param(PubEventRSVPMethod.WEB, False, True, id="web-yes"),
+        ],
+    )
+    def test_toggle(
+        self,
+        pub_event: PubEvent,
+        method: PubEventRSVPMethod,
+        *,
+        is_attending: bool,
+        expected_is_attending: bool,
+    ) -> None:
+        existing = PubEventRSVPFactory(pub_event=pub_event, method=method, is_attending=is_attending)
+
+        rsvp = toggle_rsvp_for_pub_event(pub_event, existing.person)
+
+        assert rsvp is not None
+        assert rsvp.id == existing.id
+        assert rsvp.is_attending is expected_is_attending
+        assert rsvp.method == PubEventRSVPMethod.WEB
+
+    @pytest.mark.parametrize("method", [PubEventRSVPMethod.DISCORD, PubEventRSVPMethod.MANUAL])
+    def test_unchanged(
+        self,
+        pub_event: PubEvent,
+        method: PubEventRSVPMethod,
+        django_capture_on_commit_callbacks: Any,
+    ) -> None:
+        existing = PubEventRSVPFactory(pub_event=pub_event, method=method)
+
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            rsvp = toggle_rsvp_for_pub_event(pub_event, existing.person)
+
+        assert rsvp is not None
+        assert rsvp == existing
+        assert callbacks == []
+        assert not Activity.objects.exists()
+        assert rsvp.is_attending
+        assert rsvp.method == method
+
+    def test_other_people_unchanged(self, pub_event: PubEvent, person: Person) -> None:
+        other = PubEventRSVPFactory(pub_event=pub_event, method=PubEventRSVPMethod.WEB)
+
+        toggle_rsvp_for_pub_event(pub_event, person)
+
+        other.refresh_from_db()
+        assert other.is_attending
+
+    def test_created_is_recorded(self, pub_event: PubEvent, person: Person) -> None:
+        rsvp = toggle_rsvp_for_pub_event(pub_event, person)
+
+        assert rsvp is not None
+        assert Change.objects.filter(object_id=rsvp.id, action=ChangeAction.CREATED).exists()
+
+    def test_attendance_published_on_commit(
+        self,
+        pub_event: PubEvent,
+        person: Person,
+        django_capture_on_commit_callbacks: Any,
+    ) -> None:
+        with django_capture_on_commit_callbacks() as callbacks:
+            toggle_rsvp_for_pub_event(pub_event, person)
+
+        assert not Activity.objects.exists()
+
+        for callback in callbacks:
+            callback()
+
+        activity = Activity.objects.get()
+        assert activity.type == ActivityType.PUB_EVENT_ATTENDANCE_CHANGED
+        assert [attendee["id"] for attendee in activity.data["attendees"]] == [str(person.id)]
+
+    @pytest.mark.parametrize("method", [PubEventRSVPMethod.AUTO, PubEventRSVPMethod.WEB, None])
+    def test_num_queries_toggle(
+        self,
+        pub_event: PubEvent,
+        method: PubEventRSVPMethod | None,
+        django_assert_num_queries: DjangoAssertNumQueries,
+    ) -> None:
+        person = PersonFactory()
+        if method is not None:
+            PubEventRSVPFactory(pub_event=pub_event, person=person, method=method)
+
+        # Upsert the RSVP, record the change and bump the cache version. The attendees are published on commit.
+        with django_assert_num_queries(3):
+            toggle_rsvp_for_pub_event(pub_event, person)
+
+
+@pytest.mark.django_db
+class TestGetPubEventHistoryVersion:
+    @pytest.fixture
+    def past_pub_event(self) -> PubEvent:
+        return PubEventFactory(timestamp=timezone.now() - timedelta(days=7))  # type: ignore[return-value]
+
+    def test_no_events(self) -> None:
+        assert get_pub_event_history_version() == "0-0"
+
+    def test_changes_with_new_past_event(self, past_pub_event: PubEvent) -> None:
+        version = get_pub_event_history_version()
+
+        PubEventFactory(timestamp=timezone.now() - timedelta(days=14))
+
+        assert get_pub_event_history_version() != version
+
+    def test_ignores_upcoming_events(self, past_pub_event: PubEvent) -> None:
+        version = get_pub_event_history_version()
+
+        PubEventFactory()
+
+        assert get_pub_event_history_version() == version
+
+    def test_changes_with_pub_rename(self, past_pub_event: PubEvent) -> None:
+        version = get_pub_event_history_version()
+
+        with time_machine.travel(timezone.now() + timedelta(seconds=1)):
+            past_pub_event.pub.name = "The Bees Knees"
+            past_pub_event.pub.save()
+
+        assert get_pub_event_history_version() != version
+
+    def test_changes_with_table_renumber(self, past_pub_event: PubEvent) -> None:
+        table = PubTable.objects.create(pub=past_pub_event.pub, number=1)
+        past_pub_event.table = table
+        past_pub_event.save()
+        version = get_pub_event_history_version()
+
+        with time_machine.travel(timezone.now() + timedelta(seconds=1)):
+            table.number = 2
+            table.save()
+
+        assert get_pub_event_history_version() != version
+
+    def test_changes_with_attendance(self, past_pub_event: PubEvent) -> None:
+        version = get_pub_event_history_version()
+
+        PubEventRSVPFactory(pub_event=past_pub_event)
+        invalidate_pub_event_snapshot(past_pub_event)
+
+        assert get_pub_event_history_version() != version
+
+
+@pytest.mark.django_db
+class TestGetNextPubEvent:
+    def test_no_events(self) -> None:
+        assert get_next_pub_event() is None
+
+    def test_follows_new_events(self) -> None:
+        later = PubEventFactory(timestamp=timezone.now() + timedelta(days=7))
+        assert get_next_pub_event() == later
+
+        sooner = PubEventFactory(timestamp=timezone.now() + timedelta(days=1))
+
+        assert get_next_pub_event() == sooner
+
+    def test_moves_on_once_started(self) -> None:
+        sooner = PubEventFactory(timestamp=timezone.now() + timedelta(hours=1))
+        later = PubEventFactory(timestamp=timezone.now() + timedelta(days=7))
+        assert get_next_pub_event() == sooner
+
+        with time_machine.travel(timezone.now() + timedelta(hours=2)):
+            assert get_next_pub_event() == later
+
+    def test_cached(self, django_assert_num_queries: DjangoAssertNumQueries) -> None:
+        pub_event = PubEventFactory(timestamp=timezone.now() + timedelta(days=1))
+        get_next_pub_event()
+
+        with django_assert_num_queries(0):
+            next_pub_event = get_next_pub_event()
+            assert next_pub_event == pub_event
+            assert next_pub_event is not None
+            assert next_pub_event.pub == pub_event.pub
@@ -0,0 +1,116 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from django.utils import timezone
+
+from ferry.accounts.factories import PersonFactory
+from ferry.accounts.models import Person
+from ferry.pub.factories import PubEventFactory, PubEventRSVPFactory, PubFactory
+from ferry.pub.models import (
+    PersonAttendanceRollup,
+    Pub,
+    PubAttendanceRollup,
+    PubEvent,
+    TermAttendanceRollup,
+)
+from ferry.pub.rollups import rebuild_attendance_rollups, refresh_attendance_rollups_for_pub_event
+
+
+@pytest.mark.django_db
+class TestAttendanceRollups:
+    @pytest.fixture
+    def pub(self) -> Pub:
+        return PubFactory()  # type: ignore[return-value]
+
+    @pytest.fixture
+    def events(self, pub: Pub) -> list[PubEvent]:
+        now = timezone.now()
+        return [PubEventFactory(pub=pub, timestamp=now - timedelta(weeks=weeks)) for weeks in (4, 3, 2, 1)]  # type: ignore[misc]
+
+    def test_person_streaks(self, events: list[PubEvent], person: Person) -> None:
+        for event in (events[0], events[1], events[3]):
+            PubEventRSVPFactory(pub_event=event, person=person)
+
+        rebuild_attendance_rollups()
+
+        rollup = PersonAttendanceRollup.objects.get(person=person)
+        assert rollup.attended_count == 3
+        assert rollup.current_streak == 1
+        assert rollup.longest_streak == 2
+        assert rollup.last_attended_at == events[3].timestamp
+
+    def test_ignores_upcoming_and_not_attending(self, events: list[PubEvent], person: Person) -> None:
+        PubEventRSVPFactory(pub_event=PubEventFactory(), person=person)
+        PubEventRSVPFactory(pub_event=events[3], person=person, is_attending=False, method="W")
+
+        rebuild_attendance_rollups()
+
+        assert not PersonAttendanceRollup.objects.filter(person=person).exists()
+
+    def test_pub_counts(self, events: list[PubEvent], pub: Pub) -> None:
+        PubEventRSVPFactory.create_batch(3, pub_event=events[0])
+        PubEventRSVPFactory.create_batch(2, pub_event=events[1])
+
+        rebuild_attendance_rollups()
+
+        rollup = PubAttendanceRollup.objects.get(pub=pub)
+        assert rollup.event_count == 4
+        assert rollup.attendance_count == 5
+
+    def test_term_counts(self, person: Person) -> None:
+        tz = timezone.get_current_timezone()
+        autumn_events = [PubEventFactory(timestamp=datetime(2025, month, 1, 19, tzinfo=tz)) for month in (10, 11)]
+        spring_event = PubEventFactory(timestamp=datetime(2026, 2, 1, 19, tzinfo=tz))
+        PubEventRSVPFactory(pub_event=autumn_events[0], person=person)
+        PubEventRSVPFactory(pub_event=autumn_events[1], person=person)
+        PubEventRSVPFactory(pub_event=autumn_events[1])
+        PubEventRSVPFactory(pub_event=spring_event, person=person)
+
+        rebuild_attendance_rollups()
+
+        autumn, spring = TermAttendanceRollup.objects.order_by("term_start")
+        assert autumn.name == "Autumn 2025"
+        assert autumn.term_start == date(2025, 9, 1)
+        assert (autumn.event_count, autumn.attendance_count, autumn.attendee_count) == (2, 3, 2)
+        assert spring.name == "Spring 2026"
+        assert (spring.event_count, spring.attendance_count, spring.attendee_count) == (1, 1, 1)
+
+    def test_refresh_for_pub_event_at_start_of_term(self, person: Person) -> None:
+        tz = timezone.get_current_timezone()
+        autumn_event = PubEventFactory(timestamp=datetime(2025, 10, 1, 19, tzinfo=tz))
+        PubEventRSVPFactory.create_batch(2, pub_event=autumn_event)
+        # This event is at the end of autumn, and the start of spring.
+        PubEventRSVPFactory(pub_event=PubEventFactory(timestamp=datetime(2026, 1, 1, tzinfo=tz)))
+        PubEventRSVPFactory.create_batch(2, pub_event=PubEventFactory(timestamp=datetime(2026, 2, 1, 19, tzinfo=tz)))
+        rebuild_attendance_rollups()
+
+        PubEventRSVPFactory(pub_event=autumn_event, person=person)
+        refresh_attendance_rollups_for_pub_event(autumn_event, person_ids=[person.id])
+
+        autumn, spring = TermAttendanceRollup.objects.order_by("term_start")
+        assert (autumn.event_count, autumn.attendance_count) == (1, 3)
+        assert spring.term_start == date(2026, 1, 1)
+        assert (spring.event_count, spring.attendance_count) == (2, 3)
+
+    def test_refresh_for_pub_event(self, events: list[PubEvent], pub: Pub, person: Person) -> None:
+        other_person: Person = PersonFactory()  # type: ignore[assignment]
+        PubEventRSVPFactory(pub_event=events[2], person=other_person)
+        rebuild_attendance_rollups()
+
+        PubEventRSVPFactory(pub_event=events[2], person=person)
+        refresh_attendance_rollups_for_pub_event(events[2], person_ids=[person.id])
+
+        assert PersonAttendanceRollup.objects.get(person=person).attended_count == 1
+        assert PersonAttendanceRollup.objects.get(person=other_person).attended_count == 1
+        assert PubAttendanceRollup.objects.get(pub=pub).attendance_count == 2
+        term_rollup = TermAttendanceRollup.objects.get(
+            term_start=TermAttendanceRollup.get_term_start(events[2].timestamp)
+        )
+        assert term_rollup.attendance_count >= 2
+
+    def test_refresh_for_upcoming_pub_event(self, person: Person) -> None:
+        rsvp = PubEventRSVPFactory(person=person)
+
+        refresh_attendance_rollups_for_pub_event(rsvp.pub_event, person_ids=[person.id])
+
+        assert not PersonAttendanceRollup.objects.exists()
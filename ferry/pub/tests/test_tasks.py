@@ -0,0 +1,79 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from ferry.accounts.factories import PersonFactory
+from ferry.activity.models import Change, ChangeAction, ChangeObjectType
+from ferry.pub.factories import PubEventFactory, PubEventRSVPFactory
+from ferry.pub.models import PubEvent, PubEventRSVPMethod, PubEventSnapshot
+from ferry.pub.tasks import create_autopub_rsvps, create_pub_event_snapshots
+
+
+@pytest.mark.django_db
+class TestCreateAutoPubRSVPs:
+    def test_create(self) -> None:
+        pub_event = PubEventFactory()
+        autopub_person = PersonFactory(autopub=True)
+        PersonFactory(autopub=False)
+
+        create_autopub_rsvps(pub_event_id=pub_event.id)
+
+        rsvp = pub_event.pub_event_rsvps.get()
+        assert rsvp.person == autopub_person
+        assert rsvp.is_attending
+        assert rsvp.method == PubEventRSVPMethod.AUTO
+
+    def test_existing_rsvp_is_kept(self) -> None:
+        pub_event = PubEventFactory()
+        rsvp = PubEventRSVPFactory(
+            pub_event=pub_event, person=PersonFactory(autopub=True), is_attending=False, method=PubEventRSVPMethod.WEB
+        )
+
+        create_autopub_rsvps(pub_event_id=pub_event.id)
+
+        assert list(pub_event.pub_event_rsvps.all()) == [rsvp]
+        rsvp.refresh_from_db()
+        assert not rsvp.is_attending
+
+    def test_retry_records_created_rsvps_once(self) -> None:
+        pub_event = PubEventFactory()
+        PersonFactory(autopub=True)
+        create_autopub_rsvps(pub_event_id=pub_event.id)
+        PersonFactory(autopub=True)
+
+        create_autopub_rsvps(pub_event_id=pub_event.id)
+
+        changes = Change.objects.filter(object_type=ChangeObjectType.PUB_EVENT_RSVP, action=ChangeAction.CREATED)
+        assert sorted(changes.values_list("object_id", flat=True)) == sorted(
+            pub_event.pub_event_rsvps.values_list("id", flat=True)
+        )
+
+    def test_deleted_pub_event(self) -> None:
+        pub_event = PubEventFactory()
+        pub_event_id = pub_event.id
+        pub_event.delete()
+
+        create_autopub_rsvps(pub_event_id=pub_event_id)
+
+        assert not PubEvent.objects.exists()
+
+
+@pytest.mark.django_db
+class TestCreatePubEventSnapshots:
+    def test_create(self) -> None:
+        past_pub_event = PubEventFactory(timestamp=timezone.now() - timedelta(days=7))
+        PubEventFactory()
+
+        create_pub_event_snapshots()
+
+        assert PubEventSnapshot.objects.get().pub_event == past_pub_event
+
+    def test_existing_snapshot_is_kept(self) -> None:
+        PubEventFactory(timestamp=timezone.now() - timedelta(days=7))
+        create_pub_event_snapshots()
+        snapshot = PubEventSnapshot.objects.get()
+
+        create_pub_event_snapshots()
+
+        assert PubEventSnapshot.objects.get() == snapshot
@@ -8,7 +8,6 @@ from django.core.exceptions import SuspiciousOperation
 from django.db import transaction
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
-from django.utils import timezone
 from django.views import View
 from django.views.generic import DetailView, FormView, ListView
 from django.views.generic.detail import SingleObjectMixin
@@ -18,16 +17,36 @@ from ferry.core.http import HttpRequest
 from ferry.core.mixins import BreadcrumbsMixin
 from ferry.pub.forms import PubEventRSVPManualEntryForm
 from ferry.pub.models import PubEvent, PubEventBooking, PubEventQuerySet, PubEventRSVP, PubEventRSVPMethod
-from ferry.pub.repository import annotate_attendee_count, get_attendees_for_pub_event, get_pub_booking_form
+from ferry.pub.repository import (
+    annotate_attendee_count,
+    get_attendee_list_for_pub_event,
+    get_pub_booking_form,
+    get_pub_event_history_version,
+    get_pub_event_snapshot,
+    invalidate_pub_event_snapshot,
+    publish_attendance_changed,
+    toggle_rsvp_for_pub_event,
+)
+from ferry.pub.rollups import refresh_attendance_rollups_for_pub_event
+
+# Rendered pages of past events are keyed by the history version, so this only bounds memory use.
+PUB_EVENT_HISTORY_CACHE_TIMEOUT = 60 * 60 * 24
 
 
 class PubEventListView(LoginRequiredMixin, BreadcrumbsMixin, ListView):
     breadcrumbs = [(None, "Pub"), (None, "Events")]
-    template_name = "pub/event_list.html"
+    paginate_by = 25
+    request: HttpRequest
+
+    def get_template_names(self) -> list[str]:
+        # Further pages of history are loaded by infinite scroll.
+        if self.request.htmx:
+            return ["pub/event_list__table_rows.html"]
+        return ["pub/event_list.html"]
 
     def get_queryset(self) -> PubEventQuerySet:
         assert self.request.user.is_authenticated
-        qs = PubEvent.objects.for_user(self.request.user)
+        qs = PubEvent.objects.for_user(self.request.user).past().select_related("pub", "table__pub")
         qs = qs.order_by("-timestamp")
         qs = annotate_attendee_count(qs)
         return qs
@@ -36,6 +55,14 @@ class PubEventListView(LoginRequiredMixin, BreadcrumbsMixin, ListView):
         assert self.request.user.is_authenticated
         assert self.request.user.person
 
+        context = super().get_context_data(
+            history_version=get_pub_event_history_version(),
+            history_cache_timeout=PUB_EVENT_HISTORY_CACHE_TIMEOUT,
+            **kwargs,
+        )
+        if self.request.htmx:
+            return context
+
         upcoming_pub = PubEvent.objects.get_next()
         if upcoming_pub:
             upcoming_pub_rsvp = PubEventRSVP.objects.filter(
@@ -50,14 +77,18 @@ class PubEventListView(LoginRequiredMixin, BreadcrumbsMixin, ListView):
             upcoming_pub_rsvp = None
             booking = None
 
-        return super().get_context_data(
-            upcoming_pub=upcoming_pub,
-            upcoming_pub_rsvp=upcoming_pub_rsvp,
-            upcoming_pub_booking=booking,
-            upcoming_pub_booking_form=get_pub_booking_form(upcoming_pub) if upcoming_pub else None,
-            attendees=get_attendees_for_pub_event(upcoming_pub) if upcoming_pub else None,
-            **kwargs,
-        )
+        upcoming_events = PubEvent.objects.for_user(self.request.user).not_past().select_related("pub", "table__pub")
+        upcoming_events = upcoming_events.order_by("-timestamp")
+
+        return {
+            **context,
+            "upcoming_events": annotate_attendee_count(upcoming_events),
+            "upcoming_pub": upcoming_pub,
+            "upcoming_pub_rsvp": upcoming_pub_rsvp,
+            "upcoming_pub_booking": booking,
+            "upcoming_pub_booking_form": get_pub_booking_form(upcoming_pub) if upcoming_pub else None,
+            "attendees": get_attendee_list_for_pub_event(upcoming_pub) if upcoming_pub else None,
+        }
 
 
 class PubEventDetailView(LoginRequiredMixin, BreadcrumbsMixin, DetailView):
@@ -72,7 +103,7 @@ class PubEventDetailView(LoginRequiredMixin, BreadcrumbsMixin, DetailView):
 
     def get_queryset(self) -> PubEventQuerySet:
         assert self.request.user.is_authenticated
-        qs = PubEvent.objects.for_user(self.request.user).select_related("booking")
+        qs = PubEvent.objects.for_user(self.request.user).select_related("booking", "snapshot")
         qs = annotate_attendee_count(qs)
         return qs
 
@@ -80,18 +111,30 @@ class PubEventDetailView(LoginRequiredMixin, BreadcrumbsMixin, DetailView):
         assert self.request.user.is_authenticated
         assert self.request.user.person
 
+        rsvp = PubEventRSVP.objects.filter(pub_event=self.object, person=self.request.user.person).first()
+
+        # Past events are served from their snapshot rather than recomputed.
+        if snapshot := get_pub_event_snapshot(self.object):
+            return super().get_context_data(
+                attendees=snapshot.data["event"]["attendees"],
+                rsvp=rsvp,
+                booking=snapshot.data["booking"],
+                is_past=True,
+                booking_form=None,
+                **kwargs,
+            )
+
         try:  # TODO: Dedupe
             booking: PubEventBooking | None = self.object.booking
         except PubEventBooking.DoesNotExist:
             booking = None
 
-        rsvp = PubEventRSVP.objects.filter(pub_event=self.object, person=self.request.user.person).first()
         return super().get_context_data(
-            attendees=get_attendees_for_pub_event(self.object),
+            attendees=get_attendee_list_for_pub_event(self.object),
             rsvp=rsvp,
             booking=booking,
-            is_past=timezone.now().date() > self.object.timestamp.date(),
-            booking_form=get_pub_booking_form(self.object),
+            is_past=self.object.is_past,
+            booking_form=None if self.object.is_past else get_pub_booking_form(self.object),
             **kwargs,
         )
 
@@ -117,6 +160,7 @@ class AddPubEventBookingView(LoginRequiredMixin, View):
             PubEventBooking.objects.create(
                 pub_event=pub_event, created_by=request.user.person, table_size=form.cleaned_data["table_size"]
             )
+            invalidate_pub_event_snapshot(pub_event)
         else:
             messages.error(request, "Something was wrong with your booking info.")
 
@@ -132,55 +176,20 @@ class UpdatePubEventResponseView(LoginRequiredMixin, View):
             raise SuspiciousOperation("That request is not valid.")
 
         pub_event = get_object_or_404(PubEvent.objects.for_user(request.user), id=pk)
-        rsvp = PubEventRSVP.objects.filter(
-            pub_event=pub_event,
-            person=request.user.person,
-        ).first()
-
-        if not pub_event.is_past:
-            if rsvp:
-                if rsvp.method == PubEventRSVPMethod.AUTO:
-                    with transaction.atomic():
-                        rsvp.delete()
-                        rsvp = PubEventRSVP(
-                            pub_event=pub_event,
-                            person=request.user.person,
-                            is_attending=False,
-                            method=PubEventRSVPMethod.WEB,
-                        )
-                        rsvp.save()
-                elif rsvp.method == PubEventRSVPMethod.DISCORD:
-                    # No action
-                    pass
-                elif rsvp.method == PubEventRSVPMethod.WEB:
-                    rsvp.is_attending = not rsvp.is_attending
-                    rsvp.save()
-                else:
-                    # This should be unreachable
-                    pass
-            else:
-                rsvp = PubEventRSVP(
-                    pub_event=pub_event,
-                    person=request.user.person,
-                    is_attending=True,
-                    method=PubEventRSVPMethod.WEB,
-                )
-                rsvp.save()
 
-        try:  # TODO: Dedupe
-            booking: PubEventBooking | None = pub_event.booking
-        except PubEventBooking.DoesNotExist:
-            booking = None
+        if pub_event.is_past:
+            rsvp = PubEventRSVP.objects.filter(pub_event=pub_event, person=request.user.person).first()
+        else:
+            rsvp = toggle_rsvp_for_pub_event(pub_event, request.user.person)
 
+        # Only the response and attendees change, so avoid re-rendering the rest of the event.
         return render(
             request,
-            "pub/inc/event_details.html",
+            "pub/inc/event_rsvp_response.html",
             {
                 "event": pub_event,
                 "rsvp": rsvp,
-                "booking": booking,
-                "attendees": get_attendees_for_pub_event(pub_event),
-                "booking_form": get_pub_booking_form(pub_event),
+                "attendees": get_attendee_list_for_pub_event(pub_event),
             },
         )
 
@@ -218,8 +227,12 @@ class PubEventManualRSVPView(
 
     def form_valid(self, form: PubEventRSVPManualEntryForm) -> http.HttpResponse:
         person = form.cleaned_data["person"]
-        PubEventRSVP.objects.create(
-            person=person, pub_event=form.pub_event, is_attending=True, method=PubEventRSVPMethod.MANUAL
-        )
+        with transaction.atomic():
+            PubEventRSVP.objects.create(
+                person=person, pub_event=form.pub_event, is_attending=True, method=PubEventRSVPMethod.MANUAL
+            )
+            invalidate_pub_event_snapshot(form.pub_event)
+            refresh_attendance_rollups_for_pub_event(form.pub_event, person_ids=[person.id])
+            publish_attendance_changed(form.pub_event)
         messages.success(self.request, f"Marked {person} as present")
         return redirect("pub:events-detail", form.pub_event.id)